@@ -6,18 +6,13 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel
 
-from ..store import SessionStore
+from ..store import SessionStore, get_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/federation", tags=["federation"])
 
 
-def get_store() -> SessionStore:
-    """Get the session store instance."""
-    return SessionStore()
-
-
 def _get_federation_config():
     """Get federation config from the main config."""
     import json
@@ -70,7 +65,7 @@ async def list_sessions(
 
     This is the endpoint remote dashboards call to fetch our sessions.
     """
-    sessions = store.get_all_sessions()
+    sessions = store.get_sessions_snapshot()
 
     return {
         "sessions": [
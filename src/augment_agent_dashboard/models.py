@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from functools import cached_property
 from typing import TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
@@ -231,6 +232,17 @@ class AgentSession:
             last_reviewed_files=data.get("last_reviewed_files", []),
         )
 
+    @cached_property
+    def workspace_sort_key(self) -> str:
+        """Lowercased workspace name for sorting by name.
+
+        Meant for sessions from SessionStore.get_sessions_snapshot(), which
+        are never modified and are kept across requests. The value is cached
+        on first access, so it goes stale if workspace_name is reassigned on
+        the same object afterwards.
+        """
+        return self.workspace_name.lower()
+
     @property
     def message_count(self) -> int:
         """Number of messages in the session."""
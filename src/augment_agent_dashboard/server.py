@@ -1,32 +1,64 @@
 """FastAPI dashboard server for monitoring Augment agent sessions."""
 
 import asyncio
+import functools
+import gzip
 import html
+import operator
+import os
+import re
 import shutil
+import threading
+import time
+import zlib
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
+from types import MappingProxyType
 from typing import Annotated
 
 import markdown
 from fastapi import BackgroundTasks, FastAPI, Form, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
 from .federation.models import FederationConfig, RemoteDashboard
 from .federation.routes import router as federation_router
 from .models import SessionStatus
-from .store import SessionStore
+from .store import get_store
 
+# One converter per thread: building a Markdown instance loads its extensions,
+# and an instance must not convert two texts at once
+_markdown_local = threading.local()
 
+
+@functools.lru_cache(maxsize=1024)
 def render_markdown(text: str) -> str:
-    """Render markdown text to HTML."""
-    return markdown.markdown(
-        text,
-        extensions=["tables", "fenced_code", "nl2br"],
-    )
+    """Render markdown text to HTML.
+
+    Memoized: messages never change once written, and the session page
+    re-renders every one of them on each refresh.
+    """
+    md = getattr(_markdown_local, "md", None)
+    if md is None:
+        md = _markdown_local.md = markdown.Markdown(
+            extensions=["tables", "fenced_code", "nl2br"],
+        )
+    return md.reset().convert(text)
+
+
+def _crc32_hex(text: str) -> str:
+    """Short content hash used for ETags, asset versions and card fingerprints."""
+    return f"{zlib.crc32(text.encode()):08x}"
+
 
 app = FastAPI(title="Augment Agent Dashboard", version="0.1.0")
 
+# Compress HTML pages and the polled card fragments. Starlette 0.46+ skips
+# text/event-stream and flushes each streamed chunk, so SSE and streamed pages stay live
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Include federation routes
 app.include_router(federation_router)
 
@@ -36,12 +68,7 @@ if static_dir.exists():
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 
-def get_store() -> SessionStore:
-    """Get the session store instance."""
-    return SessionStore()
-
-
-def _get_loop_prompts() -> dict[str, dict[str, str]]:
+def _get_loop_prompts() -> Mapping[str, dict[str, str]]:
     """Get loop prompts from config file.
 
     Returns a dict mapping prompt names to their config (prompt and end_condition).
@@ -64,7 +91,7 @@ def _get_loop_prompts() -> dict[str, dict[str, str]]:
             return normalized
         except Exception:
             pass
-    return DEFAULT_LOOP_PROMPTS.copy()
+    return DEFAULT_LOOP_PROMPTS
 
 
 def _get_quick_replies() -> dict[str, str]:
@@ -110,16 +137,20 @@ def check_and_reset_timed_out_sessions() -> list[str]:
 
     reset_session_ids = []
 
-    for session in store.get_all_sessions():
+    for snapshot in store.get_sessions_snapshot():
         # Only check sessions in busy states
-        if not session.state.is_busy():
+        if not snapshot.state.is_busy():
             continue
 
         # Calculate time since last activity
-        time_since_activity = now - session.last_activity
+        time_since_activity = now - snapshot.last_activity
         minutes_inactive = time_since_activity.total_seconds() / 60
 
         if minutes_inactive >= timeout_minutes:
+            # The snapshot is shared, so change a fresh copy
+            session = store.get_session(snapshot.session_id)
+            if session is None:
+                continue
             # Session has timed out - reset it
             old_state = session.state
             session.state = SessionState.IDLE
@@ -142,24 +173,46 @@ def check_and_reset_timed_out_sessions() -> list[str]:
     return reset_session_ids
 
 
-async def check_timeouts_and_process_queues() -> list[str]:
+async def check_timeouts_and_process_queues(
+    background_tasks: BackgroundTasks | None = None,
+) -> list[str]:
     """Check for timed out sessions and process any queued messages.
 
     This is the main entry point for timeout checking. It:
     1. Resets any timed out sessions to IDLE
     2. Processes queued messages for those sessions
 
+    Page handlers pass their background_tasks so the auggie runs happen
+    after the response is sent instead of holding up the page.
+
     Returns list of session IDs that were reset.
     """
     reset_session_ids = check_and_reset_timed_out_sessions()
 
     # Process queued messages for each reset session
     for session_id in reset_session_ids:
-        await process_queued_messages(session_id)
+        await process_queued_messages(session_id, background_tasks)
 
     return reset_session_ids
 
 
+# Last path shutil.which found for auggie; only hits are remembered so an
+# auggie installed after the dashboard started is still picked up
+_auggie_path: str | None = None
+
+
+def _find_auggie() -> str | None:
+    """Locate the auggie executable, reusing the last hit while it still exists.
+
+    shutil.which walks every PATH directory; checking the remembered path is
+    a single stat.
+    """
+    global _auggie_path
+    if _auggie_path is None or not os.access(_auggie_path, os.X_OK):
+        _auggie_path = shutil.which("auggie")
+    return _auggie_path
+
+
 async def spawn_auggie_message(conversation_id: str, workspace_root: str, message: str) -> bool:
     """Spawn auggie subprocess to inject a message into a session.
 
@@ -171,7 +224,7 @@ async def spawn_auggie_message(conversation_id: str, workspace_root: str, messag
     import logging
     logger = logging.getLogger(__name__)
 
-    auggie_path = shutil.which("auggie")
+    auggie_path = _find_auggie()
     if not auggie_path:
         logger.warning("auggie not found in PATH")
         return False
@@ -200,10 +253,15 @@ async def spawn_auggie_message(conversation_id: str, workspace_root: str, messag
         return False
 
 
-async def process_queued_messages(session_id: str) -> bool:
+async def process_queued_messages(
+    session_id: str,
+    background_tasks: BackgroundTasks | None = None,
+) -> bool:
     """Process queued messages for an idle session.
 
     If the session has queued messages and is idle, sends the first one.
+    With background_tasks the send is scheduled to run after the response
+    and True means it was scheduled.
     Returns True if a message was sent, False otherwise.
     """
     import logging
@@ -237,6 +295,14 @@ async def process_queued_messages(session_id: str) -> bool:
 
     # Send the message
     if session.workspace_root and session.conversation_id:
+        if background_tasks is not None:
+            background_tasks.add_task(
+                spawn_auggie_message,
+                session.conversation_id,
+                session.workspace_root,
+                message_content,
+            )
+            return True
         return await spawn_auggie_message(
             session.conversation_id,
             session.workspace_root,
@@ -257,7 +323,7 @@ async def spawn_new_session(workspace_root: str, prompt: str) -> bool:
     import logging
     logger = logging.getLogger(__name__)
 
-    auggie_path = shutil.which("auggie")
+    auggie_path = _find_auggie()
     if not auggie_path:
         logger.warning("auggie not found in PATH")
         return False
@@ -285,23 +351,28 @@ async def spawn_new_session(workspace_root: str, prompt: str) -> bool:
 
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
+async def dashboard(request: Request, background_tasks: BackgroundTasks):
     """Main dashboard view showing all sessions."""
+    from fastapi.responses import Response
+
     from .federation.client import RemoteDashboardClient
 
     # Check for timed out sessions and process any queued messages
-    await check_timeouts_and_process_queues()
+    await check_timeouts_and_process_queues(background_tasks)
 
     store = get_store()
-    local_sessions = store.get_all_sessions()
+    sessions_version, local_sessions = store.get_versioned_snapshot()
 
     # Determine dark mode from query param or default to system preference
     dark_mode = request.query_params.get("dark", None)
     sort_by = request.query_params.get("sort", "recent")
+    # sort_by is echoed into links and the page script, so only allow known values
+    if sort_by not in ("recent", "name"):
+        sort_by = "recent"
 
     # Sort local sessions
     if sort_by == "name":
-        local_sessions = sorted(local_sessions, key=lambda s: s.workspace_name.lower())
+        local_sessions = sorted(local_sessions, key=operator.attrgetter("workspace_sort_key"))
 
     # Get federation config
     fed_config = _get_federation_config()
@@ -340,11 +411,18 @@ async def dashboard(request: Request):
             dark_mode,
             sort_by,
         )
-    else:
-        # Single machine mode - no swim lanes needed
-        page_html = render_dashboard(local_sessions, dark_mode, sort_by)
+        return HTMLResponse(content=page_html)
 
-    return HTMLResponse(content=page_html)
+    # Single machine mode - no swim lanes needed. The page then depends only on
+    # local state, so skip rendering when the browser already has it
+    etag = _page_etag(_get_full_config(), dark_mode, sort_by, sessions_version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    page_html = render_dashboard(local_sessions, dark_mode, sort_by)
+    return HTMLResponse(
+        content=page_html,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
 
 
 @app.post("/session/new")
@@ -385,8 +463,10 @@ async def create_new_session(
 
 
 @app.get("/session/{session_id}", response_class=HTMLResponse)
-async def session_detail(session_id: str, request: Request):
+async def session_detail(session_id: str, request: Request, background_tasks: BackgroundTasks):
     """Session detail view showing conversation history."""
+    from fastapi.responses import Response, StreamingResponse
+
     from .federation.client import (
         RemoteDashboardClient,
         find_remote_by_hash,
@@ -395,7 +475,7 @@ async def session_detail(session_id: str, request: Request):
     )
 
     # Check for timed out sessions and process any queued messages
-    await check_timeouts_and_process_queues()
+    await check_timeouts_and_process_queues(background_tasks)
 
     dark_mode = request.query_params.get("dark", None)
     loop_prompts = _get_loop_prompts()
@@ -436,19 +516,30 @@ async def session_detail(session_id: str, request: Request):
         )
         return HTMLResponse(content=page_html)
 
-    # Local session
+    # Local session; the page only reads it, so the shared snapshot will do and
+    # its version identifies the session without serializing the whole history
     store = get_store()
-    session = store.get_session(session_id)
+    sessions_version, sessions = store.get_versioned_snapshot()
+    session = next((s for s in sessions if s.session_id == session_id), None)
 
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    # Skip rendering entirely when the browser already has this page
+    config = _get_full_config()
+    etag = _page_etag(config, dark_mode, session_id, sessions_version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
     # Get local machine name from federation config
-    fed_config = _get_federation_config()
-    machine_name = fed_config.this_machine_name
+    machine_name = FederationConfig.from_dict(config.get("federation", {})).this_machine_name
 
-    page_html = render_session_detail(session, dark_mode, loop_prompts, machine_name)
-    return HTMLResponse(content=page_html)
+    # Stream the page so the head and header go out before the message history
+    return StreamingResponse(
+        _render_session_detail_chunks(session, dark_mode, loop_prompts, machine_name),
+        media_type="text/html",
+        headers={"ETag": etag, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/session/{session_id}/message")
@@ -640,8 +731,10 @@ async def api_list_sessions(
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
 ):
     """API endpoint to list sessions."""
+    from fastapi.responses import JSONResponse
+
     store = get_store()
-    sessions = store.get_all_sessions()
+    sessions = store.get_sessions_snapshot()
 
     if status:
         try:
@@ -651,64 +744,90 @@ async def api_list_sessions(
             pass
 
     sessions = sessions[:limit]
-    return {"sessions": [s.to_dict() for s in sessions]}
+    # to_dict() is already JSON-ready; returning the response directly skips
+    # FastAPI's jsonable_encoder walk over every message
+    return JSONResponse({"sessions": [s.to_dict() for s in sessions]})
 
 
 @app.get("/api/sessions/{session_id}")
 async def api_get_session(session_id: str):
     """API endpoint to get session details."""
+    from fastapi.responses import JSONResponse
+
     store = get_store()
     session = store.get_session(session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    return session.to_dict()
+    return JSONResponse(session.to_dict())
 
 
-@app.get("/api/sessions-html")
-async def api_sessions_html(
-    sort: Annotated[str, Query()] = "recent",
-):
-    """API endpoint returning session cards HTML for AJAX updates."""
+def _render_sessions_list_fragment(sort: str) -> str:
+    """Render the session cards shown in the list view."""
     store = get_store()
-    sessions = store.get_all_sessions()
+    sessions = store.get_sessions_snapshot()
 
     # Sort sessions
     if sort == "name":
-        sessions = sorted(sessions, key=lambda s: s.workspace_name.lower())
-    # Default is "recent" which is already sorted by last_activity in get_all_sessions
+        sessions = sorted(sessions, key=operator.attrgetter("workspace_sort_key"))
+    # Default is "recent" which is already sorted by last_activity in get_sessions_snapshot
 
-    html = _render_session_cards(sessions)
-    return HTMLResponse(content=html)
+    return _render_session_cards(sessions)
 
 
-@app.get("/api/swimlanes-html")
-async def api_swimlanes_html(
+def _html_fragment_response(request: Request, content: str):
+    """Return an HTML fragment with an ETag, or 304 if the client already has it."""
+    from fastapi.responses import Response
+
+    etag = f'"{_crc32_hex(content)}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return HTMLResponse(content=content, headers={"ETag": etag})
+
+
+@app.get("/api/sessions-html")
+async def api_sessions_html(
+    request: Request,
     sort: Annotated[str, Query()] = "recent",
 ):
-    """API endpoint returning swim lanes HTML for AJAX updates."""
-    from .federation.client import RemoteDashboardClient
+    """API endpoint returning session cards HTML for AJAX updates."""
+    return _html_fragment_response(request, _render_sessions_list_fragment(sort))
 
-    store = get_store()
-    local_sessions = store.get_all_sessions()
 
-    if sort == "name":
-        local_sessions = sorted(local_sessions, key=lambda s: s.workspace_name.lower())
+def _parse_lane_filter(lanes: str) -> set[str] | None:
+    """Parse a comma-separated list of lane ids; empty means every lane."""
+    return {lane for lane in lanes.split(",") if lane} or None
+
+
+async def _render_swimlanes_fragment(sort: str, lanes: set[str] | None = None) -> str:
+    """Render the local and remote swim lanes shown in the lanes view.
+
+    When lanes is given, only those lanes are rendered, and remotes outside
+    it are not fetched at all.
+    """
+    from .federation.client import RemoteDashboardClient
 
     fed_config = _get_federation_config()
 
     # Build lanes HTML
-    lanes_html = ""
+    lanes_html = []
 
     # Local lane
-    lanes_html += _render_swim_lane(
-        lane_id="local",
-        name=fed_config.this_machine_name,
-        sessions=local_sessions,
-        is_online=True,
-        is_local=True,
-    )
+    if lanes is None or "local" in lanes:
+        store = get_store()
+        local_sessions = store.get_sessions_snapshot()
+
+        if sort == "name":
+            local_sessions = sorted(local_sessions, key=operator.attrgetter("workspace_sort_key"))
+
+        lanes_html.append(_render_swim_lane(
+            lane_id="local",
+            name=fed_config.this_machine_name,
+            sessions=local_sessions,
+            is_online=True,
+            is_local=True,
+        ))
 
     # Remote lanes
     if fed_config.enabled and fed_config.remote_dashboards:
@@ -719,12 +838,15 @@ async def api_swimlanes_html(
             sessions = await client.fetch_sessions()
             return (remote, sessions)
 
-        tasks = [fetch_remote(r) for r in fed_config.remote_dashboards]
+        remote_lanes = [
+            (f"remote-{lane_index}", remote)
+            for lane_index, remote in enumerate(fed_config.remote_dashboards, start=1)
+            if lanes is None or f"remote-{lane_index}" in lanes
+        ]
+        tasks = [fetch_remote(remote) for _, remote in remote_lanes]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        lane_index = 1
-        for i, remote in enumerate(fed_config.remote_dashboards):
-            result = results[i]
+        for (lane_id, remote), result in zip(remote_lanes, results):
             if isinstance(result, Exception):
                 sessions = []
                 is_online = False
@@ -734,17 +856,30 @@ async def api_swimlanes_html(
                 if sort == "name":
                     sessions = sorted(sessions, key=lambda s: s.workspace_name.lower())
 
-            lanes_html += _render_swim_lane(
-                lane_id=f"remote-{lane_index}",
+            lanes_html.append(_render_swim_lane(
+                lane_id=lane_id,
                 name=remote.name,
                 sessions=sessions,
                 is_online=is_online,
                 is_local=False,
                 origin_url=remote.url,
-            )
-            lane_index += 1
+            ))
+
+    return "".join(lanes_html)
+
+
+@app.get("/api/swimlanes-html")
+async def api_swimlanes_html(
+    request: Request,
+    sort: Annotated[str, Query()] = "recent",
+    lanes: Annotated[str, Query()] = "",
+):
+    """API endpoint returning swim lanes HTML for AJAX updates.
 
-    return HTMLResponse(content=lanes_html)
+    The optional lanes parameter limits the response to the lanes on screen.
+    """
+    fragment = await _render_swimlanes_fragment(sort, _parse_lane_filter(lanes))
+    return _html_fragment_response(request, fragment)
 
 
 @app.post("/api/federation/proxy/session/new")
@@ -786,11 +921,17 @@ async def api_session_messages_html(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    loop_prompts = _get_loop_prompts()
-    messages_html, queued_count = _render_messages_html(session)
-    status_html = _render_session_status_html(session)
+    return _render_session_update(session, _get_loop_prompts())
+
+
+def _render_session_update(session, loop_prompts: Mapping[str, dict[str, str]]) -> dict:
+    """Render the parts of the session detail page that refresh in place."""
+    # One clock reading for every relative time in the update
+    now = datetime.now(timezone.utc)
+    messages_html, queued_count = _render_messages_html(session, now)
+    status_html = _render_session_status_html(session, now)
     message_form_html = _render_message_form(session)
-    loop_controls_html = _render_loop_controls(session, loop_prompts)
+    loop_controls_html = _render_loop_controls(session, loop_prompts, now)
 
     return {
         "messages_html": messages_html,
@@ -800,7 +941,7 @@ async def api_session_messages_html(session_id: str):
         "loop_controls_html": loop_controls_html,
         "status": session.status.value,
         "message_count": session.message_count,
-        "last_activity": format_time_ago(session.last_activity),
+        "last_activity": format_time_ago(session.last_activity, now=now),
     }
 
 
@@ -876,7 +1017,7 @@ async def pause_loop(session_id: str):
 
 
 @app.post("/session/{session_id}/loop/reset")
-async def reset_loop(session_id: str):
+async def reset_loop(session_id: str, background_tasks: BackgroundTasks):
     """Reset the loop counter and session state.
 
     This is a manual recovery mechanism for stuck sessions. It:
@@ -910,19 +1051,46 @@ async def reset_loop(session_id: str):
     store.upsert_session(session)
 
     # Process any queued messages now that session is idle
-    await process_queued_messages(session_id)
+    await process_queued_messages(session_id, background_tasks)
 
     return RedirectResponse(url=f"/session/{session_id}", status_code=303)
 
 
+# Mixed into page ETags so a restart (possibly with new page code) never
+# revalidates a page rendered by an earlier process
+_PAGE_ETAG_SALT = f"{time.time_ns():x}"
+
+
+def _page_etag(config: dict, *parts) -> str:
+    """ETag for a page rendered from config.json and the given parts (dark mode, ...).
+
+    Relative times are left out of every key; the pages' update streams
+    refresh them as soon as they connect.
+    """
+    import json
+    key = ":".join(map(str, (_PAGE_ETAG_SALT, *parts, json.dumps(config, sort_keys=True))))
+    return f'"{_crc32_hex(key)}"'
+
+
 @app.get("/config", response_class=HTMLResponse)
 async def config_page(request: Request):
     """Configuration page for loop prompts."""
+    from fastapi.responses import Response, StreamingResponse
+
     dark_mode = request.query_params.get("dark", None)
-    loop_prompts = _get_loop_prompts()
     config = _get_full_config()
-    html = render_config_page(dark_mode, loop_prompts, config)
-    return HTMLResponse(content=html)
+    # Skip rendering entirely when the browser already has this page
+    etag = _page_etag(config, dark_mode)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    loop_prompts = _get_loop_prompts()
+    # Stream the page so the head and styles go out before the sections
+    return StreamingResponse(
+        _render_config_chunks(dark_mode, loop_prompts, config),
+        media_type="text/html",
+        headers={"ETag": etag, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/config/prompts/add")
@@ -1171,7 +1339,6 @@ def _save_pending_prompt(workspace_root: str, prompt: str) -> None:
     can pick it up and add it as the initial user message.
     """
     import json
-    from datetime import datetime, timezone
 
     path = _get_pending_prompts_path()
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -1198,7 +1365,7 @@ def get_and_clear_pending_prompt(workspace_root: str) -> str | None:
     Returns None if no pending prompt exists.
     """
     import json
-    from datetime import datetime, timedelta, timezone
+    from datetime import timedelta
 
     path = _get_pending_prompts_path()
     if not path.exists():
@@ -1244,7 +1411,7 @@ def _get_recent_working_directories(limit: int = 5) -> list[str]:
     Returns a list of unique working directories, most recent first.
     """
     store = get_store()
-    sessions = store.get_all_sessions()
+    sessions = store.get_sessions_snapshot()
 
     # Get directories from sessions (already sorted by last_activity)
     seen = set()
@@ -1283,6 +1450,61 @@ def _add_recent_working_directory(directory: str) -> None:
 # Browser notification support - stores pending notifications for polling
 _pending_notifications: list[dict] = []
 
+# One queue per connected /api/notifications/stream client
+_notification_subscribers: set[asyncio.Queue] = set()
+
+# Seconds between SSE keepalive comments (also bounds disconnect detection)
+NOTIFICATION_KEEPALIVE_SECONDS = 15
+
+
+def _publish_notification(notification: dict) -> None:
+    """Record a notification and push it to every connected stream."""
+    _pending_notifications.append(notification)
+    # Keep only last 50 notifications
+    while len(_pending_notifications) > 50:
+        _pending_notifications.pop(0)
+    for queue in _notification_subscribers:
+        queue.put_nowait(notification)
+
+
+def _format_sse_event(notification: dict) -> str:
+    """Format a notification as a Server-Sent Events message."""
+    import json
+    return f"id: {notification['id']}\ndata: {json.dumps(notification)}\n\n"
+
+
+async def _notification_event_stream(request: Request, last_event_id: str = ""):
+    """Yield SSE messages for new notifications until the client disconnects.
+
+    When the browser reconnects it sends Last-Event-ID, so anything published
+    while it was away is replayed from the pending list first.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    _notification_subscribers.add(queue)
+    try:
+        if last_event_id:
+            missed = [n for n in _pending_notifications if n["id"] > last_event_id]
+            if missed:
+                last_event_id = max(n["id"] for n in missed)
+            for notification in missed:
+                yield _format_sse_event(notification)
+
+        while not await request.is_disconnected():
+            try:
+                notification = await asyncio.wait_for(
+                    queue.get(), timeout=NOTIFICATION_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            # Skip anything already sent during the replay above
+            if last_event_id and notification["id"] <= last_event_id:
+                continue
+            last_event_id = notification["id"]
+            yield _format_sse_event(notification)
+    finally:
+        _notification_subscribers.discard(queue)
+
 
 @app.post("/api/notifications/send")
 async def send_browser_notification(
@@ -1297,20 +1519,160 @@ async def send_browser_notification(
         "body": body,
         "url": url,
     }
-    _pending_notifications.append(notification)
-    # Keep only last 50 notifications
-    while len(_pending_notifications) > 50:
-        _pending_notifications.pop(0)
+    _publish_notification(notification)
     return {"status": "queued"}
 
 
+def _notifications_etag() -> str:
+    """Get an ETag that changes whenever a notification is published."""
+    newest_id = _pending_notifications[-1]["id"] if _pending_notifications else "none"
+    return f'"{newest_id}"'
+
+
 @app.get("/api/notifications/poll")
-async def poll_notifications(since: str = ""):
-    """Poll for new notifications since a given timestamp."""
+async def poll_notifications(request: Request, since: str = ""):
+    """Poll for new notifications since a given timestamp.
+
+    Fallback for browsers without EventSource support. Returns 304 when the
+    client's If-None-Match shows it has already seen the newest notification.
+    """
+    from fastapi.responses import JSONResponse, Response
+
+    etag = _notifications_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
     if not since:
-        return {"notifications": []}
-    notifications = [n for n in _pending_notifications if n["id"] > since]
-    return {"notifications": notifications}
+        notifications = []
+    else:
+        notifications = [n for n in _pending_notifications if n["id"] > since]
+    return JSONResponse({"notifications": notifications}, headers={"ETag": etag})
+
+
+@app.get("/api/notifications/stream")
+async def stream_notifications(request: Request):
+    """Push new notifications to the browser as Server-Sent Events."""
+    from fastapi.responses import StreamingResponse
+    last_event_id = request.headers.get("last-event-id", "")
+    return StreamingResponse(
+        _notification_event_stream(request, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# How often a session stream checks sessions.json for changes
+SESSION_STREAM_CHECK_SECONDS = 1
+# Re-render even without file changes so relative times keep advancing
+SESSION_STREAM_MAX_STALE_SECONDS = 30
+# Remote lanes can only be checked by fetching them again
+SESSION_STREAM_REMOTE_SECONDS = 5
+
+
+async def _session_event_stream(
+    request: Request,
+    view: str = "list",
+    sort: str = "recent",
+    lanes: set[str] | None = None,
+):
+    """Yield SSE messages carrying re-rendered session HTML when it changes.
+
+    Hooks update sessions.json from their own processes, so there is no
+    in-process event to subscribe to. Instead each stream stats the file once
+    per tick and only re-renders (and only pushes) when something changed.
+    """
+    import json
+
+    store = get_store()
+    watches_remotes = lanes is None or any(lane != "local" for lane in lanes)
+    if view == "lanes" and watches_remotes and _get_federation_config().remote_dashboards:
+        max_stale = SESSION_STREAM_REMOTE_SECONDS
+    else:
+        max_stale = SESSION_STREAM_MAX_STALE_SECONDS
+
+    last_version = None
+    last_fragment = None
+    last_render = last_sent = time.monotonic()
+    while not await request.is_disconnected():
+        now = time.monotonic()
+        version = store.get_version()
+        if last_fragment is None or version != last_version or now - last_render >= max_stale:
+            last_version = version
+            last_render = now
+            if view == "lanes":
+                fragment = await _render_swimlanes_fragment(sort, lanes)
+            else:
+                fragment = _render_sessions_list_fragment(sort)
+            if fragment != last_fragment:
+                last_fragment = fragment
+                last_sent = now
+                yield f"data: {json.dumps({'html': fragment})}\n\n"
+        if now - last_sent >= NOTIFICATION_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keepalive\n\n"
+        await asyncio.sleep(SESSION_STREAM_CHECK_SECONDS)
+
+
+@app.get("/api/sessions-stream")
+async def stream_sessions(
+    request: Request,
+    view: Annotated[str, Query()] = "list",
+    sort: Annotated[str, Query()] = "recent",
+    lanes: Annotated[str, Query()] = "",
+):
+    """Push re-rendered session cards or swim lanes as Server-Sent Events."""
+    from fastapi.responses import StreamingResponse
+    return StreamingResponse(
+        _session_event_stream(request, view, sort, _parse_lane_filter(lanes)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _session_detail_event_stream(request: Request, session_id: str):
+    """Yield SSE messages carrying a session page update when it changes.
+
+    Works like _session_event_stream: stat sessions.json once per tick and
+    only re-render (and only push) when the file changed or relative times
+    may have moved on.
+    """
+    import json
+
+    store = get_store()
+    last_version = ()  # Never a real version, so the first tick renders
+    last_data = None
+    last_render = last_sent = time.monotonic()
+    while not await request.is_disconnected():
+        now = time.monotonic()
+        version = store.get_version()
+        if version != last_version or now - last_render >= SESSION_STREAM_MAX_STALE_SECONDS:
+            last_version = version
+            last_render = now
+            session = store.get_session(session_id)
+            if session:
+                data = json.dumps(_render_session_update(session, _get_loop_prompts()))
+                if data != last_data:
+                    last_data = data
+                    last_sent = now
+                    yield f"data: {data}\n\n"
+        if now - last_sent >= NOTIFICATION_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keepalive\n\n"
+        await asyncio.sleep(SESSION_STREAM_CHECK_SECONDS)
+
+
+@app.get("/api/sessions/{session_id}/stream")
+async def stream_session_detail(session_id: str, request: Request):
+    """Push session page updates as Server-Sent Events."""
+    from fastapi.responses import StreamingResponse
+
+    if not get_store().get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return StreamingResponse(
+        _session_detail_event_stream(request, session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/manifest.json")
@@ -1431,17 +1793,85 @@ async def get_icon_512():
     return Response(content=svg.encode(), media_type="image/svg+xml")
 
 
+@functools.lru_cache(maxsize=16)
+def _gzip_asset(content: str) -> bytes:
+    """Gzip a static asset once; GZipMiddleware would redo it for every client."""
+    return gzip.compress(content.encode(), compresslevel=9, mtime=0)
+
+
+def _static_asset_response(request: Request, content: str, media_type: str):
+    """Serve a versioned static asset, pre-gzipped when the client accepts it."""
+    from fastapi.responses import Response
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        # A Content-Encoding header makes GZipMiddleware pass the body through
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=_gzip_asset(content), media_type=media_type, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+@app.get("/swimlane.css")
+async def get_swimlane_css(request: Request):
+    """Serve the swim lane stylesheet; pages link it with a version query string."""
+    return _static_asset_response(request, _SWIMLANE_STYLES, "text/css")
+
+
+@app.get("/base-{color_scheme}.css")
+async def get_base_css(color_scheme: str, request: Request):
+    """Serve the base stylesheet for a color scheme; pages link it with a version query string."""
+    if color_scheme not in _BASE_STYLESHEETS:
+        raise HTTPException(status_code=404, detail="Unknown color scheme")
+    return _static_asset_response(request, _BASE_STYLESHEETS[color_scheme], "text/css")
+
+
+@app.get("/config.css")
+async def get_config_css(request: Request):
+    """Serve the config page stylesheet; the page links it with a version query string."""
+    return _static_asset_response(request, _CONFIG_PAGE_STYLES, "text/css")
+
+
+@app.get("/dashboard.js")
+async def get_dashboard_js(request: Request):
+    """Serve the dashboard script; pages link it with a version query string."""
+    return _static_asset_response(request, _DASHBOARD_BUNDLE, "text/javascript")
+
+
+@app.get("/session.js")
+async def get_session_js(request: Request):
+    """Serve the session detail script; pages link it with a version query string."""
+    return _static_asset_response(request, _SESSION_BUNDLE, "text/javascript")
+
+
+@app.get("/remote-session.js")
+async def get_remote_session_js(request: Request):
+    """Serve the remote session detail script; pages link it with a version query string."""
+    return _static_asset_response(request, _REMOTE_SESSION_BUNDLE, "text/javascript")
+
+
 # HTML rendering functions (inline for simplicity)
-def get_base_styles(dark_mode: str | None) -> str:
-    """Get CSS styles with dark/light mode support."""
+def _get_color_scheme(dark_mode: str | None) -> str:
+    """Map the dark mode setting to a "dark", "light" or "auto" scheme."""
     # If dark_mode is explicitly set, use that; otherwise use system preference
     if dark_mode == "true":
-        color_scheme = "dark"
+        return "dark"
     elif dark_mode == "false":
-        color_scheme = "light"
-    else:
-        color_scheme = "auto"
+        return "light"
+    return "auto"
+
 
+def get_base_styles(dark_mode: str | None) -> str:
+    """Get CSS styles with dark/light mode support."""
+    return _render_base_styles(_get_color_scheme(dark_mode))
+
+
+def get_base_stylesheet_link(dark_mode: str | None) -> str:
+    """Get a <link> to the cached base stylesheet for the dark mode setting."""
+    return _BASE_STYLESHEET_LINKS[_get_color_scheme(dark_mode)]
+
+
+@functools.lru_cache(maxsize=3)
+def _render_base_styles(color_scheme: str) -> str:
+    """Render the base CSS for a "dark", "light" or "auto" scheme (memoized)."""
     # Determine color scheme value for CSS
     if color_scheme == "dark":
         scheme_val = "dark"
@@ -1498,6 +1928,11 @@ def get_base_styles(dark_mode: str | None) -> str:
             --state-ready_for_loop: #22d3ee;
             --state-loop_prompting: #a78bfa;
             --state-error: #f87171;
+            /* Shared values referenced by several rules below */
+            --font-mono: 'SF Mono', Monaco, 'Courier New', monospace;
+            --bg-pending: #2a2a1e;
+            --queued-color: #8b5cf6;
+            --gradient-queued: linear-gradient(90deg, rgba(139, 92, 246, 0.1) 0%, transparent 100%);
         }}
         {dark_media}
         * {{ box-sizing: border-box; margin: 0; padding: 0; }}
@@ -1532,6 +1967,9 @@ def get_base_styles(dark_mode: str | None) -> str:
             grid-template-columns: auto 1fr;
             gap: 12px;
             align-items: start;
+            /* Skip layout and paint for cards scrolled out of view */
+            content-visibility: auto;
+            contain-intrinsic-size: auto 90px;
         }}
         .session-card:hover {{ border-color: var(--accent); }}
         .status-dot {{
@@ -1774,7 +2212,7 @@ def get_base_styles(dark_mode: str | None) -> str:
         .message.assistant {{ border-left: 3px solid var(--status-active); }}
         .message.dashboard {{
             border-left: 3px solid var(--status-idle);
-            background: #2a2a1e;
+            background: var(--bg-pending);
         }}
         .message-header {{
             font-size: 0.8em;
@@ -1842,7 +2280,7 @@ def get_base_styles(dark_mode: str | None) -> str:
             background: var(--bg-primary);
             padding: 2px 6px;
             border-radius: 4px;
-            font-family: 'SF Mono', Monaco, monospace;
+            font-family: var(--font-mono);
             font-size: 0.9em;
         }}
         .message-content pre {{
@@ -1910,7 +2348,7 @@ def get_base_styles(dark_mode: str | None) -> str:
             padding: 8px 0;
         }}
         .pending-messages {{
-            background: #2a2a1e;
+            background: var(--bg-pending);
             border: 1px solid var(--status-idle);
             border-radius: 8px;
             padding: 12px;
@@ -1966,7 +2404,7 @@ def get_base_styles(dark_mode: str | None) -> str:
         .btn-pause {{ background: #fbbf24; color: #000; }}
         .btn-reset {{ background: var(--text-secondary); color: #fff; }}
         .btn-delete {{ background: #dc2626; color: white; }}
-        .btn-queue {{ background: #8b5cf6; color: white; }}
+        .btn-queue {{ background: var(--queued-color); color: white; }}
         .loop-controls-container {{
             margin-top: 8px;
         }}
@@ -1984,7 +2422,7 @@ def get_base_styles(dark_mode: str | None) -> str:
             margin-bottom: 4px;
         }}
         .end-condition-text {{
-            font-family: 'SF Mono', Monaco, 'Courier New', monospace;
+            font-family: var(--font-mono);
             font-size: 0.9em;
             color: var(--accent);
             background: var(--bg-primary);
@@ -2027,12 +2465,12 @@ def get_base_styles(dark_mode: str | None) -> str:
             font-size: 0.85em;
         }}
         .message.queued {{
-            border-left: 3px solid #8b5cf6;
-            background: linear-gradient(90deg, rgba(139, 92, 246, 0.1) 0%, transparent 100%);
+            border-left: 3px solid var(--queued-color);
+            background: var(--gradient-queued);
             opacity: 0.85;
         }}
         .message.queued .message-header {{
-            color: #8b5cf6;
+            color: var(--queued-color);
         }}
         .queue-actions {{
             display: flex;
@@ -2256,8 +2694,8 @@ def _get_notification_script() -> str:
                 bannerText.textContent = '✓ Browser notifications enabled';
                 banner.onclick = null;
                 banner.style.cursor = 'default';
-                // Start polling for notifications
-                pollNotifications();
+                // Start listening for notifications
+                startNotificationStream();
             } else {
                 banner.style.display = 'block';
                 banner.style.background = 'var(--text-secondary)';
@@ -2274,21 +2712,58 @@ def _get_notification_script() -> str:
             updateBanner();
         }
 
+        let notificationSource = null;
+        let isPollingNotifications = false;
+        let lastNotificationEtag = null;
+
+        // Server pushes notifications over SSE; poll only if EventSource is missing
+        function startNotificationStream() {
+            if (notificationSource || isPollingNotifications) return;
+            if (typeof EventSource === 'undefined') {
+                isPollingNotifications = true;
+                pollNotifications();
+                setInterval(pollNotifications, NOTIFICATION_POLL_INTERVAL);
+                return;
+            }
+            // EventSource reconnects on its own and resumes via Last-Event-ID
+            notificationSource = new EventSource('/api/notifications/stream');
+            notificationSource.onmessage = (e) => {
+                const n = JSON.parse(e.data);
+                showNotification(n);
+                lastNotificationId = n.id;
+            };
+        }
+
+        const NOTIFICATION_POLL_INTERVAL = 3000;
+        let notificationPollController = null;
+
+        // Runs on a fixed interval; a hung request is aborted by the next tick
         async function pollNotifications() {
+            if (document.hidden) return;
+            if (notificationPollController) notificationPollController.abort();
+            const controller = new AbortController();
+            notificationPollController = controller;
             try {
                 const url = '/api/notifications/poll?since=' +
                     encodeURIComponent(lastNotificationId);
-                const response = await fetch(url);
-                const data = await response.json();
-                for (const n of data.notifications) {
-                    showNotification(n);
-                    lastNotificationId = n.id;
+                const headers = lastNotificationEtag
+                    ? { 'If-None-Match': lastNotificationEtag }
+                    : {};
+                const response = await fetch(url, { headers, signal: controller.signal });
+                // 304 means nothing new since the last poll - no body to parse
+                if (response.status !== 304) {
+                    lastNotificationEtag = response.headers.get('ETag');
+                    const data = await response.json();
+                    for (const n of data.notifications) {
+                        showNotification(n);
+                        lastNotificationId = n.id;
+                    }
                 }
             } catch (e) {
-                console.error('Notification poll error:', e);
+                if (e.name !== 'AbortError') console.error('Notification poll error:', e);
+            } finally {
+                if (notificationPollController === controller) notificationPollController = null;
             }
-            // Poll every 3 seconds
-            setTimeout(pollNotifications, 3000);
         }
 
         function showNotification(n) {
@@ -2418,50 +2893,119 @@ def _get_pull_to_refresh_script() -> str:
     """
 
 
+def _get_session_patch_script() -> str:
+    """Get JavaScript that patches session cards in place instead of replacing them."""
+    return """
+        // Reconcile list's children with newList's, keyed on data-session-id, so
+        // unchanged cards (same data-fingerprint) are never re-parsed or re-laid out
+        function patchKeyedChildren(list, newList) {
+            const incoming = [...newList.children].filter(el => el.dataset.sessionId);
+            if (incoming.length === 0) {
+                list.replaceChildren(...newList.childNodes);  // Empty state
+                return;
+            }
+
+            const existing = new Map();
+            for (const el of [...list.children]) {
+                if (el.dataset.sessionId) existing.set(el.dataset.sessionId, el);
+                else el.remove();
+            }
+
+            let cursor = list.firstElementChild;
+            for (const card of incoming) {
+                const id = card.dataset.sessionId;
+                const current = existing.get(id);
+                existing.delete(id);
+                const keep = current && current.dataset.fingerprint === card.dataset.fingerprint;
+                if (current && !keep) {
+                    if (current === cursor) cursor = cursor.nextElementSibling;
+                    current.remove();
+                }
+                const el = keep ? current : card;
+                if (el === cursor) {
+                    cursor = cursor.nextElementSibling;
+                } else {
+                    list.insertBefore(el, cursor);
+                }
+            }
+            existing.forEach(el => el.remove());
+        }
+
+        function parseFragment(html) {
+            const tpl = document.createElement('template');
+            tpl.innerHTML = html;
+            return tpl.content;
+        }
+    """
+
+
 def _get_timestamp_script() -> str:
     """Get JavaScript to localize UTC timestamps to local timezone on hover."""
     return """
-        function localizeTimestamps() {
-            document.querySelectorAll('.timestamp[data-utc]').forEach(el => {
-                const utc = el.dataset.utc;
-                if (utc && !el.dataset.localized) {
-                    const date = new Date(utc);
-                    const options = {
-                        weekday: 'short',
-                        year: 'numeric',
-                        month: 'short',
-                        day: 'numeric',
-                        hour: '2-digit',
-                        minute: '2-digit',
-                        second: '2-digit',
-                        timeZoneName: 'short'
-                    };
-                    el.title = date.toLocaleString(undefined, options);
-                    el.dataset.localized = 'true';
-                }
-            });
+        const TIMESTAMP_SELECTOR = '.timestamp[data-utc]:not([data-localized])';
+        // Build the formatter once; toLocaleString() would construct one per call
+        const TIMESTAMP_FORMAT = new Intl.DateTimeFormat(undefined, {
+            weekday: 'short',
+            year: 'numeric',
+            month: 'short',
+            day: 'numeric',
+            hour: '2-digit',
+            minute: '2-digit',
+            second: '2-digit',
+            timeZoneName: 'short'
+        });
+
+        function localizeTimestamp(el) {
+            const utc = el.dataset.utc;
+            if (utc && !el.dataset.localized) {
+                el.title = TIMESTAMP_FORMAT.format(new Date(utc));
+                el.dataset.localized = 'true';
+            }
+        }
+
+        function localizeTimestamps(root) {
+            (root || document).querySelectorAll(TIMESTAMP_SELECTOR).forEach(localizeTimestamp);
         }
 
         // Run on page load
         localizeTimestamps();
 
-        // Re-run after AJAX updates (observe DOM changes)
-        const timestampObserver = new MutationObserver(() => localizeTimestamps());
-        timestampObserver.observe(document.body, { childList: true, subtree: true });
+        // Re-run after AJAX updates, scanning only the nodes that were added
+        const timestampObserver = new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                for (const node of mutation.addedNodes) {
+                    if (node.nodeType !== 1) continue;
+                    if (node.matches(TIMESTAMP_SELECTOR)) localizeTimestamp(node);
+                    localizeTimestamps(node);
+                }
+            }
+        });
+        // Only the regions replaced by AJAX refreshes need watching
+        ['session-list', 'swim-lanes', 'message-list', 'session-status'].forEach(id => {
+            const region = document.getElementById(id);
+            if (region) timestampObserver.observe(region, { childList: true, subtree: true });
+        });
     """
 
 
-def format_time_ago(dt: datetime, include_title: bool = False) -> str:
+def format_time_ago(
+    dt: datetime,
+    now: datetime | None = None,
+    include_title: bool = False,
+) -> str:
     """Format a datetime as a human-readable relative time string.
 
     Args:
         dt: The datetime to format
+        now: Reference time; pass one snapshot when formatting many datetimes
+            in a loop. Defaults to the current UTC time.
         include_title: If True, wrap in span with full datetime as title for hover
 
     Returns:
         Relative time string, optionally wrapped in span with hover title
     """
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = datetime.now(timezone.utc)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     diff = now - dt
@@ -2503,56 +3047,65 @@ def _render_session_cards(sessions: list) -> str:
             "</div>"
         )
 
-    session_cards = ""
+    now = datetime.now(timezone.utc)
+    cards = []
     for s in sessions:
         # Get state for styling (fall back to status)
-        try:
-            state_value = s.state.value
-        except (AttributeError, ValueError):
-            state_value = s.status.value
+        state_value = _session_state_value(s)
 
         state_class = f"state-{state_value}"
         state_label = _get_state_label(state_value)
         preview = s.last_message_preview or "No messages yet"
-        time_ago = format_time_ago(s.last_activity, include_title=True)
+        time_ago = format_time_ago(s.last_activity, now=now, include_title=True)
 
         ellipsis = "..." if len(preview) > 80 else ""
-        session_cards += f"""
-        <a href="/session/{s.session_id}" class="session-card">
+        card_body = f"""
             <div class="status-dot {state_class}" title="{state_label}"></div>
             <div class="session-info">
-                <h3>{s.workspace_name}</h3>
-                <div class="workspace">{s.workspace_root}</div>
-                <div class="preview">{preview[:80]}{ellipsis}</div>
+                <h3>{_escape(s.workspace_name)}</h3>
+                <div class="workspace">{_escape(s.workspace_root)}</div>
+                <div class="preview">{_escape(preview[:80])}{ellipsis}</div>
             </div>
             <div class="session-meta">
                 <div>{s.message_count} messages</div>
                 <div>{time_ago}</div>
             </div>
-        </a>
         """
-    return session_cards
+        # Lets the client skip cards whose rendered content hasn't changed
+        fingerprint = _crc32_hex(card_body)
+        cards.append(f"""
+        <a href="/session/{s.session_id}" class="session-card"
+            data-session-id="{s.session_id}" data-fingerprint="{fingerprint}">{card_body}</a>
+        """)
+    return "".join(cards)
 
 
 def _render_recent_directories_html() -> str:
     """Render the recent directories picker HTML."""
+    # Read from the store snapshot, so this is cheap until sessions.json changes
     recent_dirs = _get_recent_working_directories(limit=5)
     if not recent_dirs:
         return ""
+    return _render_recent_directories_section(tuple(recent_dirs))
 
-    dirs_html = ""
+
+@functools.lru_cache(maxsize=32)
+def _render_recent_directories_section(recent_dirs: tuple[str, ...]) -> str:
+    """Render the picker for a given set of directories (memoized)."""
+    buttons = []
     for directory in recent_dirs:
         escaped_dir = html.escape(directory)
-        # Show shortened path for display
-        display_dir = directory
-        if len(display_dir) > 40:
-            display_dir = "..." + display_dir[-37:]
-        escaped_display = html.escape(display_dir)
-        dirs_html += f'''
+        # Show shortened path for display; short paths reuse the escaped value
+        if len(directory) > 40:
+            escaped_display = html.escape("..." + directory[-37:])
+        else:
+            escaped_display = escaped_dir
+        buttons.append(f'''
             <button type="button" class="recent-dir-btn"
                 onclick="selectRecentDir('{escaped_dir}')"
                 title="{escaped_dir}">📁 {escaped_display}</button>
-        '''
+        ''')
+    dirs_html = "".join(buttons)
 
     return f'''
         <div class="recent-dirs-section">
@@ -2594,51 +3147,608 @@ def _get_recent_dirs_styles() -> str:
     """
 
 
-def render_dashboard(sessions: list, dark_mode: str | None, sort_by: str = "recent") -> str:
-    """Render the main dashboard HTML."""
-    styles = get_base_styles(dark_mode)
-    recent_dirs_styles = _get_recent_dirs_styles()
-    recent_dirs_html = _render_recent_directories_html()
+def _bake_template(template: str, **constants: str) -> str:
+    """Fill the constant fields of a str.format_map template once.
 
-    session_cards = _render_session_cards(sessions)
+    Braces in the baked-in text are doubled so that format_map restores them,
+    leaving only the per-request fields to be filled on each render.
+    """
+    for name, value in constants.items():
+        escaped = value.replace("{", "{{").replace("}", "}}")
+        template = template.replace("{" + name + "}", escaped)
+    return template
 
-    # Build sort links preserving dark mode
-    dark_param = f"&dark={dark_mode}" if dark_mode else ""
-    recent_active = "font-weight:bold;" if sort_by == "recent" else ""
-    name_active = "font-weight:bold;" if sort_by == "name" else ""
 
-    return f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Augment Agent Dashboard</title>
-        <link rel="manifest" href="/manifest.json">
-        <meta name="apple-mobile-web-app-capable" content="yes">
-        <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-        <meta name="apple-mobile-web-app-title" content="Augment">
-        <link rel="apple-touch-icon" href="/icon-192.png">
-        <meta name="theme-color" content="#6366f1">
-        {styles}
-        <style>{recent_dirs_styles}</style>
-    </head>
-    <body>
-        <div id="pull-to-refresh" class="pull-to-refresh">
-            <div class="pull-to-refresh-spinner"></div>
-            <span class="pull-to-refresh-text">Pull to refresh</span>
-        </div>
-        <div class="header">
-            <h1>🤖 Augment Agent Dashboard</h1>
-            <div class="nav-links">
-                <a href="?sort=recent{dark_param}" style="{recent_active}">Recent</a>
-                <a href="?sort=name{dark_param}" style="{name_active}">Name</a>
-                <a href="?dark=true&sort={sort_by}">🌙</a>
-                <a href="?dark=false&sort={sort_by}">☀️</a>
-                <a href="/config">⚙️ Config</a>
-            </div>
-        </div>
-        <div id="notification-banner" class="notification-banner">
+def _strip_indentation(markup: str) -> str:
+    """Drop indentation and blank lines from a page template.
+
+    The template text itself must not rely on leading whitespace (no <pre>
+    blocks or multi-line <textarea> contents); filled-in values are untouched.
+    """
+    return "\n".join(line.strip() for line in markup.splitlines() if line.strip())
+
+
+def _get_dashboard_script() -> str:
+    """Get JavaScript for the list dashboard view."""
+    return """
+        function startListDashboard() {
+            const sortBy = document.body.dataset.sort;
+
+            // The form starts hidden by CSS, so track its state here rather than
+            // reading style.display (which is '' until the first toggle)
+            let newSessionOpen = false;
+
+            function toggleNewSession() {
+                newSessionOpen = !newSessionOpen;
+                const form = document.getElementById('new-session-form');
+                form.style.display = newSessionOpen ? 'block' : 'none';
+            }
+            function selectRecentDir(dir) {
+                document.getElementById('working_directory').value = dir;
+            }
+
+
+            // AJAX-based session list updates
+            const REFRESH_INTERVAL = 5000;
+            // Unchanged polls double the interval up to this cap
+            const MAX_REFRESH_INTERVAL = 60000;
+            let refreshInterval = REFRESH_INTERVAL;
+
+            // Track scrolling state - pause refresh while scrolling
+            let isScrolling = false;
+            let scrollTimeout = null;
+            const SCROLL_DEBOUNCE = 1500; // Wait 1.5s after scrolling stops before refresh
+
+            // Track scroll on session list and window
+            function handleScroll() {
+                isScrolling = true;
+                resetRefreshInterval();
+                if (scrollTimeout) clearTimeout(scrollTimeout);
+                scrollTimeout = setTimeout(() => {
+                    isScrolling = false;
+                }, SCROLL_DEBOUNCE);
+            }
+
+            // Attach scroll listeners
+            const sessionList = document.getElementById('session-list');
+            if (sessionList) {
+                sessionList.addEventListener('scroll', handleScroll, { passive: true });
+            }
+            window.addEventListener('scroll', handleScroll, { passive: true });
+
+            function isUserInteracting() {
+                return isScrolling || newSessionOpen || inputFocused;
+            }
+
+            function applySessionListHtml(html) {
+                // Save scroll position before refresh
+                const scrollTop = sessionList ? sessionList.scrollTop : 0;
+                const windowScrollY = window.scrollY;
+                patchKeyedChildren(document.getElementById('session-list'), parseFragment(html));
+                // Restore scroll position after refresh
+                if (sessionList) sessionList.scrollTop = scrollTop;
+                window.scrollTo(0, windowScrollY);
+            }
+
+            let lastListEtag = null;
+
+            async function refreshSessionList() {
+                // Background tabs stop polling; visibilitychange restarts the cycle
+                if (document.hidden) return;
+
+                if (isUserInteracting()) {
+                    // User is interacting, skip this refresh
+                    scheduleRefresh();
+                    return;
+                }
+
+                try {
+                    const url = '/api/sessions-html?sort=' + encodeURIComponent(sortBy);
+                    const headers = lastListEtag ? { 'If-None-Match': lastListEtag } : {};
+                    const response = await fetch(url, { headers });
+                    // 304 means nothing changed since the last refresh: back off
+                    if (response.status === 304) {
+                        refreshInterval = Math.min(refreshInterval * 2, MAX_REFRESH_INTERVAL);
+                    } else if (response.ok) {
+                        refreshInterval = REFRESH_INTERVAL;
+                        lastListEtag = response.headers.get('ETag');
+                        applySessionListHtml(await response.text());
+                    }
+                } catch (e) {
+                    console.error('Failed to refresh session list:', e);
+                }
+                scheduleRefresh();
+            }
+
+            let refreshTimer = null;
+
+            function scheduleRefresh() {
+                clearTimeout(refreshTimer);
+                refreshTimer = setTimeout(refreshSessionList, refreshInterval);
+            }
+
+            function resetRefreshInterval() {
+                if (refreshInterval === REFRESH_INTERVAL) return;
+                refreshInterval = REFRESH_INTERVAL;
+                // A poll already waiting out the backed-off delay is moved up;
+                // with the event stream there is no poll timer to move
+                if (refreshTimer !== null) scheduleRefresh();
+            }
+
+            // Server push: the server re-renders only when sessions change.
+            // Polling above remains the fallback where EventSource is missing.
+            const useSessionStream = typeof EventSource !== 'undefined';
+            let sessionStream = null;
+            let pendingSessionHtml = null;
+            let pendingApplyTimer = null;
+
+            function applyPendingSessionHtml() {
+                clearTimeout(pendingApplyTimer);
+                if (pendingSessionHtml === null) return;
+                if (isUserInteracting()) {
+                    // Hold the newest update until the user is done
+                    pendingApplyTimer = setTimeout(applyPendingSessionHtml, 1000);
+                    return;
+                }
+                applySessionListHtml(pendingSessionHtml);
+                pendingSessionHtml = null;
+            }
+
+            function openSessionStream() {
+                if (sessionStream) return;
+                const url = '/api/sessions-stream?view=list&sort=' + encodeURIComponent(sortBy);
+                sessionStream = new EventSource(url);
+                sessionStream.onmessage = (event) => {
+                    pendingSessionHtml = JSON.parse(event.data).html;
+                    applyPendingSessionHtml();
+                };
+            }
+
+            function closeSessionStream() {
+                if (sessionStream) sessionStream.close();
+                sessionStream = null;
+            }
+
+            // Drop the connection in background tabs and catch up on return
+            document.addEventListener('visibilitychange', () => {
+                if (useSessionStream) {
+                    if (document.hidden) closeSessionStream();
+                    else openSessionStream();
+                } else if (!document.hidden) {
+                    clearTimeout(refreshTimer);
+                    refreshInterval = REFRESH_INTERVAL;
+                    refreshSessionList();
+                }
+            });
+
+            // Start receiving updates
+            if (!useSessionStream) {
+                scheduleRefresh();
+            } else if (!document.hidden) {
+                openSessionStream();
+            }
+
+            // Inline onclick handlers need these to be global
+            Object.assign(window, { toggleNewSession, selectRecentDir });
+        }
+    """
+
+
+def _get_swimlanes_script() -> str:
+    """Get JavaScript for the swim lanes dashboard view."""
+    return """
+        function startSwimLanesDashboard() {
+            const sortBy = document.body.dataset.sort;
+
+            // Swim lane scroll indicator updates
+            const swimLanes = document.getElementById('swim-lanes');
+            const indicators = document.querySelectorAll('.swim-lane-indicators .indicator');
+
+            if (swimLanes && indicators.length > 0) {
+                // Lane width only changes with the viewport, so measure it once
+                // here instead of forcing layout from every scroll or click
+                let laneWidth = 0;
+                function recalcLaneWidth() {
+                    const firstLane = swimLanes.querySelector('.swim-lane');
+                    laneWidth = firstLane ? firstLane.offsetWidth + 16 : 356;
+                }
+                recalcLaneWidth();
+                window.addEventListener('resize', recalcLaneWidth);
+                window.addEventListener('orientationchange', recalcLaneWidth);
+
+                // Update at most once per frame; scroll fires many times per frame
+                let indicatorFrame = 0;
+                swimLanes.addEventListener('scroll', () => {
+                    if (indicatorFrame) return;
+                    indicatorFrame = requestAnimationFrame(() => {
+                        indicatorFrame = 0;
+                        const scrollLeft = swimLanes.scrollLeft;
+                        const activeIndex = Math.round(scrollLeft / laneWidth);
+
+                        indicators.forEach((ind, i) => {
+                            ind.classList.toggle('active', i === activeIndex);
+                        });
+                    });
+                }, { passive: true });
+
+                // Let the browser work out the lane's offset rather than
+                // trusting laneWidth, which may be stale mid-resize
+                indicators.forEach((ind, i) => {
+                    ind.addEventListener('click', () => {
+                        const lane = swimLanes.children[i];
+                        if (lane) {
+                            lane.scrollIntoView({
+                                behavior: 'smooth', inline: 'start', block: 'nearest',
+                            });
+                        }
+                    });
+                });
+            }
+
+            // New session modal
+            let currentOrigin = 'local';
+            let modalOpen = false;
+
+            function openNewSession(origin, machineName) {
+                currentOrigin = origin;
+                document.getElementById('new-session-machine').textContent = 'on: ' + machineName;
+                document.getElementById('new-session-origin').value = origin;
+
+                // Update form action based on origin
+                const form = document.getElementById('new-session-form');
+                if (origin === 'local') {
+                    form.action = '/session/new';
+                } else {
+                    const baseUrl = '/api/federation/proxy/session/new?origin=';
+                    form.action = baseUrl + encodeURIComponent(origin);
+                }
+
+                modalOpen = true;
+                document.getElementById('new-session-overlay').classList.add('active');
+                document.getElementById('working_directory').focus();
+            }
+
+            function closeNewSession() {
+                modalOpen = false;
+                document.getElementById('new-session-overlay').classList.remove('active');
+            }
+
+            function selectRecentDir(dir) {
+                document.getElementById('working_directory').value = dir;
+            }
+
+            // Close on Escape
+            document.addEventListener('keydown', (e) => {
+                if (e.key === 'Escape') closeNewSession();
+            });
+
+            // AJAX refresh for swim lanes
+            const REFRESH_INTERVAL = 5000;
+            // Unchanged polls double the interval up to this cap
+            const MAX_REFRESH_INTERVAL = 60000;
+            let refreshInterval = REFRESH_INTERVAL;
+
+            // Track scrolling state - pause refresh while scrolling
+            let isScrolling = false;
+            let scrollTimeout = null;
+            const SCROLL_DEBOUNCE = 1500; // Wait 1.5s after scrolling stops
+            let scrollFrame = 0;
+
+            function handleScroll() {
+                isScrolling = true;
+                // Restart the debounce timer at most once per frame
+                if (scrollFrame) return;
+                scrollFrame = requestAnimationFrame(() => {
+                    scrollFrame = 0;
+                    resetRefreshInterval();
+                    if (scrollTimeout) clearTimeout(scrollTimeout);
+                    scrollTimeout = setTimeout(() => {
+                        isScrolling = false;
+                    }, SCROLL_DEBOUNCE);
+                });
+            }
+
+            // Attach scroll listeners to swim lanes container and individual lanes
+            const swimLanesContainer = document.querySelector('.swim-lanes-container');
+            if (swimLanesContainer) {
+                swimLanesContainer.addEventListener('scroll', handleScroll, { passive: true });
+            }
+            window.addEventListener('scroll', handleScroll, { passive: true });
+            // Also track scroll on individual session lists within lanes
+            document.querySelectorAll('.swim-lane-sessions').forEach(el => {
+                el.addEventListener('scroll', handleScroll, { passive: true });
+            });
+
+            function isUserInteracting() {
+                return isScrolling || modalOpen || inputFocused;
+            }
+
+            // Lanes on screen; refreshes only ask the server for these, so remotes
+            // scrolled out of view are not fetched until the user swipes to them
+            const visibleLanes = new Set();
+            const laneObserver = swimLanes && 'IntersectionObserver' in window
+                ? new IntersectionObserver((entries) => {
+                    for (const entry of entries) {
+                        const laneId = entry.target.dataset.laneId;
+                        if (entry.isIntersecting) visibleLanes.add(laneId);
+                        else visibleLanes.delete(laneId);
+                    }
+                    onVisibleLanesChanged();
+                }, { root: swimLanes, threshold: 0.1 })
+                : null;
+
+            function observeLanes() {
+                if (!laneObserver) return;
+                laneObserver.disconnect();
+                visibleLanes.clear();
+                swimLanes.querySelectorAll('.swim-lane')
+                    .forEach(lane => laneObserver.observe(lane));
+            }
+
+            function laneFilterParam() {
+                // No filter when every lane is on screen (or none is known yet)
+                const laneCount = swimLanes ? swimLanes.querySelectorAll('.swim-lane').length : 0;
+                if (visibleLanes.size === 0 || visibleLanes.size === laneCount) return '';
+                return '&lanes=' + encodeURIComponent([...visibleLanes].join(','));
+            }
+
+            // Patch lanes in place: lane containers survive (keeping their scroll
+            // positions) and only cards whose fingerprint changed are replaced.
+            // A partial update carries just the visible lanes and leaves the rest.
+            function patchSwimLanes(container, html, partial) {
+                const fragment = parseFragment(html);
+                const incoming = [...fragment.querySelectorAll('.swim-lane')];
+                const current = new Map();
+                container.querySelectorAll('.swim-lane').forEach(lane => {
+                    current.set(lane.dataset.laneId, lane);
+                });
+                const sameLanes = (partial || incoming.length === current.size) &&
+                    incoming.every(lane => current.has(lane.dataset.laneId));
+                if (!sameLanes) {
+                    container.replaceChildren(...fragment.childNodes);
+                    observeLanes();
+                    return true;
+                }
+
+                incoming.forEach(lane => {
+                    const target = current.get(lane.dataset.laneId);
+                    if (target.className !== lane.className) target.className = lane.className;
+                    const header = target.querySelector('.swim-lane-header');
+                    const newHeader = lane.querySelector('.swim-lane-header');
+                    if (header.innerHTML !== newHeader.innerHTML) header.replaceWith(newHeader);
+                    patchKeyedChildren(
+                        target.querySelector('.swim-lane-sessions'),
+                        lane.querySelector('.swim-lane-sessions'),
+                    );
+                });
+                return false;
+            }
+
+            function applySwimLanesHtml(html, partial) {
+                // Read phase: snapshot scroll positions before touching the DOM
+                const containerScrollLeft = swimLanesContainer ? swimLanesContainer.scrollLeft : 0;
+                const windowScrollY = window.scrollY;
+                const laneScrolls = new Map();
+                document.querySelectorAll('.swim-lane').forEach(lane => {
+                    const sessionList = lane.querySelector('.swim-lane-sessions');
+                    if (sessionList) laneScrolls.set(lane.dataset.laneId, sessionList.scrollTop);
+                });
+
+                // Write phase: patch, then restore positions without reading layout
+                // again in between, so the browser lays out once per update
+                requestAnimationFrame(() => {
+                    const rebuilt = patchSwimLanes(
+                        document.getElementById('swim-lanes'), html, partial,
+                    );
+                    if (rebuilt) {
+                        if (swimLanesContainer) swimLanesContainer.scrollLeft = containerScrollLeft;
+                        window.scrollTo(0, windowScrollY);
+                        // Rebuilt lanes start at the top; put each back where it was
+                        document.querySelectorAll('.swim-lane').forEach(lane => {
+                            const sessionList = lane.querySelector('.swim-lane-sessions');
+                            if (!sessionList) return;
+                            sessionList.addEventListener('scroll', handleScroll, { passive: true });
+                            const scrollTop = laneScrolls.get(lane.dataset.laneId);
+                            if (scrollTop !== undefined) sessionList.scrollTop = scrollTop;
+                        });
+                    }
+                });
+            }
+
+            let lastLanesEtag = null;
+
+            async function refreshSwimLanes() {
+                // Background tabs stop polling; visibilitychange restarts the cycle
+                if (document.hidden) return;
+
+                if (isUserInteracting()) {
+                    scheduleRefresh();
+                    return;
+                }
+
+                try {
+                    const filter = laneFilterParam();
+                    const url = '/api/swimlanes-html?sort=' + encodeURIComponent(sortBy) + filter;
+                    const headers = lastLanesEtag ? { 'If-None-Match': lastLanesEtag } : {};
+                    const response = await fetch(url, { headers });
+                    // 304 means nothing changed since the last refresh: back off
+                    if (response.status === 304) {
+                        refreshInterval = Math.min(refreshInterval * 2, MAX_REFRESH_INTERVAL);
+                    } else if (response.ok) {
+                        refreshInterval = REFRESH_INTERVAL;
+                        lastLanesEtag = response.headers.get('ETag');
+                        applySwimLanesHtml(await response.text(), filter !== '');
+                    }
+                } catch (e) {
+                    console.error('Failed to refresh swim lanes:', e);
+                }
+                scheduleRefresh();
+            }
+
+            let refreshTimer = null;
+
+            function scheduleRefresh() {
+                clearTimeout(refreshTimer);
+                refreshTimer = setTimeout(refreshSwimLanes, refreshInterval);
+            }
+
+            function resetRefreshInterval() {
+                if (refreshInterval === REFRESH_INTERVAL) return;
+                refreshInterval = REFRESH_INTERVAL;
+                // A poll already waiting out the backed-off delay is moved up;
+                // with the event stream there is no poll timer to move
+                if (refreshTimer !== null) scheduleRefresh();
+            }
+
+            // Server push: the server re-renders only when lanes change.
+            // Polling above remains the fallback where EventSource is missing.
+            const useLaneStream = typeof EventSource !== 'undefined';
+            let laneStream = null;
+            let laneStreamFilter = '';
+            let pendingLanesHtml = null;
+            let pendingApplyTimer = null;
+
+            function applyPendingLanesHtml() {
+                clearTimeout(pendingApplyTimer);
+                if (pendingLanesHtml === null) return;
+                if (isUserInteracting()) {
+                    // Hold the newest update until the user is done
+                    pendingApplyTimer = setTimeout(applyPendingLanesHtml, 1000);
+                    return;
+                }
+                applySwimLanesHtml(pendingLanesHtml, laneStreamFilter !== '');
+                pendingLanesHtml = null;
+            }
+
+            function openLaneStream() {
+                if (laneStream) return;
+                laneStreamFilter = laneFilterParam();
+                const url = '/api/sessions-stream?view=lanes&sort=' + encodeURIComponent(sortBy);
+                laneStream = new EventSource(url + laneStreamFilter);
+                laneStream.onmessage = (event) => {
+                    pendingLanesHtml = JSON.parse(event.data).html;
+                    applyPendingLanesHtml();
+                };
+            }
+
+            function closeLaneStream() {
+                if (laneStream) laneStream.close();
+                laneStream = null;
+            }
+
+            // Reconnect the stream once the set of visible lanes settles. The
+            // first observer callback connects immediately.
+            let laneChangeTimer = null;
+
+            function onVisibleLanesChanged() {
+                if (!useLaneStream || document.hidden) return;
+                clearTimeout(laneChangeTimer);
+                laneChangeTimer = setTimeout(() => {
+                    if (laneStream && laneStreamFilter === laneFilterParam()) return;
+                    closeLaneStream();
+                    openLaneStream();
+                }, laneStream ? 1000 : 0);
+            }
+
+            // Drop the connection in background tabs and catch up on return
+            document.addEventListener('visibilitychange', () => {
+                if (useLaneStream) {
+                    if (document.hidden) closeLaneStream();
+                    else openLaneStream();
+                } else if (!document.hidden) {
+                    clearTimeout(refreshTimer);
+                    refreshInterval = REFRESH_INTERVAL;
+                    refreshSwimLanes();
+                }
+            });
+
+            // Start receiving updates; with an observer, the stream opens once the
+            // initially visible lanes are known
+            observeLanes();
+            if (!useLaneStream) {
+                scheduleRefresh();
+            } else if (!document.hidden && !laneObserver) {
+                openLaneStream();
+            }
+
+            // Inline onclick handlers need these to be global
+            Object.assign(window, { openNewSession, closeNewSession, selectRecentDir });
+        }
+    """
+
+
+def _get_dashboard_bundle() -> str:
+    """Get the JavaScript for both dashboard views, served from /dashboard.js.
+
+    The page's <body data-view data-sort> attributes pick the view to start.
+    """
+    return "".join([
+        _get_notification_script(),
+        _get_timestamp_script(),
+        _get_pull_to_refresh_script(),
+        _get_session_patch_script(),
+        """
+        // Track input focus from events instead of querying the DOM every tick
+        let inputFocused = false;
+        document.addEventListener('focusin', (e) => {
+            inputFocused = e.target.matches('input, textarea');
+        }, true);
+        document.addEventListener('focusout', () => {
+            inputFocused = false;
+        }, true);
+        """,
+        _get_dashboard_script(),
+        _get_swimlanes_script(),
+        """
+        if (document.body.dataset.view === 'lanes') {
+            startSwimLanesDashboard();
+        } else {
+            startListDashboard();
+        }
+        """,
+    ])
+
+
+# Built once; the version changes whenever the bundle does, so /dashboard.js
+# can be cached forever
+_DASHBOARD_BUNDLE = _get_dashboard_bundle()
+_DASHBOARD_BUNDLE_VERSION = _crc32_hex(_DASHBOARD_BUNDLE)
+
+
+# Page shell for render_dashboard; constant styles and scripts are baked in at
+# import, the rest is filled per request via str.format_map
+_DASHBOARD_TEMPLATE = _bake_template("""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Augment Agent Dashboard</title>
+        <link rel="manifest" href="/manifest.json">
+        <meta name="apple-mobile-web-app-capable" content="yes">
+        <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
+        <meta name="apple-mobile-web-app-title" content="Augment">
+        <link rel="apple-touch-icon" href="/icon-192.png">
+        <meta name="theme-color" content="#6366f1">
+        {styles}
+        <style>{recent_dirs_styles}</style>
+    </head>
+    <body data-view="list" data-sort="{sort_by}">
+        <div id="pull-to-refresh" class="pull-to-refresh">
+            <div class="pull-to-refresh-spinner"></div>
+            <span class="pull-to-refresh-text">Pull to refresh</span>
+        </div>
+        <div class="header">
+            <h1>🤖 Augment Agent Dashboard</h1>
+            <div class="nav-links">
+                <a href="?sort=recent{dark_param}" style="{recent_active}">Recent</a>
+                <a href="?sort=name{dark_param}" style="{name_active}">Name</a>
+                <a href="?dark=true&sort={sort_by}">🌙</a>
+                <a href="?dark=false&sort={sort_by}">☀️</a>
+                <a href="/config">⚙️ Config</a>
+            </div>
+        </div>
+        <div id="notification-banner" class="notification-banner">
             🔔 <span id="notification-text">Enable notifications for alerts</span>
         </div>
         <div class="new-session-section" style="margin-bottom:20px;">
@@ -2665,250 +3775,226 @@ def render_dashboard(sessions: list, dark_mode: str | None, sort_by: str = "rece
                 </form>
             </div>
         </div>
-        <script>
-            function toggleNewSession() {{
-                const form = document.getElementById('new-session-form');
-                form.style.display = form.style.display === 'none' ? 'block' : 'none';
-            }}
-            function selectRecentDir(dir) {{
-                document.getElementById('working_directory').value = dir;
-            }}
-        </script>
         <div class="session-list" id="session-list">
             {session_cards}
         </div>
-        <script>
-            {_get_notification_script()}
-            {_get_timestamp_script()}
-            {_get_pull_to_refresh_script()}
-
-            // AJAX-based session list updates
-            const REFRESH_INTERVAL = 5000;
-            const sortBy = '{sort_by}';
-
-            // Track scrolling state - pause refresh while scrolling
-            let isScrolling = false;
-            let scrollTimeout = null;
-            const SCROLL_DEBOUNCE = 1500; // Wait 1.5s after scrolling stops before refresh
-
-            // Track scroll on session list and window
-            function handleScroll() {{
-                isScrolling = true;
-                if (scrollTimeout) clearTimeout(scrollTimeout);
-                scrollTimeout = setTimeout(() => {{
-                    isScrolling = false;
-                }}, SCROLL_DEBOUNCE);
-            }}
-
-            // Attach scroll listeners
-            const sessionList = document.getElementById('session-list');
-            if (sessionList) sessionList.addEventListener('scroll', handleScroll);
-            window.addEventListener('scroll', handleScroll);
-
-            function isUserInteracting() {{
-                // Check if user is scrolling
-                if (isScrolling) {{
-                    return true;
-                }}
-                // Check if new session form is visible
-                const newSessionForm = document.getElementById('new-session-form');
-                if (newSessionForm && newSessionForm.style.display !== 'none') {{
-                    return true;
-                }}
-                // Check if any input/textarea has focus
-                const activeEl = document.activeElement;
-                const isInput = activeEl && activeEl.tagName === 'INPUT';
-                const isTextarea = activeEl && activeEl.tagName === 'TEXTAREA';
-                if (isInput || isTextarea) {{
-                    return true;
-                }}
-                return false;
-            }}
+        <script src="/dashboard.js?v={bundle_version}"></script>
+    </body>
+    </html>
+""",
+    recent_dirs_styles=_get_recent_dirs_styles(),
+    bundle_version=_DASHBOARD_BUNDLE_VERSION,
+)
 
-            async function refreshSessionList() {{
-                if (isUserInteracting()) {{
-                    // User is interacting, skip this refresh
-                    scheduleRefresh();
-                    return;
-                }}
 
-                // Save scroll position before refresh
-                const scrollTop = sessionList ? sessionList.scrollTop : 0;
-                const windowScrollY = window.scrollY;
+def render_dashboard(sessions: list, dark_mode: str | None, sort_by: str = "recent") -> str:
+    """Render the main dashboard HTML."""
+    styles = get_base_stylesheet_link(dark_mode)
+    recent_dirs_html = _render_recent_directories_html()
 
-                try {{
-                    const url = '/api/sessions-html?sort=' + encodeURIComponent(sortBy);
-                    const response = await fetch(url);
-                    if (response.ok) {{
-                        const html = await response.text();
-                        document.getElementById('session-list').innerHTML = html;
-                        // Restore scroll position after refresh
-                        if (sessionList) sessionList.scrollTop = scrollTop;
-                        window.scrollTo(0, windowScrollY);
-                    }}
-                }} catch (e) {{
-                    console.error('Failed to refresh session list:', e);
-                }}
-                scheduleRefresh();
-            }}
+    session_cards = _render_session_cards(sessions)
 
-            function scheduleRefresh() {{
-                setTimeout(refreshSessionList, REFRESH_INTERVAL);
-            }}
+    # Build sort links preserving dark mode
+    dark_param = f"&dark={dark_mode}" if dark_mode else ""
+    recent_active = "font-weight:bold;" if sort_by == "recent" else ""
+    name_active = "font-weight:bold;" if sort_by == "name" else ""
 
-            // Start the refresh cycle
-            scheduleRefresh();
-        </script>
-    </body>
-    </html>
-    """
+    return _DASHBOARD_TEMPLATE.format_map({
+        "styles": styles,
+        "recent_dirs_html": recent_dirs_html,
+        "session_cards": session_cards,
+        "dark_param": dark_param,
+        "recent_active": recent_active,
+        "name_active": name_active,
+        "sort_by": sort_by,
+    })
 
 
 def _get_swimlane_styles() -> str:
-    """Get additional CSS for swim lane layout."""
+    """Get additional CSS for swim lane layout, served from /swimlane.css."""
     return """
-    <style>
-        .swim-lanes-container {
-            display: flex;
-            gap: 1rem;
-            overflow-x: auto;
-            scroll-snap-type: x mandatory;
-            -webkit-overflow-scrolling: touch;
-            padding-bottom: 1rem;
-            min-height: calc(100vh - 200px);
-        }
+    .swim-lanes-container {
+        display: flex;
+        gap: 1rem;
+        overflow-x: auto;
+        scroll-snap-type: x mandatory;
+        -webkit-overflow-scrolling: touch;
+        padding-bottom: 1rem;
+        min-height: calc(100vh - 200px);
+    }
+    .swim-lane {
+        flex: 0 0 340px;
+        max-width: 90vw;
+        scroll-snap-align: start;
+        background: var(--bg-secondary);
+        border-radius: 12px;
+        display: flex;
+        flex-direction: column;
+        border: 1px solid var(--border-color);
+        /* Lanes scrolled out of view are not laid out or painted */
+        content-visibility: auto;
+        contain-intrinsic-size: auto 340px auto 600px;
+    }
+    .swim-lane.offline {
+        opacity: 0.7;
+    }
+    .swim-lane.offline .swim-lane-sessions {
+        filter: grayscale(30%);
+    }
+    .swim-lane-header {
+        position: sticky;
+        top: 0;
+        padding: 1rem;
+        border-bottom: 1px solid var(--border-color);
+        background: var(--bg-secondary);
+        border-radius: 12px 12px 0 0;
+        z-index: 1;
+    }
+    .swim-lane-title {
+        display: flex;
+        align-items: center;
+        gap: 8px;
+        font-weight: 600;
+        margin-bottom: 4px;
+    }
+    .swim-lane-status {
+        font-size: 0.85em;
+        color: var(--text-secondary);
+        display: flex;
+        align-items: center;
+        gap: 6px;
+    }
+    .swim-lane-status .status-indicator {
+        width: 8px;
+        height: 8px;
+        border-radius: 50%;
+    }
+    .swim-lane-status .status-indicator.online { background: var(--status-active); }
+    .swim-lane-status .status-indicator.offline { background: var(--status-stopped); }
+    .swim-lane-sessions {
+        flex: 1;
+        overflow-y: auto;
+        padding: 0.75rem;
+        display: flex;
+        flex-direction: column;
+        gap: 0.75rem;
+        max-height: calc(100vh - 280px);
+    }
+    .swim-lane .session-card {
+        margin: 0;
+    }
+    .swim-lane .btn-new-session {
+        width: 100%;
+        margin-top: 8px;
+        padding: 8px 12px;
+        font-size: 0.9em;
+    }
+    .swim-lane-indicators {
+        display: none;
+        justify-content: center;
+        gap: 8px;
+        padding: 12px 0;
+    }
+    .swim-lane-indicators .indicator {
+        width: 8px;
+        height: 8px;
+        border-radius: 50%;
+        background: var(--border-color);
+        border: none;
+        cursor: pointer;
+        padding: 0;
+    }
+    .swim-lane-indicators .indicator.active {
+        background: var(--accent);
+    }
+    @media (min-width: 768px) {
         .swim-lane {
-            flex: 0 0 340px;
-            max-width: 90vw;
-            scroll-snap-align: start;
-            background: var(--bg-secondary);
-            border-radius: 12px;
-            display: flex;
-            flex-direction: column;
-            border: 1px solid var(--border-color);
-        }
-        .swim-lane.offline {
-            opacity: 0.7;
-        }
-        .swim-lane.offline .swim-lane-sessions {
-            filter: grayscale(30%);
-        }
-        .swim-lane-header {
-            position: sticky;
-            top: 0;
-            padding: 1rem;
-            border-bottom: 1px solid var(--border-color);
-            background: var(--bg-secondary);
-            border-radius: 12px 12px 0 0;
-            z-index: 1;
-        }
-        .swim-lane-title {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            font-weight: 600;
-            margin-bottom: 4px;
-        }
-        .swim-lane-status {
-            font-size: 0.85em;
-            color: var(--text-secondary);
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-        .swim-lane-status .status-indicator {
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-        }
-        .swim-lane-status .status-indicator.online { background: var(--status-active); }
-        .swim-lane-status .status-indicator.offline { background: var(--status-stopped); }
-        .swim-lane-sessions {
-            flex: 1;
-            overflow-y: auto;
-            padding: 0.75rem;
-            display: flex;
-            flex-direction: column;
-            gap: 0.75rem;
-            max-height: calc(100vh - 280px);
+            flex: 1 1 340px;
+            max-width: 450px;
         }
-        .swim-lane .session-card {
-            margin: 0;
+    }
+    @media (max-width: 767px) {
+        .swim-lanes-container {
+            padding-left: 0.5rem;
+            margin-right: -12px;
+            padding-right: 15%;
         }
-        .swim-lane .btn-new-session {
-            width: 100%;
-            margin-top: 8px;
-            padding: 8px 12px;
-            font-size: 0.9em;
+        .swim-lane {
+            flex: 0 0 85vw;
         }
         .swim-lane-indicators {
-            display: none;
-            justify-content: center;
-            gap: 8px;
-            padding: 12px 0;
-        }
-        .swim-lane-indicators .indicator {
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            background: var(--border-color);
-            border: none;
-            cursor: pointer;
-            padding: 0;
-        }
-        .swim-lane-indicators .indicator.active {
-            background: var(--accent);
-        }
-        @media (min-width: 768px) {
-            .swim-lane {
-                flex: 1 1 340px;
-                max-width: 450px;
-            }
-        }
-        @media (max-width: 767px) {
-            .swim-lanes-container {
-                padding-left: 0.5rem;
-                margin-right: -12px;
-                padding-right: 15%;
-            }
-            .swim-lane {
-                flex: 0 0 85vw;
-            }
-            .swim-lane-indicators {
-                display: flex;
-            }
-        }
-        .new-session-overlay {
-            display: none;
-            position: fixed;
-            top: 0; left: 0; right: 0; bottom: 0;
-            background: rgba(0,0,0,0.7);
-            z-index: 100;
-            justify-content: center;
-            align-items: center;
-            padding: 20px;
-        }
-        .new-session-overlay.active {
             display: flex;
         }
-        .new-session-modal {
-            background: var(--bg-secondary);
-            padding: 24px;
-            border-radius: 12px;
-            max-width: 500px;
-            width: 100%;
-            border: 1px solid var(--border-color);
-        }
-        .new-session-modal h3 {
-            margin-bottom: 16px;
-        }
-        .new-session-modal .machine-label {
-            color: var(--accent);
-            font-size: 0.9em;
-            margin-bottom: 16px;
-        }
-    </style>
+    }
+    .new-session-overlay {
+        display: none;
+        position: fixed;
+        top: 0; left: 0; right: 0; bottom: 0;
+        background: rgba(0,0,0,0.7);
+        z-index: 100;
+        justify-content: center;
+        align-items: center;
+        padding: 20px;
+    }
+    .new-session-overlay.active {
+        display: flex;
+    }
+    .new-session-modal {
+        background: var(--bg-secondary);
+        padding: 24px;
+        border-radius: 12px;
+        max-width: 500px;
+        width: 100%;
+        border: 1px solid var(--border-color);
+    }
+    .new-session-modal h3 {
+        margin-bottom: 16px;
+    }
+    .new-session-modal .machine-label {
+        color: var(--accent);
+        font-size: 0.9em;
+        margin-bottom: 16px;
+    }
+    """
+
+
+# Built once; the version changes whenever the stylesheet does, so
+# /swimlane.css can be cached forever
+_SWIMLANE_STYLES = _strip_indentation(_get_swimlane_styles())
+_SWIMLANE_STYLES_VERSION = _crc32_hex(_SWIMLANE_STYLES)
+
+
+# The base styles as standalone stylesheets, served from /base-{scheme}.css so
+# pages link ~22KB of CSS the browser caches instead of inlining it each time
+_BASE_STYLESHEETS = {
+    scheme: _strip_indentation(
+        _render_base_styles(scheme).strip().removeprefix("<style>").removesuffix("</style>")
+    )
+    for scheme in ("dark", "light", "auto")
+}
+_BASE_STYLESHEET_LINKS = {
+    scheme: (
+        f'<link rel="stylesheet" href="/base-{scheme}.css'
+        f'?v={_crc32_hex(css)}">'
+    )
+    for scheme, css in _BASE_STYLESHEETS.items()
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape(text: str) -> str:
+    """HTML-escape text, memoized for names and previews re-rendered every refresh."""
+    return html.escape(text)
+
+
+@functools.lru_cache(maxsize=1024)
+def _escape_message(text: str) -> str:
+    """HTML-escape message content, memoized like render_markdown.
+
+    Kept apart from _escape so long message bodies don't evict the names and
+    previews from its cache.
     """
+    return html.escape(text)
 
 
 def _render_swim_lane(
@@ -2926,23 +4012,18 @@ def _render_swim_lane(
     session_count = len(sessions)
 
     # Build session cards for this lane
-    session_cards = ""
+    cards = []
     for s in sessions:
-        # Handle both AgentSession objects and RemoteSession objects
-        if hasattr(s, 'status') and hasattr(s.status, 'value'):
-            status_val = s.status.value
-        elif hasattr(s, 'status'):
-            status_val = s.status
-        else:
-            status_val = "stopped"
+        # AgentSession.status is a SessionStatus; RemoteSession.status is already a str
+        status_val = getattr(s.status, "value", s.status)
 
         session_id = s.session_id
-        workspace_name = html.escape(s.workspace_name)
-        preview = html.escape(s.last_message_preview or "No messages yet")[:80]
-        msg_count = getattr(s, 'message_count', 0)
+        workspace_name = _escape(s.workspace_name)
+        # Slice before escaping so entities like &amp; are never cut in half
+        preview = _escape((s.last_message_preview or "No messages yet")[:80])
+        msg_count = s.message_count
 
-        session_cards += f'''
-        <a href="/session/{session_id}" class="session-card">
+        card_body = f'''
             <div class="status-dot status-{status_val}"></div>
             <div class="session-info">
                 <h3>{workspace_name}</h3>
@@ -2951,11 +4032,16 @@ def _render_swim_lane(
                     <span>{msg_count} messages</span>
                 </div>
             </div>
-        </a>
         '''
+        # Lets the client skip cards whose rendered content hasn't changed
+        fingerprint = _crc32_hex(card_body)
+        cards.append(f'''
+        <a href="/session/{session_id}" class="session-card"
+            data-session-id="{session_id}" data-fingerprint="{fingerprint}">{card_body}</a>
+        ''')
 
     # New session button - different action for local vs remote
-    escaped_name = html.escape(name)
+    escaped_name = _escape(name)
     if is_local:
         new_session_btn = f'''
         <button onclick="openNewSession('local', '{escaped_name}')" class="btn-new-session">
@@ -2963,7 +4049,7 @@ def _render_swim_lane(
         </button>
         '''
     else:
-        escaped_origin = html.escape(origin_url or "")
+        escaped_origin = _escape(origin_url or "")
         if not is_online:
             disabled = ' disabled class="btn-disabled"'
         else:
@@ -2975,8 +4061,7 @@ def _render_swim_lane(
         </button>
         '''
 
-    no_sessions_msg = '<div class="no-sessions">No sessions</div>'
-    sessions_html = session_cards if session_cards else no_sessions_msg
+    sessions_html = "".join(cards) if cards else '<div class="no-sessions">No sessions</div>'
     return f'''
     <div class="{lane_class}" data-lane-id="{lane_id}" data-origin="{origin_url or 'local'}">
         <div class="swim-lane-header">
@@ -2996,57 +4081,9 @@ def _render_swim_lane(
     '''
 
 
-def render_dashboard_swimlanes(
-    local_sessions: list,
-    remote_sessions_by_origin: dict,
-    fed_config: FederationConfig,
-    dark_mode: str | None,
-    sort_by: str = "recent",
-) -> str:
-    """Render the dashboard with swim lanes for multiple machines."""
-    styles = get_base_styles(dark_mode)
-    swimlane_styles = _get_swimlane_styles()
-    recent_dirs_styles = _get_recent_dirs_styles()
-    recent_dirs_html = _render_recent_directories_html()
-
-    dark_param = f"&dark={dark_mode}" if dark_mode else ""
-    recent_active = "font-weight:bold;" if sort_by == "recent" else ""
-    name_active = "font-weight:bold;" if sort_by == "name" else ""
-
-    # Build swim lanes HTML
-    lanes_html = ""
-    lane_indicators = ""
-    lane_index = 0
-
-    # Local machine lane
-    lanes_html += _render_swim_lane(
-        lane_id="local",
-        name=fed_config.this_machine_name,
-        sessions=local_sessions,
-        is_online=True,
-        is_local=True,
-    )
-    lane_indicators += f'<button class="indicator active" data-lane="{lane_index}"></button>'
-    lane_index += 1
-
-    # Remote machine lanes
-    for remote in fed_config.remote_dashboards:
-        remote_data = remote_sessions_by_origin.get(remote.url, {})
-        sessions = remote_data.get("sessions", []) if remote_data else []
-        is_online = remote.is_healthy
-
-        lanes_html += _render_swim_lane(
-            lane_id=f"remote-{lane_index}",
-            name=remote.name,
-            sessions=sessions,
-            is_online=is_online,
-            is_local=False,
-            origin_url=remote.url,
-        )
-        lane_indicators += f'<button class="indicator" data-lane="{lane_index}"></button>'
-        lane_index += 1
-
-    return f"""
+# Page shell for render_dashboard_swimlanes, baked and filled the same way
+_SWIMLANES_TEMPLATE = _bake_template(
+    """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -3060,10 +4097,10 @@ def render_dashboard_swimlanes(
         <link rel="apple-touch-icon" href="/icon-192.png">
         <meta name="theme-color" content="#6366f1">
         {styles}
-        {swimlane_styles}
+        {swimlane_stylesheet}
         <style>{recent_dirs_styles}</style>
     </head>
-    <body>
+    <body data-view="lanes" data-sort="{sort_by}">
         <div id="pull-to-refresh" class="pull-to-refresh">
             <div class="pull-to-refresh-spinner"></div>
             <span class="pull-to-refresh-text">Pull to refresh</span>
@@ -3120,167 +4157,76 @@ def render_dashboard_swimlanes(
             </div>
         </div>
 
-        <script>
-            {_get_notification_script()}
-            {_get_timestamp_script()}
-            {_get_pull_to_refresh_script()}
-
-            // Swim lane scroll indicator updates
-            const swimLanes = document.getElementById('swim-lanes');
-            const indicators = document.querySelectorAll('.swim-lane-indicators .indicator');
-
-            if (swimLanes && indicators.length > 0) {{
-                swimLanes.addEventListener('scroll', () => {{
-                    const scrollLeft = swimLanes.scrollLeft;
-                    const laneWidth = swimLanes.querySelector('.swim-lane').offsetWidth + 16;
-                    const activeIndex = Math.round(scrollLeft / laneWidth);
-
-                    indicators.forEach((ind, i) => {{
-                        ind.classList.toggle('active', i === activeIndex);
-                    }});
-                }});
-
-                indicators.forEach((ind, i) => {{
-                    ind.addEventListener('click', () => {{
-                        const laneWidth = swimLanes.querySelector('.swim-lane').offsetWidth + 16;
-                        swimLanes.scrollTo({{ left: i * laneWidth, behavior: 'smooth' }});
-                    }});
-                }});
-            }}
-
-            // New session modal
-            let currentOrigin = 'local';
-
-            function openNewSession(origin, machineName) {{
-                currentOrigin = origin;
-                document.getElementById('new-session-machine').textContent = 'on: ' + machineName;
-                document.getElementById('new-session-origin').value = origin;
-
-                // Update form action based on origin
-                const form = document.getElementById('new-session-form');
-                if (origin === 'local') {{
-                    form.action = '/session/new';
-                }} else {{
-                    const baseUrl = '/api/federation/proxy/session/new?origin=';
-                    form.action = baseUrl + encodeURIComponent(origin);
-                }}
-
-                document.getElementById('new-session-overlay').classList.add('active');
-                document.getElementById('working_directory').focus();
-            }}
-
-            function closeNewSession() {{
-                document.getElementById('new-session-overlay').classList.remove('active');
-            }}
-
-            function selectRecentDir(dir) {{
-                document.getElementById('working_directory').value = dir;
-            }}
-
-            // Close on Escape
-            document.addEventListener('keydown', (e) => {{
-                if (e.key === 'Escape') closeNewSession();
-            }});
-
-            // AJAX refresh for swim lanes
-            const REFRESH_INTERVAL = 5000;
-            const sortBy = '{sort_by}';
+        <script src="/dashboard.js?v={bundle_version}"></script>
+    </body>
+    </html>
+""",
+    swimlane_stylesheet=(
+        f'<link rel="stylesheet" href="/swimlane.css?v={_SWIMLANE_STYLES_VERSION}">'
+    ),
+    recent_dirs_styles=_get_recent_dirs_styles(),
+    bundle_version=_DASHBOARD_BUNDLE_VERSION,
+)
 
-            // Track scrolling state - pause refresh while scrolling
-            let isScrolling = false;
-            let scrollTimeout = null;
-            const SCROLL_DEBOUNCE = 1500; // Wait 1.5s after scrolling stops
 
-            function handleScroll() {{
-                isScrolling = true;
-                if (scrollTimeout) clearTimeout(scrollTimeout);
-                scrollTimeout = setTimeout(() => {{
-                    isScrolling = false;
-                }}, SCROLL_DEBOUNCE);
-            }}
+def render_dashboard_swimlanes(
+    local_sessions: list,
+    remote_sessions_by_origin: dict,
+    fed_config: FederationConfig,
+    dark_mode: str | None,
+    sort_by: str = "recent",
+) -> str:
+    """Render the dashboard with swim lanes for multiple machines."""
+    styles = get_base_stylesheet_link(dark_mode)
+    recent_dirs_html = _render_recent_directories_html()
 
-            // Attach scroll listeners to swim lanes container and individual lanes
-            const swimLanesContainer = document.querySelector('.swim-lanes-container');
-            if (swimLanesContainer) swimLanesContainer.addEventListener('scroll', handleScroll);
-            window.addEventListener('scroll', handleScroll);
-            // Also track scroll on individual session lists within lanes
-            document.querySelectorAll('.session-list').forEach(el => {{
-                el.addEventListener('scroll', handleScroll);
-            }});
-
-            function isUserInteracting() {{
-                // Check if user is scrolling
-                if (isScrolling) return true;
-                // Check if modal is open
-                const overlay = document.getElementById('new-session-overlay');
-                if (overlay && overlay.classList.contains('active')) return true;
-                // Check if any input/textarea has focus
-                const activeEl = document.activeElement;
-                if (activeEl && (activeEl.tagName === 'INPUT' || activeEl.tagName === 'TEXTAREA')) return true;
-                return false;
-            }}
+    dark_param = f"&dark={dark_mode}" if dark_mode else ""
+    recent_active = "font-weight:bold;" if sort_by == "recent" else ""
+    name_active = "font-weight:bold;" if sort_by == "name" else ""
 
-            async function refreshSwimLanes() {{
-                if (isUserInteracting()) {{
-                    scheduleRefresh();
-                    return;
-                }}
+    # Build swim lanes HTML
+    lanes = []
+    indicators = []
+    lane_index = 0
 
-                // Save scroll positions before refresh
-                const containerScrollLeft = swimLanesContainer ? swimLanesContainer.scrollLeft : 0;
-                const windowScrollY = window.scrollY;
-                // Save individual lane scroll positions
-                const laneScrolls = {{}};
-                document.querySelectorAll('.swim-lane').forEach(lane => {{
-                    const laneId = lane.dataset.machine || lane.querySelector('h3')?.textContent;
-                    const sessionList = lane.querySelector('.session-list');
-                    if (laneId && sessionList) {{
-                        laneScrolls[laneId] = sessionList.scrollTop;
-                    }}
-                }});
-
-                try {{
-                    const url = '/api/swimlanes-html?sort=' + encodeURIComponent(sortBy);
-                    const response = await fetch(url);
-                    if (response.ok) {{
-                        const html = await response.text();
-                        document.getElementById('swim-lanes').innerHTML = html;
-
-                        // Restore scroll positions
-                        const newContainer = document.querySelector('.swim-lanes-container');
-                        if (newContainer) {{
-                            newContainer.scrollLeft = containerScrollLeft;
-                            // Re-attach scroll listener to new container
-                            newContainer.addEventListener('scroll', handleScroll);
-                        }}
-                        window.scrollTo(0, windowScrollY);
+    # Local machine lane
+    lanes.append(_render_swim_lane(
+        lane_id="local",
+        name=fed_config.this_machine_name,
+        sessions=local_sessions,
+        is_online=True,
+        is_local=True,
+    ))
+    indicators.append(f'<button class="indicator active" data-lane="{lane_index}"></button>')
+    lane_index += 1
 
-                        // Restore lane scroll positions
-                        document.querySelectorAll('.swim-lane').forEach(lane => {{
-                            const laneId = lane.dataset.machine || lane.querySelector('h3')?.textContent;
-                            const sessionList = lane.querySelector('.session-list');
-                            if (laneId && sessionList && laneScrolls[laneId] !== undefined) {{
-                                sessionList.scrollTop = laneScrolls[laneId];
-                            }}
-                            // Re-attach scroll listener
-                            if (sessionList) sessionList.addEventListener('scroll', handleScroll);
-                        }});
-                    }}
-                }} catch (e) {{
-                    console.error('Failed to refresh swim lanes:', e);
-                }}
-                scheduleRefresh();
-            }}
+    # Remote machine lanes
+    for remote in fed_config.remote_dashboards:
+        remote_data = remote_sessions_by_origin.get(remote.url, {})
+        sessions = remote_data.get("sessions", []) if remote_data else []
+        is_online = remote.is_healthy
 
-            function scheduleRefresh() {{
-                setTimeout(refreshSwimLanes, REFRESH_INTERVAL);
-            }}
+        lanes.append(_render_swim_lane(
+            lane_id=f"remote-{lane_index}",
+            name=remote.name,
+            sessions=sessions,
+            is_online=is_online,
+            is_local=False,
+            origin_url=remote.url,
+        ))
+        indicators.append(f'<button class="indicator" data-lane="{lane_index}"></button>')
+        lane_index += 1
 
-            scheduleRefresh();
-        </script>
-    </body>
-    </html>
-    """
+    return _SWIMLANES_TEMPLATE.format_map({
+        "styles": styles,
+        "dark_param": dark_param,
+        "recent_active": recent_active,
+        "name_active": name_active,
+        "sort_by": sort_by,
+        "lanes_html": "".join(lanes),
+        "lane_indicators": "".join(indicators),
+        "recent_dirs_html": recent_dirs_html,
+    })
 
 
 def _render_memory_config_section(config: dict) -> str:
@@ -3319,31 +4265,19 @@ def _render_memory_config_section(config: dict) -> str:
             <form method="POST" action="/config/memory">
                 <label class="field-label">Memory Server URL:</label>
                 <input type="text" name="server_url" value="{server_url}"
-                       placeholder="http://localhost:8000" style="width:100%;padding:8px;
-                       border:1px solid var(--border-color);border-radius:4px;
-                       background:var(--bg-secondary);color:var(--text-primary);
-                       font-size:13px;margin-bottom:8px;">
+                       placeholder="http://localhost:8000" class="config-input">
 
                 <label class="field-label">Namespace:</label>
                 <input type="text" name="namespace" value="{namespace}"
-                       placeholder="augment" style="width:100%;padding:8px;
-                       border:1px solid var(--border-color);border-radius:4px;
-                       background:var(--bg-secondary);color:var(--text-primary);
-                       font-size:13px;margin-bottom:8px;">
+                       placeholder="augment" class="config-input">
 
                 <label class="field-label">User ID:</label>
                 <input type="text" name="user_id" value="{user_id}"
-                       placeholder="your-user-id" style="width:100%;padding:8px;
-                       border:1px solid var(--border-color);border-radius:4px;
-                       background:var(--bg-secondary);color:var(--text-primary);
-                       font-size:13px;margin-bottom:8px;">
+                       placeholder="your-user-id" class="config-input">
 
                 <label class="field-label">API Key (optional):</label>
                 <input type="password" name="api_key" value="{api_key}"
-                       placeholder="Leave empty if not required" style="width:100%;
-                       padding:8px;border:1px solid var(--border-color);border-radius:4px;
-                       background:var(--bg-secondary);color:var(--text-primary);
-                       font-size:13px;margin-bottom:8px;">
+                       placeholder="Leave empty if not required" class="config-input">
 
                 <div class="memory-options">
                     <strong style="display:block;margin-bottom:10px;">Options</strong>
@@ -3393,8 +4327,8 @@ def _render_federation_config_section(config: dict) -> str:
 
     enabled_checked = "checked" if fed_config.enabled else ""
     share_locally_checked = "checked" if fed_config.share_locally else ""
-    machine_name = html.escape(fed_config.this_machine_name)
-    api_key = html.escape(fed_config.api_key or "")
+    machine_name = _escape(fed_config.this_machine_name)
+    api_key = _escape(fed_config.api_key or "")
 
     # Status indicator
     num_remotes = len(fed_config.remote_dashboards)
@@ -3407,13 +4341,13 @@ def _render_federation_config_section(config: dict) -> str:
         status_text = "Disabled"
 
     # Build remotes list HTML
-    remotes_html = ""
+    remote_items = []
     for i, remote in enumerate(fed_config.remote_dashboards):
         health_color = "var(--status-idle)" if remote.is_healthy else "var(--status-active)"
         health_icon = "✓" if remote.is_healthy else "✗"
-        escaped_name = html.escape(remote.name)
-        escaped_url = html.escape(remote.url)
-        remotes_html += f'''
+        escaped_name = _escape(remote.name)
+        escaped_url = _escape(remote.url)
+        remote_items.append(f'''
             <div class="remote-item">
                 <div class="remote-info">
                     <span class="remote-health" style="color:{health_color};">
@@ -3428,9 +4362,11 @@ def _render_federation_config_section(config: dict) -> str:
                     <button type="submit" class="btn-delete-remote">Remove</button>
                 </form>
             </div>
-        '''
+        ''')
 
-    if not remotes_html:
+    if remote_items:
+        remotes_html = "".join(remote_items)
+    else:
         remotes_html = (
             '<p style="color:var(--text-secondary);margin:10px 0;">'
             "No remote dashboards configured.</p>"
@@ -3463,17 +4399,11 @@ def _render_federation_config_section(config: dict) -> str:
 
                 <label class="field-label">This Machine's Name:</label>
                 <input type="text" name="this_machine_name" value="{machine_name}"
-                       placeholder="e.g., Work Laptop" style="width:100%;padding:8px;
-                       border:1px solid var(--border-color);border-radius:4px;
-                       background:var(--bg-secondary);color:var(--text-primary);
-                       font-size:13px;margin-bottom:8px;">
+                       placeholder="e.g., Work Laptop" class="config-input">
 
                 <label class="field-label">API Key (for incoming connections):</label>
                 <input type="password" name="api_key" value="{api_key}"
-                       placeholder="Leave empty for no authentication" style="width:100%;
-                       padding:8px;border:1px solid var(--border-color);border-radius:4px;
-                       background:var(--bg-secondary);color:var(--text-primary);
-                       font-size:13px;margin-bottom:8px;">
+                       placeholder="Leave empty for no authentication" class="config-input">
 
                 <button type="submit" class="btn-primary" style="margin-top:8px;">
                     Save Settings
@@ -3501,10 +4431,7 @@ def _render_federation_config_section(config: dict) -> str:
 
                     <label class="field-label">API Key (if required):</label>
                     <input type="password" name="remote_api_key"
-                           placeholder="Leave empty if not required" style="width:100%;
-                           padding:8px;border:1px solid var(--border-color);border-radius:4px;
-                           background:var(--bg-secondary);color:var(--text-primary);
-                           font-size:13px;margin-bottom:8px;">
+                           placeholder="Leave empty if not required" class="config-input">
 
                     <button type="submit" class="btn-primary">Add Remote</button>
                 </form>
@@ -3513,41 +4440,58 @@ def _render_federation_config_section(config: dict) -> str:
     '''
 
 
+# Card for one quick reply in the config page, filled via str.format_map
+_QUICK_REPLY_CARD_TEMPLATE = _strip_indentation("""
+    <div class="config-card">
+        <div class="config-card-header">
+            <strong>{escaped_name}</strong>
+            <form method="POST" action="/config/quick-replies/delete" class="inline-form">
+                <input type="hidden" name="name" value="{escaped_name}">
+                <button type="submit" onclick="return confirm('Delete this quick reply?')"
+                    class="btn-icon btn-danger" title="Delete">🗑</button>
+            </form>
+        </div>
+        <form method="POST" action="/config/quick-replies/edit" class="config-edit-form">
+            <input type="hidden" name="name" value="{escaped_name}">
+            <label class="field-label">Message:</label>
+            <textarea name="message" rows="2">{escaped_message}</textarea>
+            <button type="submit" class="btn-primary btn-sm">Save</button>
+        </form>
+    </div>
+""")
+
+
+# Shown in place of the quick reply cards when none are configured
+_NO_QUICK_REPLIES_HTML = '''
+        <p style="color: var(--text-secondary); font-style: italic; margin: 10px 0;">
+            No quick replies configured. Add one below to get started.
+        </p>
+        '''
+
+
+@functools.lru_cache(maxsize=256)
+def _render_quick_reply_card(name: str, message: str) -> str:
+    """Render the config card for one quick reply (memoized)."""
+    return _QUICK_REPLY_CARD_TEMPLATE.format_map({
+        "escaped_name": html.escape(name),
+        # Textarea contents only need &, < and > escaped
+        "escaped_message": html.escape(message, quote=False),
+    })
+
+
 def _render_quick_replies_config_section(config: dict) -> str:
     """Render the quick replies configuration section."""
     quick_replies = config.get("quick_replies", {})
     num_replies = len(quick_replies)
 
     # Build quick reply cards
-    replies_html = ""
     if num_replies == 0:
-        replies_html = '''
-        <p style="color: var(--text-secondary); font-style: italic; margin: 10px 0;">
-            No quick replies configured. Add one below to get started.
-        </p>
-        '''
+        replies_html = _NO_QUICK_REPLIES_HTML
     else:
-        for name, message in quick_replies.items():
-            escaped_name = html.escape(name)
-            escaped_message = html.escape(message)
-            replies_html += f'''
-            <div class="config-card">
-                <div class="config-card-header">
-                    <strong>{escaped_name}</strong>
-                    <form method="POST" action="/config/quick-replies/delete" class="inline-form">
-                        <input type="hidden" name="name" value="{escaped_name}">
-                        <button type="submit" onclick="return confirm('Delete this quick reply?')"
-                            class="btn-icon btn-danger" title="Delete">🗑</button>
-                    </form>
-                </div>
-                <form method="POST" action="/config/quick-replies/edit" class="config-edit-form">
-                    <input type="hidden" name="name" value="{escaped_name}">
-                    <label class="field-label">Message:</label>
-                    <textarea name="message" rows="2">{escaped_message}</textarea>
-                    <button type="submit" class="btn-primary btn-sm">Save</button>
-                </form>
-            </div>
-            '''
+        replies_html = "".join(
+            _render_quick_reply_card(name, message)
+            for name, message in quick_replies.items()
+        )
 
     # Status indicator
     if num_replies > 0:
@@ -3611,20 +4555,14 @@ def _render_agent_settings_section(config: dict) -> str:
                 <form method="POST" action="/config/agent-settings">
                     <label class="field-label">Agent Timeout (minutes):</label>
                     <input type="number" name="agent_timeout_minutes" value="{agent_timeout_minutes}"
-                           min="1" max="120" style="width:100%;padding:8px;
-                           border:1px solid var(--border-color);border-radius:4px;
-                           background:var(--bg-secondary);color:var(--text-primary);
-                           font-size:13px;margin-bottom:8px;">
+                           min="1" max="120" class="config-input">
                     <p style="color:var(--text-secondary);font-size:0.85em;margin-bottom:12px;">
                         If an agent hasn't responded for this long, the session is reset (default: 15).
                     </p>
 
                     <label class="field-label">Max Loop Iterations:</label>
                     <input type="number" name="max_loop_iterations" value="{max_loop_iterations}"
-                           min="1" max="500" style="width:100%;padding:8px;
-                           border:1px solid var(--border-color);border-radius:4px;
-                           background:var(--bg-secondary);color:var(--text-primary);
-                           font-size:13px;margin-bottom:8px;">
+                           min="1" max="500" class="config-input">
                     <p style="color:var(--text-secondary);font-size:0.85em;margin-bottom:12px;">
                         Maximum number of loop iterations before automatically stopping (default: 50).
                     </p>
@@ -3639,49 +4577,244 @@ def _render_agent_settings_section(config: dict) -> str:
     '''
 
 
-def render_config_page(
-    dark_mode: str | None,
-    loop_prompts: dict[str, dict[str, str]],
-    config: dict,
-) -> str:
-    """Render the configuration page HTML."""
-    styles = get_base_styles(dark_mode)
-    prompt_count = len(loop_prompts)
+def _get_config_page_styles() -> str:
+    """Get CSS styles for the config page sections, cards and forms."""
+    return """
+        /* Collapsible sections */
+        .config-section {
+            background: var(--bg-secondary);
+            border: 1px solid var(--border-color);
+            border-radius: 8px;
+            margin-bottom: 16px;
+            overflow: hidden;
+        }
+        .section-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 14px 16px;
+            cursor: pointer;
+            user-select: none;
+            background: var(--bg-secondary);
+        }
+        .section-header:hover {
+            background: var(--bg-hover);
+        }
+        .section-header h2 {
+            margin: 0;
+            font-size: 1.1em;
+        }
+        .section-toggle {
+            font-size: 0.9em;
+            color: var(--text-secondary);
+            transition: transform 0.2s;
+        }
+        .section-content {
+            padding: 0 16px 16px;
+            display: block;
+        }
+        .section-content.collapsed {
+            display: none;
+        }
+        .section-description {
+            color: var(--text-secondary);
+            margin-bottom: 15px;
+            font-size: 0.9em;
+        }
+        .section-badge {
+            background: var(--accent-color);
+            color: white;
+            padding: 2px 8px;
+            border-radius: 10px;
+            font-size: 0.75em;
+            margin-left: 8px;
+        }
+        /* Config cards */
+        .config-card {
+            background: var(--bg-primary);
+            border: 1px solid var(--border-color);
+            border-radius: 6px;
+            padding: 12px;
+            margin-bottom: 10px;
+        }
+        .config-card-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 8px;
+        }
+        .config-edit-form textarea,
+        .config-edit-form input[type="text"] {
+            width: 100%;
+            padding: 8px;
+            border: 1px solid var(--border-color);
+            border-radius: 4px;
+            background: var(--bg-secondary);
+            color: var(--text-primary);
+            font-family: inherit;
+            font-size: 13px;
+            resize: vertical;
+            margin-bottom: 8px;
+        }
+        .field-label {
+            display: block;
+            font-size: 0.8em;
+            color: var(--text-secondary);
+            margin-bottom: 4px;
+            margin-top: 8px;
+        }
+        .field-label:first-of-type {
+            margin-top: 0;
+        }
+        /* Text and number fields in the settings forms */
+        .config-input {
+            width: 100%;
+            padding: 8px;
+            border: 1px solid var(--border-color);
+            border-radius: 4px;
+            background: var(--bg-secondary);
+            color: var(--text-primary);
+            font-size: 13px;
+            margin-bottom: 8px;
+        }
+        /* Add forms */
+        .add-form {
+            background: var(--bg-primary);
+            border: 1px dashed var(--border-color);
+            border-radius: 6px;
+            padding: 14px;
+            margin-top: 12px;
+        }
+        .add-form h4 {
+            margin: 0 0 12px 0;
+            font-size: 0.95em;
+            color: var(--text-secondary);
+        }
+        .add-form input[type="text"],
+        .add-form textarea {
+            width: 100%;
+            padding: 8px;
+            border: 1px solid var(--border-color);
+            border-radius: 4px;
+            background: var(--bg-secondary);
+            color: var(--text-primary);
+            font-size: 13px;
+            margin-bottom: 8px;
+        }
+        .add-form textarea {
+            min-height: 60px;
+            resize: vertical;
+            font-family: inherit;
+        }
+        /* Button styles */
+        .btn-primary {
+            padding: 8px 16px;
+            background: var(--accent-color);
+            color: white;
+            border: none;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 13px;
+            font-weight: 500;
+        }
+        .btn-primary:hover {
+            opacity: 0.9;
+        }
+        .btn-sm {
+            padding: 5px 10px;
+            font-size: 12px;
+        }
+        .btn-icon {
+            padding: 4px 8px;
+            background: transparent;
+            border: 1px solid var(--border-color);
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 14px;
+        }
+        .btn-danger {
+            color: var(--status-active);
+            border-color: var(--status-active);
+        }
+        .btn-danger:hover {
+            background: var(--status-active);
+            color: white;
+        }
+        /* Legacy styles for federation/memory sections */
+        .memory-status {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            margin-bottom: 12px;
+        }
+        .status-dot {
+            width: 10px;
+            height: 10px;
+            border-radius: 50%;
+        }
+        .memory-options {
+            margin-top: 15px;
+            padding: 12px;
+            background: var(--bg-primary);
+            border-radius: 8px;
+        }
+        .memory-option {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            margin-bottom: 8px;
+            cursor: pointer;
+        }
+        .remotes-list {
+            margin: 10px 0;
+        }
+        .remote-item {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: 10px 12px;
+            background: var(--bg-primary);
+            border-radius: 6px;
+            margin-bottom: 8px;
+        }
+        .remote-info {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }
+        .remote-health {
+            font-size: 1.1em;
+        }
+        .remote-url {
+            color: var(--text-secondary);
+            font-size: 0.9em;
+        }
+        .btn-delete-remote {
+            padding: 4px 10px;
+            background: transparent;
+            color: var(--status-active);
+            border: 1px solid var(--status-active);
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 0.85em;
+        }
+        .btn-delete-remote:hover {
+            background: var(--status-active);
+            color: white;
+        }
+    """
 
-    # Build prompt list
-    prompts_html = ""
-    for name, prompt_config in loop_prompts.items():
-        escaped_name = html.escape(name)
-        # Handle both new format (dict) and legacy format (string)
-        if isinstance(prompt_config, str):
-            escaped_prompt = html.escape(prompt_config)
-            escaped_condition = ""
-        else:
-            escaped_prompt = html.escape(prompt_config.get("prompt", ""))
-            escaped_condition = html.escape(prompt_config.get("end_condition", ""))
-        prompts_html += f'''
-        <div class="config-card">
-            <div class="config-card-header">
-                <strong>{escaped_name}</strong>
-                <form method="POST" action="/config/prompts/delete" class="inline-form">
-                    <input type="hidden" name="name" value="{escaped_name}">
-                    <button type="submit" onclick="return confirm('Delete this prompt?')"
-                        class="btn-icon btn-danger" title="Delete">🗑</button>
-                </form>
-            </div>
-            <form method="POST" action="/config/prompts/edit" class="config-edit-form">
-                <input type="hidden" name="name" value="{escaped_name}">
-                <label class="field-label">Prompt (instructions for the LLM):</label>
-                <textarea name="prompt" rows="3">{escaped_prompt}</textarea>
-                <label class="field-label">End Condition (stops loop when found):</label>
-                <input type="text" name="end_condition" value="{escaped_condition}"
-                    placeholder="e.g., LOOP_COMPLETE: Task finished.">
-                <button type="submit" class="btn-primary btn-sm">Save</button>
-            </form>
-        </div>
-        '''
 
-    return f"""
+# Built once; the version changes whenever the stylesheet does, so
+# /config.css can be cached forever
+_CONFIG_PAGE_STYLES = _strip_indentation(_get_config_page_styles())
+_CONFIG_PAGE_STYLES_VERSION = _crc32_hex(_CONFIG_PAGE_STYLES)
+
+
+# Page shell for render_config_page; the stylesheet link is baked in and the
+# indentation stripped at import, the sections are filled per request via
+# str.format_map
+_CONFIG_TEMPLATE = _strip_indentation(_bake_template("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -3695,229 +4828,17 @@ def render_config_page(
         <link rel="apple-touch-icon" href="/icon-192.png">
         <meta name="theme-color" content="#6366f1">
         {styles}
-        <style>
-            /* Collapsible sections */
-            .config-section {{
-                background: var(--bg-secondary);
-                border: 1px solid var(--border-color);
-                border-radius: 8px;
-                margin-bottom: 16px;
-                overflow: hidden;
-            }}
-            .section-header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 14px 16px;
-                cursor: pointer;
-                user-select: none;
-                background: var(--bg-secondary);
-            }}
-            .section-header:hover {{
-                background: var(--bg-hover);
-            }}
-            .section-header h2 {{
-                margin: 0;
-                font-size: 1.1em;
-            }}
-            .section-toggle {{
-                font-size: 0.9em;
-                color: var(--text-secondary);
-                transition: transform 0.2s;
-            }}
-            .section-content {{
-                padding: 0 16px 16px;
-                display: block;
-            }}
-            .section-content.collapsed {{
-                display: none;
-            }}
-            .section-description {{
-                color: var(--text-secondary);
-                margin-bottom: 15px;
-                font-size: 0.9em;
-            }}
-            .section-badge {{
-                background: var(--accent-color);
-                color: white;
-                padding: 2px 8px;
-                border-radius: 10px;
-                font-size: 0.75em;
-                margin-left: 8px;
-            }}
-            /* Config cards */
-            .config-card {{
-                background: var(--bg-primary);
-                border: 1px solid var(--border-color);
-                border-radius: 6px;
-                padding: 12px;
-                margin-bottom: 10px;
-            }}
-            .config-card-header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 8px;
-            }}
-            .config-edit-form textarea,
-            .config-edit-form input[type="text"] {{
-                width: 100%;
-                padding: 8px;
-                border: 1px solid var(--border-color);
-                border-radius: 4px;
-                background: var(--bg-secondary);
-                color: var(--text-primary);
-                font-family: inherit;
-                font-size: 13px;
-                resize: vertical;
-                margin-bottom: 8px;
-            }}
-            .field-label {{
-                display: block;
-                font-size: 0.8em;
-                color: var(--text-secondary);
-                margin-bottom: 4px;
-                margin-top: 8px;
-            }}
-            .field-label:first-of-type {{
-                margin-top: 0;
-            }}
-            /* Add forms */
-            .add-form {{
-                background: var(--bg-primary);
-                border: 1px dashed var(--border-color);
-                border-radius: 6px;
-                padding: 14px;
-                margin-top: 12px;
-            }}
-            .add-form h4 {{
-                margin: 0 0 12px 0;
-                font-size: 0.95em;
-                color: var(--text-secondary);
-            }}
-            .add-form input[type="text"],
-            .add-form textarea {{
-                width: 100%;
-                padding: 8px;
-                border: 1px solid var(--border-color);
-                border-radius: 4px;
-                background: var(--bg-secondary);
-                color: var(--text-primary);
-                font-size: 13px;
-                margin-bottom: 8px;
-            }}
-            .add-form textarea {{
-                min-height: 60px;
-                resize: vertical;
-                font-family: inherit;
-            }}
-            /* Button styles */
-            .btn-primary {{
-                padding: 8px 16px;
-                background: var(--accent-color);
-                color: white;
-                border: none;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 13px;
-                font-weight: 500;
-            }}
-            .btn-primary:hover {{
-                opacity: 0.9;
-            }}
-            .btn-sm {{
-                padding: 5px 10px;
-                font-size: 12px;
-            }}
-            .btn-icon {{
-                padding: 4px 8px;
-                background: transparent;
-                border: 1px solid var(--border-color);
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 14px;
-            }}
-            .btn-danger {{
-                color: var(--status-active);
-                border-color: var(--status-active);
-            }}
-            .btn-danger:hover {{
-                background: var(--status-active);
-                color: white;
-            }}
-            /* Legacy styles for federation/memory sections */
-            .memory-status {{
-                display: flex;
-                align-items: center;
-                gap: 8px;
-                margin-bottom: 12px;
-            }}
-            .status-dot {{
-                width: 10px;
-                height: 10px;
-                border-radius: 50%;
-            }}
-            .memory-options {{
-                margin-top: 15px;
-                padding: 12px;
-                background: var(--bg-primary);
-                border-radius: 8px;
-            }}
-            .memory-option {{
-                display: flex;
-                align-items: center;
-                gap: 8px;
-                margin-bottom: 8px;
-                cursor: pointer;
-            }}
-            .remotes-list {{
-                margin: 10px 0;
-            }}
-            .remote-item {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 10px 12px;
-                background: var(--bg-primary);
-                border-radius: 6px;
-                margin-bottom: 8px;
-            }}
-            .remote-info {{
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }}
-            .remote-health {{
-                font-size: 1.1em;
-            }}
-            .remote-url {{
-                color: var(--text-secondary);
-                font-size: 0.9em;
-            }}
-            .btn-delete-remote {{
-                padding: 4px 10px;
-                background: transparent;
-                color: var(--status-active);
-                border: 1px solid var(--status-active);
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 0.85em;
-            }}
-            .btn-delete-remote:hover {{
-                background: var(--status-active);
-                color: white;
-            }}
-        </style>
+        {config_stylesheet}
     </head>
     <body>
         <a href="/" class="back-link">← Back to Dashboard</a>
         <h1>⚙️ Configuration</h1>
 
         <!-- Quick Replies Section (expanded by default - fewer items) -->
-        {_render_quick_replies_config_section(config)}
+        {quick_replies_section}
 
         <!-- Agent Settings Section -->
-        {_render_agent_settings_section(config)}
+        {agent_settings_section}
 
         <!-- Loop Prompts Section (collapsed by default - many items) -->
         <div class="config-section">
@@ -3958,7 +4879,7 @@ def render_config_page(
                 <span class="section-toggle" id="federation-toggle">▼</span>
             </div>
             <div class="section-content" id="federation-content">
-                {_render_federation_config_section(config)}
+                {federation_section}
             </div>
         </div>
 
@@ -3969,7 +4890,7 @@ def render_config_page(
                 <span class="section-toggle" id="memory-toggle">▼</span>
             </div>
             <div class="section-content" id="memory-content">
-                {_render_memory_config_section(config)}
+                {memory_section}
             </div>
         </div>
 
@@ -3990,18 +4911,120 @@ def render_config_page(
         </script>
     </body>
     </html>
+""",
+    config_stylesheet=(
+        f'<link rel="stylesheet" href="/config.css?v={_CONFIG_PAGE_STYLES_VERSION}">'
+    ),
+))
+
+
+# Card for one loop prompt in the config page, filled via str.format_map
+_LOOP_PROMPT_CARD_TEMPLATE = _strip_indentation("""
+    <div class="config-card">
+        <div class="config-card-header">
+            <strong>{escaped_name}</strong>
+            <form method="POST" action="/config/prompts/delete" class="inline-form">
+                <input type="hidden" name="name" value="{escaped_name}">
+                <button type="submit" onclick="return confirm('Delete this prompt?')"
+                    class="btn-icon btn-danger" title="Delete">🗑</button>
+            </form>
+        </div>
+        <form method="POST" action="/config/prompts/edit" class="config-edit-form">
+            <input type="hidden" name="name" value="{escaped_name}">
+            <label class="field-label">Prompt (instructions for the LLM):</label>
+            <textarea name="prompt" rows="3">{escaped_prompt}</textarea>
+            <label class="field-label">End Condition (stops loop when found):</label>
+            <input type="text" name="end_condition" value="{escaped_condition}"
+                placeholder="e.g., LOOP_COMPLETE: Task finished.">
+            <button type="submit" class="btn-primary btn-sm">Save</button>
+        </form>
+    </div>
+""")
+
+
+@functools.lru_cache(maxsize=256)
+def _render_loop_prompt_card(name: str, prompt: str, end_condition: str) -> str:
+    """Render the config card for one loop prompt (memoized)."""
+    return _LOOP_PROMPT_CARD_TEMPLATE.format_map({
+        "escaped_name": html.escape(name),
+        # Textarea contents only need &, < and > escaped
+        "escaped_prompt": html.escape(prompt, quote=False),
+        "escaped_condition": html.escape(end_condition),
+    })
+
+
+def _iter_loop_prompt_cards(loop_prompts: Mapping[str, dict[str, str]]):
+    """Yield the config card for each loop prompt."""
+    for name, prompt_config in loop_prompts.items():
+        # Handle both new format (dict) and legacy format (string)
+        if isinstance(prompt_config, str):
+            yield _render_loop_prompt_card(name, prompt_config, "")
+        else:
+            yield _render_loop_prompt_card(
+                name,
+                prompt_config.get("prompt", ""),
+                prompt_config.get("end_condition", ""),
+            )
+
+
+# _CONFIG_TEMPLATE cut at its section fields: literal text alternates with
+# section names, so the page can be streamed while sections are rendered
+_CONFIG_TEMPLATE_PARTS = re.split(
+    r"\{(quick_replies_section|agent_settings_section|prompts_html"
+    r"|federation_section|memory_section)\}",
+    _CONFIG_TEMPLATE,
+)
+
+_CONFIG_SECTION_RENDERERS = {
+    "quick_replies_section": _render_quick_replies_config_section,
+    "agent_settings_section": _render_agent_settings_section,
+    "federation_section": _render_federation_config_section,
+    "memory_section": _render_memory_config_section,
+}
+
+
+def _render_config_chunks(
+    dark_mode: str | None,
+    loop_prompts: Mapping[str, dict[str, str]],
+    config: dict,
+):
+    """Yield the configuration page HTML in order, starting with the head.
+
+    Each section is rendered only when the stream reaches it, so the browser
+    can start on the styles while the rest of the page is still being built.
     """
+    fields = {"styles": get_base_stylesheet_link(dark_mode), "prompt_count": len(loop_prompts)}
+    literals = _CONFIG_TEMPLATE_PARTS[::2]
+    sections = _CONFIG_TEMPLATE_PARTS[1::2] + [None]
+    for literal, section in zip(literals, sections):
+        yield literal.format_map(fields)
+        if section == "prompts_html":
+            yield from _iter_loop_prompt_cards(loop_prompts)
+        elif section:
+            yield _CONFIG_SECTION_RENDERERS[section](config)
+
+
+def render_config_page(
+    dark_mode: str | None,
+    loop_prompts: Mapping[str, dict[str, str]],
+    config: dict,
+) -> str:
+    """Render the configuration page HTML."""
+    return "".join(_render_config_chunks(dark_mode, loop_prompts, config))
 
 
-def _format_elapsed_time(started_at: datetime | None) -> str:
-    """Format elapsed time since loop started."""
+def _format_elapsed_time(started_at: datetime | None, now: float | None = None) -> str:
+    """Format elapsed time since loop started.
+
+    `now` is a Unix timestamp, defaulting to the current time.
+    """
     if not started_at:
         return ""
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = time.time()
     if started_at.tzinfo is None:
         started_at = started_at.replace(tzinfo=timezone.utc)
-    elapsed = now - started_at
-    total_seconds = int(elapsed.total_seconds())
+    total_seconds = int(now - started_at.timestamp())
     hours, remainder = divmod(total_seconds, 3600)
     minutes, seconds = divmod(remainder, 60)
     if hours > 0:
@@ -4017,21 +5040,26 @@ def _render_quick_replies_html(session_id: str) -> str:
     quick_replies = _get_quick_replies()
     if not quick_replies:
         return ""
+    return _render_quick_replies_section(tuple(quick_replies.items()))
+
 
-    buttons_html = ""
-    for name, message in quick_replies.items():
+@functools.lru_cache(maxsize=8)
+def _render_quick_replies_section(quick_replies: tuple[tuple[str, str], ...]) -> str:
+    """Render the buttons for a given set of quick replies (memoized)."""
+    buttons = []
+    for name, message in quick_replies:
         escaped_name = html.escape(name)
         escaped_message = html.escape(message).replace("'", "\\'")
-        buttons_html += f'''
+        buttons.append(f'''
             <button type="button" class="quick-reply-btn"
                 onclick="insertQuickReply('{escaped_message}')"
                 title="{escaped_message}">⚡ {escaped_name}</button>
-        '''
+        ''')
 
     return f'''
         <div class="quick-replies-section">
             <label class="field-label" style="margin-bottom:6px;">Quick Replies:</label>
-            <div class="quick-replies-list">{buttons_html}</div>
+            <div class="quick-replies-list">{"".join(buttons)}</div>
         </div>
     '''
 
@@ -4064,6 +5092,29 @@ def _get_quick_replies_styles() -> str:
     """
 
 
+# Message forms for _render_message_form, filled via str.format_map
+_QUEUE_MESSAGE_FORM_TEMPLATE = """
+    <div class="status-banner status-active">
+        ⏳ Agent working{queue_info}
+    </div>
+    {quick_replies_html}
+    <form method="POST" action="/session/{sid}/queue">
+        <textarea id="message-input" name="message"
+            placeholder="Type a message..."></textarea>
+        <button type="submit" class="btn-queue">🕐 Enqueue</button>
+    </form>
+"""
+
+_SEND_MESSAGE_FORM_TEMPLATE = """
+    {quick_replies_html}
+    <form method="POST" action="/session/{sid}/message" class="message-form">
+        <textarea id="message-input" name="message"
+            placeholder="Type a message..."></textarea>
+        <button type="submit">▶ Send</button>
+    </form>
+"""
+
+
 def _render_message_form(session) -> str:
     """Render the message form - send when idle, enqueue when busy."""
     from augment_agent_dashboard.models import SessionStatus
@@ -4074,38 +5125,87 @@ def _render_message_form(session) -> str:
     if queued_count > 0:
         queue_info = f' <span class="queue-count">({queued_count} queued)</span>'
 
+    # Agent working - can only enqueue; idle - can send directly
+    if session.status == SessionStatus.ACTIVE:
+        template = _QUEUE_MESSAGE_FORM_TEMPLATE
+    else:
+        template = _SEND_MESSAGE_FORM_TEMPLATE
     sid = session.session_id
-    quick_replies_html = _render_quick_replies_html(sid)
+    return template.format_map({
+        "sid": sid,
+        "queue_info": queue_info,
+        "quick_replies_html": _render_quick_replies_html(sid),
+    })
 
-    if session.status == SessionStatus.ACTIVE:
-        # Agent is working - can only enqueue
-        return f'''
-            <div class="status-banner status-active">
-                ⏳ Agent working{queue_info}
-            </div>
-            {quick_replies_html}
-            <form method="POST" action="/session/{sid}/queue">
-                <textarea id="message-input" name="message"
-                    placeholder="Type a message..."></textarea>
-                <button type="submit" class="btn-queue">🕐 Enqueue</button>
-            </form>
-        '''
+
+@functools.lru_cache(maxsize=256)
+def _render_loop_prompt_option(name: str, prompt: str, end_condition: str | None) -> str:
+    """Render a loop prompt dropdown option with a preview tooltip (memoized).
+
+    end_condition is None for legacy prompts configured as a bare string.
+    """
+    escaped_name = html.escape(name)
+    if end_condition is None:
+        tooltip = prompt[:100] + "..." if len(prompt) > 100 else prompt
     else:
-        # Agent is idle - can send directly
-        return f'''
-            {quick_replies_html}
-            <form method="POST" action="/session/{sid}/message" class="message-form">
-                <textarea id="message-input" name="message"
-                    placeholder="Type a message..."></textarea>
-                <button type="submit">▶ Send</button>
+        prompt_preview = prompt[:80] + "..." if len(prompt) > 80 else prompt
+        tooltip = f"Prompt: {prompt_preview}"
+        if end_condition:
+            tooltip += f"\n\nStops when: {end_condition}"
+    escaped_tooltip = html.escape(tooltip)
+    return f'<option value="{escaped_name}" title="{escaped_tooltip}">{escaped_name}</option>'
+
+
+# Loop control bars for _render_loop_controls, filled via str.format_map
+_ACTIVE_LOOP_CONTROLS_TEMPLATE = """
+    <div class="loop-controls-container">
+        <div class="loop-controls">
+            <span style="color:var(--status-active);font-weight:bold;">
+                🔄 {escaped_prompt_name}
+            </span>
+            <span style="color:var(--text-secondary);">
+                {loop_count} iterations, {elapsed}
+            </span>
+            <form method="POST" action="/session/{sid}/loop/pause">
+                <button type="submit" class="btn-pause">⏸ Pause</button>
             </form>
-        '''
+            <form method="POST" action="/session/{sid}/loop/reset">
+                <button type="submit" class="btn-reset">↺ Reset</button>
+            </form>
+        </div>
+        {end_condition_html}
+        {prompt_preview_html}
+    </div>
+"""
+
+_PAUSED_LOOP_CONTROLS_TEMPLATE = """
+    <div class="loop-controls">
+        <span style="color:var(--text-secondary);">Loop Paused</span>
+        <form method="POST" action="/session/{sid}/loop/enable">
+            <select name="prompt_name" id="loop-prompt-select">{options_html}</select>
+            <button type="submit" class="btn-enable">▶ Enable</button>
+        </form>
+        <form method="POST" action="/session/{sid}/loop/reset">
+            <button type="submit" class="btn-reset">↺ Reset</button>
+        </form>
+    </div>
+    <div id="loop-prompt-preview" class="loop-prompt-preview" style="display:none;"></div>
+"""
 
 
-def _render_loop_controls(session, loop_prompts: dict[str, dict[str, str]]) -> str:
-    """Render the loop control UI section."""
+def _render_loop_controls(
+    session,
+    loop_prompts: Mapping[str, dict[str, str]],
+    now: datetime | None = None,
+) -> str:
+    """Render the loop control UI section.
+
+    `now` is the render's reference time, defaulting to the current time.
+    """
     if session.loop_enabled:
-        elapsed = _format_elapsed_time(session.loop_started_at)
+        elapsed = _format_elapsed_time(
+            session.loop_started_at, now.timestamp() if now is not None else None
+        )
         prompt_name = session.loop_prompt_name or "Unknown"
 
         # Get the end condition for the active loop
@@ -4120,7 +5220,7 @@ def _render_loop_controls(session, loop_prompts: dict[str, dict[str, str]]) -> s
         # Build end condition display
         end_condition_html = ""
         if end_condition:
-            escaped_condition = html.escape(end_condition)
+            escaped_condition = _escape(end_condition)
             end_condition_html = f'''
                 <div class="loop-end-condition">
                     <span class="end-condition-label">🎯 Stops when response contains:</span>
@@ -4131,7 +5231,7 @@ def _render_loop_controls(session, loop_prompts: dict[str, dict[str, str]]) -> s
         # Build prompt preview (collapsed by default)
         prompt_preview_html = ""
         if prompt_text:
-            escaped_prompt = html.escape(prompt_text)
+            escaped_prompt = _escape(prompt_text)
             prompt_preview_html = f'''
                 <details class="loop-prompt-details">
                     <summary>📝 View prompt</summary>
@@ -4139,195 +5239,433 @@ def _render_loop_controls(session, loop_prompts: dict[str, dict[str, str]]) -> s
                 </details>
             '''
 
-        return f'''
-            <div class="loop-controls-container">
-                <div class="loop-controls">
-                    <span style="color:var(--status-active);font-weight:bold;">
-                        🔄 {html.escape(prompt_name)}
-                    </span>
-                    <span style="color:var(--text-secondary);">
-                        {session.loop_count} iterations, {elapsed}
-                    </span>
-                    <form method="POST" action="/session/{session.session_id}/loop/pause">
-                        <button type="submit" class="btn-pause">⏸ Pause</button>
-                    </form>
-                    <form method="POST" action="/session/{session.session_id}/loop/reset">
-                        <button type="submit" class="btn-reset">↺ Reset</button>
-                    </form>
-                </div>
-                {end_condition_html}
-                {prompt_preview_html}
-            </div>
-        '''
+        return _ACTIVE_LOOP_CONTROLS_TEMPLATE.format_map({
+            "sid": session.session_id,
+            "escaped_prompt_name": _escape(prompt_name),
+            "loop_count": session.loop_count,
+            "elapsed": elapsed,
+            "end_condition_html": end_condition_html,
+            "prompt_preview_html": prompt_preview_html,
+        })
     else:
         # Build dropdown options with title tooltips showing prompt preview
-        options_html = ""
+        options = []
         for name, config in loop_prompts.items():
-            escaped_name = html.escape(name)
             if isinstance(config, str):
-                tooltip = config[:100] + "..." if len(config) > 100 else config
+                options.append(_render_loop_prompt_option(name, config, None))
             else:
-                prompt = config.get("prompt", "")
-                end_cond = config.get("end_condition", "")
-                prompt_preview = prompt[:80] + "..." if len(prompt) > 80 else prompt
-                tooltip = f"Prompt: {prompt_preview}"
-                if end_cond:
-                    tooltip += f"\n\nStops when: {end_cond}"
-            escaped_tooltip = html.escape(tooltip)
-            opt = f'<option value="{escaped_name}" title="{escaped_tooltip}">'
-            options_html += f'{opt}{escaped_name}</option>'
-
-        return f'''
-            <div class="loop-controls">
-                <span style="color:var(--text-secondary);">Loop Paused</span>
-                <form method="POST" action="/session/{session.session_id}/loop/enable">
-                    <select name="prompt_name" id="loop-prompt-select">{options_html}</select>
-                    <button type="submit" class="btn-enable">▶ Enable</button>
-                </form>
-                <form method="POST" action="/session/{session.session_id}/loop/reset">
-                    <button type="submit" class="btn-reset">↺ Reset</button>
-                </form>
-            </div>
-            <div id="loop-prompt-preview" class="loop-prompt-preview" style="display:none;"></div>
-        '''
+                options.append(_render_loop_prompt_option(
+                    name, config.get("prompt", ""), config.get("end_condition", ""),
+                ))
+
+        return _PAUSED_LOOP_CONTROLS_TEMPLATE.format_map({
+            "sid": session.session_id,
+            "options_html": "".join(options),
+        })
+
+
+# Clear-queue button appended by _render_messages_html, filled via str.format_map
+_CLEAR_QUEUE_TEMPLATE = """
+    <div class="queue-actions">
+        <form method="POST" action="/session/{sid}/queue/clear">
+            <button type="submit" class="btn-delete btn-small"
+                onclick="return confirm('Clear all {queued_count} queued messages?')">
+                🗑 Clear Queue ({queued_count})
+            </button>
+        </form>
+    </div>
+"""
 
 
-def _render_messages_html(session) -> tuple[str, int]:
+def _render_messages_html(session, now: datetime | None = None) -> tuple[str, int]:
     """Render just the messages HTML for a session.
 
+    `now` is the render's reference time, defaulting to the current time.
     Returns a tuple of (messages_html, queued_count).
     """
-    import base64
-
-    messages_html = ""
+    parts = []
     queued_count = 0
     if not session.messages:
-        messages_html = '<div class="empty-state">No messages in this session yet.</div>'
+        parts.append('<div class="empty-state">No messages in this session yet.</div>')
     else:
+        if now is None:
+            now = datetime.now(timezone.utc)
         for idx, msg in enumerate(session.messages):
-            role_class = msg.role
+            role = msg.role
             time_str = (
-                format_time_ago(msg.timestamp, include_title=True)
+                format_time_ago(msg.timestamp, now=now, include_title=True)
                 if msg.timestamp
                 else ""
             )
 
-            if msg.role == "queued":
-                queued_count += 1
-                role_label = f"🕐 Queued #{queued_count}"
-                content_html = f"<p>{html.escape(msg.content)}</p>"
-            elif msg.role == "assistant":
-                role_label = "Assistant"
+            # Escaped once: shown for plain messages and carried by the copy button
+            escaped_content = _escape_message(msg.content)
+            if role == "assistant":
                 content_html = render_markdown(msg.content)
             else:
-                role_label = msg.role.capitalize()
-                content_html = f"<p>{html.escape(msg.content)}</p>"
+                content_html = f"<p>{escaped_content}</p>"
 
-            # Encode raw content as base64 for the copy button
-            raw_content_b64 = base64.b64encode(msg.content.encode("utf-8")).decode("ascii")
-            msg_id = f"msg-{idx}"
+            if role == "queued":
+                queued_count += 1
+                role_label = f"🕐 Queued #{queued_count}"
+            else:
+                role_label = role.capitalize()
 
-            copy_onclick = f"copyMessage(this, '{raw_content_b64}')"
-            messages_html += f"""
-            <div class="message {role_class}" id="{msg_id}">
+            parts.append(f"""
+            <div class="message {role}" id="msg-{idx}">
                 <div class="message-header">
                     <span class="message-header-info">{role_label} • {time_str}</span>
-                    <button class="copy-btn" onclick="{copy_onclick}" title="Copy">
+                    <button class="copy-btn" data-copy="{escaped_content}"
+                        onclick="copyMessage(this)" title="Copy">
                         📋 Copy
                     </button>
                 </div>
                 <div class="message-content">{content_html}</div>
             </div>
-            """
+            """)
 
     # Add clear queue button if there are queued messages
     if queued_count > 0:
-        confirm_msg = f"Clear all {queued_count} queued messages?"
-        messages_html += f'''
-        <div class="queue-actions">
-            <form method="POST" action="/session/{session.session_id}/queue/clear">
-                <button type="submit" class="btn-delete btn-small"
-                    onclick="return confirm('{confirm_msg}')">
-                    🗑 Clear Queue ({queued_count})
-                </button>
-            </form>
-        </div>
-        '''
-
-    return messages_html, queued_count
+        parts.append(_CLEAR_QUEUE_TEMPLATE.format_map({
+            "sid": session.session_id,
+            "queued_count": queued_count,
+        }))
+
+    return "".join(parts), queued_count
+
+
+# One entry per SessionState value
+_STATE_LABELS = {
+    "idle": "Idle",
+    "active": "Working",
+    "turn_complete": "Turn Complete",
+    "review_pending": "Review Pending",
+    "under_review": "Under Review",
+    "ready_for_loop": "Ready",
+    "loop_prompting": "Looping",
+    "error": "Error",
+}
 
 
 def _get_state_label(state_value: str) -> str:
     """Get a human-readable label for a session state."""
-    labels = {
-        "idle": "Idle",
-        "active": "Working",
-        "turn_complete": "Turn Complete",
-        "review_pending": "Review Pending",
-        "under_review": "Under Review",
-        "ready_for_loop": "Ready",
-        "loop_prompting": "Looping",
-        "error": "Error",
-    }
-    return labels.get(state_value, state_value.replace("_", " ").title())
+    return _STATE_LABELS.get(state_value) or state_value.replace("_", " ").title()
+
+
+def _session_state_value(session) -> str:
+    """Get a session's detailed state, falling back to its legacy status.
+
+    Reads the stored state string rather than the ``state`` property, which
+    imports the state machine and builds an enum on every access and raises
+    for unknown values.
+    """
+    state_value = getattr(session, "_state", None)
+    if state_value in _STATE_LABELS:
+        return state_value
+    return session.status.value
+
+
+def _render_state_badge(session) -> str:
+    """Render a state badge showing the detailed session state."""
+    state_value = _session_state_value(session)
+
+    label = _get_state_label(state_value)
+    return f'''<span class="state-badge badge-{state_value}">
+        <span class="state-dot state-{state_value}"></span>
+        {label}
+    </span>'''
+
+
+def _render_session_status_html(session, now: datetime | None = None) -> str:
+    """Render the session status indicator HTML."""
+    time_ago = format_time_ago(session.last_activity, now=now, include_title=True)
+    state_badge = _render_state_badge(session)
+    return f"""
+        <div>{state_badge} • {time_ago}</div>
+        <div>{session.message_count} messages</div>
+    """
+
+
+def _get_session_detail_script() -> str:
+    """Get JavaScript for the session detail page.
+
+    The session id and message count come from the page's <body> data attributes.
+    """
+    return """
+        // Insert quick reply into message input
+        function insertQuickReply(message) {
+            const textarea = document.getElementById('message-input');
+            if (textarea) {
+                textarea.value = message;
+                textarea.focus();
+                // Also save to cache
+                if (typeof saveMessageToCache === 'function') {
+                    saveMessageToCache();
+                }
+            }
+        }
+
+        // Copy message to clipboard
+        async function copyMessage(btn) {
+            const text = btn.dataset.copy;
+            try {
+                await navigator.clipboard.writeText(text);
+
+                // Visual feedback
+                const originalText = btn.innerHTML;
+                btn.innerHTML = '✓ Copied';
+                btn.classList.add('copied');
+
+                setTimeout(() => {
+                    btn.innerHTML = originalText;
+                    btn.classList.remove('copied');
+                }, 2000);
+            } catch (err) {
+                console.error('Failed to copy:', err);
+                // Fallback for older browsers
+                const textarea = document.createElement('textarea');
+                textarea.value = text;
+                textarea.style.position = 'fixed';
+                textarea.style.opacity = '0';
+                document.body.appendChild(textarea);
+                textarea.select();
+                document.execCommand('copy');
+                document.body.removeChild(textarea);
+
+                btn.innerHTML = '✓ Copied';
+                btn.classList.add('copied');
+                setTimeout(() => {
+                    btn.innerHTML = '📋 Copy';
+                    btn.classList.remove('copied');
+                }, 2000);
+            }
+        }
+
+        // AJAX-based session updates
+        const REFRESH_INTERVAL = 3000;
+        const sessionId = document.body.dataset.sessionId;
+        let lastMessageCount = Number(document.body.dataset.messageCount);
+
+        function isUserInteracting() {
+            const textarea = document.getElementById('message-input');
+            if (!textarea) return false;
+
+            // Check if textarea has focus
+            if (document.activeElement === textarea) return true;
+
+            // Check if textarea has content
+            if (textarea.value.trim()) return true;
+
+            return false;
+        }
+
+        // Swap an element's children for parsed HTML in a single mutation,
+        // skipping the swap (and its style recalc) when the HTML is unchanged
+        const renderedHtml = new WeakMap();
+
+        function swapHtml(el, html) {
+            if (!el || renderedHtml.get(el) === html) return false;
+            const tpl = document.createElement('template');
+            tpl.innerHTML = html;
+            el.replaceChildren(tpl.content);
+            renderedHtml.set(el, html);
+            return true;
+        }
+
+        const sessionUrl = '/api/sessions/' + encodeURIComponent(sessionId);
+
+        // Hold the newest form until the user stops typing, since a pushed
+        // update is not repeated once nothing changes
+        let pendingFormHtml = null;
+        let pendingFormTimer = null;
+
+        function applyPendingForm() {
+            clearTimeout(pendingFormTimer);
+            if (pendingFormHtml === null) return;
+            if (isUserInteracting()) {
+                pendingFormTimer = setTimeout(applyPendingForm, 1000);
+                return;
+            }
+            const formContent = document.getElementById('message-form-content');
+            if (swapHtml(formContent, pendingFormHtml)) {
+                // Re-setup textarea caching after form replacement
+                if (typeof setupTextareaCache === 'function') {
+                    setupTextareaCache();
+                }
+            }
+            pendingFormHtml = null;
+        }
+
+        function applySessionUpdate(data) {
+            // Update status indicator in header
+            swapHtml(document.querySelector('.session-meta'), data.status_html);
+
+            // Update status dot class
+            const statusDot = document.querySelector('.status-dot');
+            if (statusDot) {
+                statusDot.className = 'status-dot status-' + data.status;
+            }
+
+            // Update messages - preserve scroll position
+            const messageList = document.getElementById('message-list');
+            if (messageList) {
+                const scrollDiff = messageList.scrollHeight - messageList.scrollTop;
+                const wasAtBottom = scrollDiff <= messageList.clientHeight + 100;
+                const oldScrollTop = messageList.scrollTop;
+
+                if (swapHtml(messageList, data.messages_html)) {
+                    // If user was at bottom or there are new messages, scroll to bottom
+                    if (wasAtBottom || data.message_count > lastMessageCount) {
+                        messageList.scrollTop = messageList.scrollHeight;
+                    } else {
+                        messageList.scrollTop = oldScrollTop;
+                    }
+                }
+                lastMessageCount = data.message_count;
+            }
+
+            // Update loop controls
+            swapHtml(document.getElementById('loop-controls-container'), data.loop_controls_html);
+
+            // Update message form only if user is not interacting
+            pendingFormHtml = data.message_form_html;
+            applyPendingForm();
+        }
+
+        async function refreshSession() {
+            try {
+                const response = await fetch(sessionUrl + '/messages-html');
+                if (response.ok) {
+                    applySessionUpdate(await response.json());
+                }
+            } catch (e) {
+                console.error('Failed to refresh session:', e);
+            }
+            scheduleRefresh();
+        }
+
+        function scheduleRefresh() {
+            setTimeout(refreshSession, REFRESH_INTERVAL);
+        }
+
+        // Server push: the server re-renders only when the session changes.
+        // Polling above remains the fallback where EventSource is missing.
+        if (typeof EventSource !== 'undefined') {
+            const sessionStream = new EventSource(sessionUrl + '/stream');
+            sessionStream.onmessage = (event) => {
+                applySessionUpdate(JSON.parse(event.data));
+            };
+        } else {
+            scheduleRefresh();
+        }
 
+        // Scroll to bottom on initial load
+        const messageList = document.getElementById('message-list');
+        if (messageList) {
+            messageList.scrollTop = messageList.scrollHeight;
+        }
+
+        // Cmd+Enter (Mac) or Ctrl+Enter (Windows/Linux) to send/queue message
+        document.addEventListener('keydown', function(e) {
+            if ((e.metaKey || e.ctrlKey) && e.key === 'Enter') {
+                const textarea = document.getElementById('message-input');
+                if (!textarea || !textarea.value.trim()) return;
+
+                // Find the form containing the textarea
+                const form = textarea.closest('form');
+                if (!form) return;
+
+                e.preventDefault();
+
+                // Find the first submit button in the form (whatever it is)
+                const firstBtn = form.querySelector('button[type="submit"]');
+                if (firstBtn) {
+                    // Clear the cache since we're submitting
+                    clearMessageCache();
+                    // Click the button to ensure formaction is used if present
+                    firstBtn.click();
+                }
+            }
+        });
+
+        // localStorage caching for message input
+        const MESSAGE_CACHE_KEY = 'augment_dashboard_message_' + sessionId;
+        let cacheSaveTimeout;
+
+        function saveMessageToCache() {
+            const textarea = document.getElementById('message-input');
+            if (textarea) {
+                const value = textarea.value;
+                if (value.trim()) {
+                    localStorage.setItem(MESSAGE_CACHE_KEY, value);
+                } else {
+                    localStorage.removeItem(MESSAGE_CACHE_KEY);
+                }
+            }
+        }
+
+        function loadMessageFromCache() {
+            const textarea = document.getElementById('message-input');
+            if (textarea) {
+                const cached = localStorage.getItem(MESSAGE_CACHE_KEY);
+                if (cached && !textarea.value.trim()) {
+                    textarea.value = cached;
+                }
+            }
+        }
 
-def _render_state_badge(session) -> str:
-    """Render a state badge showing the detailed session state."""
-    try:
-        state_value = session.state.value
-    except (AttributeError, ValueError):
-        # Fall back to status if state not available
-        state_value = session.status.value
+        function clearMessageCache() {
+            localStorage.removeItem(MESSAGE_CACHE_KEY);
+        }
 
-    label = _get_state_label(state_value)
-    return f'''<span class="state-badge badge-{state_value}">
-        <span class="state-dot state-{state_value}"></span>
-        {label}
-    </span>'''
+        // Set up caching on textarea - called on load and after AJAX form updates
+        function setupTextareaCache() {
+            const textarea = document.getElementById('message-input');
+            if (textarea && !textarea.dataset.cacheSetup) {
+                // Mark as set up to avoid duplicate listeners
+                textarea.dataset.cacheSetup = 'true';
 
+                // Load cached message
+                loadMessageFromCache();
 
-def _render_session_status_html(session) -> str:
-    """Render the session status indicator HTML."""
-    time_ago = format_time_ago(session.last_activity, include_title=True)
-    state_badge = _render_state_badge(session)
-    return f"""
-        <div>{state_badge} • {time_ago}</div>
-        <div>{session.message_count} messages</div>
-    """
+                // Save on input (debounced)
+                textarea.addEventListener('input', function() {
+                    clearTimeout(cacheSaveTimeout);
+                    cacheSaveTimeout = setTimeout(saveMessageToCache, 300);
+                });
 
+                // Clear cache when form is submitted
+                const form = textarea.closest('form');
+                if (form && !form.dataset.cacheSetup) {
+                    form.dataset.cacheSetup = 'true';
+                    form.addEventListener('submit', clearMessageCache);
+                }
+            }
+        }
 
-def render_session_detail(
-    session,
-    dark_mode: str | None,
-    loop_prompts: dict[str, dict[str, str]],
-    machine_name: str = "This Machine",
-) -> str:
-    """Render the session detail HTML."""
-    styles = get_base_styles(dark_mode)
-    quick_replies_styles = _get_quick_replies_styles()
+        // Initial setup
+        setupTextareaCache();
+    """
 
-    # Render message history
-    messages_html, queued_count = _render_messages_html(session)
 
-    # Get state for styling
-    try:
-        state_value = session.state.value
-    except (AttributeError, ValueError):
-        state_value = session.status.value
+# Built once and served from /session.js, versioned like /dashboard.js
+_SESSION_BUNDLE = "".join([
+    _get_timestamp_script(),
+    _get_pull_to_refresh_script(),
+    _get_session_detail_script(),
+])
+_SESSION_BUNDLE_VERSION = _crc32_hex(_SESSION_BUNDLE)
 
-    state_class = f"state-{state_value}"
-    time_ago = format_time_ago(session.last_activity, include_title=True)
-    escaped_machine = html.escape(machine_name)
-    state_badge = _render_state_badge(session)
 
-    return f"""
+# Page shell for render_session_detail; constant styles are baked in at
+# import, the rest is filled per request via str.format_map
+_SESSION_DETAIL_TEMPLATE = _bake_template("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{session.workspace_name} - Augment Dashboard</title>
+        <title>{workspace_name} - Augment Dashboard</title>
         <link rel="manifest" href="/manifest.json">
         <meta name="apple-mobile-web-app-capable" content="yes">
         <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
@@ -4337,7 +5675,7 @@ def render_session_detail(
         <style>{quick_replies_styles}</style>
         {styles}
     </head>
-    <body>
+    <body data-session-id="{session_id}" data-message-count="{message_count}">
         <div id="pull-to-refresh" class="pull-to-refresh">
             <div class="pull-to-refresh-spinner"></div>
             <span class="pull-to-refresh-text">Pull to refresh</span>
@@ -4349,11 +5687,11 @@ def render_session_detail(
                 <span class="status-dot {state_class}"
                     style="display:inline-block;vertical-align:middle;margin-right:10px;">
                 </span>
-                {session.workspace_name}
+                {workspace_name}
             </h1>
             <div class="session-meta" id="session-status">
                 <div>{state_badge} • {time_ago}</div>
-                <div>{session.message_count} messages</div>
+                <div>{message_count} messages</div>
             </div>
         </div>
 
@@ -4362,13 +5700,13 @@ def render_session_detail(
                 💻 {escaped_machine}
             </div>
             <br>
-            <strong>Workspace:</strong> {session.workspace_root}<br>
-            <strong>Session ID:</strong> {session.session_id}
+            <strong>Workspace:</strong> {workspace_root}<br>
+            <strong>Session ID:</strong> {session_id}
             <div id="loop-controls-container">
-                {_render_loop_controls(session, loop_prompts)}
+                {loop_controls_html}
             </div>
             <div class="loop-controls" style="margin-top:8px;">
-                <form method="POST" action="/session/{session.session_id}/delete">
+                <form method="POST" action="/session/{session_id}/delete">
                     <button type="submit" class="btn-delete"
                         onclick="return confirm('Delete this session?')">
                         🗑 Delete Session
@@ -4385,332 +5723,187 @@ def render_session_detail(
         <div class="message-form" id="message-form-container">
             <h3>Send Message to Agent</h3>
             <div id="message-form-content">
-                {_render_message_form(session)}
+                {message_form_html}
             </div>
         </div>
 
-        <script>
-            {_get_timestamp_script()}
-            {_get_pull_to_refresh_script()}
+        <script src="/session.js?v={bundle_version}"></script>
+    </body>
+    </html>
+""",
+    quick_replies_styles=_get_quick_replies_styles(),
+    bundle_version=_SESSION_BUNDLE_VERSION,
+)
 
-            // Insert quick reply into message input
-            function insertQuickReply(message) {{
-                const textarea = document.getElementById('message-input');
-                if (textarea) {{
-                    textarea.value = message;
-                    textarea.focus();
-                    // Also save to cache
-                    if (typeof saveMessageToCache === 'function') {{
-                        saveMessageToCache();
-                    }}
-                }}
-            }}
 
-            // Copy message to clipboard
-            async function copyMessage(btn, base64Content) {{
-                try {{
-                    // Decode base64 content
-                    const text = atob(base64Content);
-                    await navigator.clipboard.writeText(text);
-
-                    // Visual feedback
-                    const originalText = btn.innerHTML;
-                    btn.innerHTML = '✓ Copied';
-                    btn.classList.add('copied');
-
-                    setTimeout(() => {{
-                        btn.innerHTML = originalText;
-                        btn.classList.remove('copied');
-                    }}, 2000);
-                }} catch (err) {{
-                    console.error('Failed to copy:', err);
-                    // Fallback for older browsers
-                    const text = atob(base64Content);
-                    const textarea = document.createElement('textarea');
-                    textarea.value = text;
-                    textarea.style.position = 'fixed';
-                    textarea.style.opacity = '0';
-                    document.body.appendChild(textarea);
-                    textarea.select();
-                    document.execCommand('copy');
-                    document.body.removeChild(textarea);
-
-                    btn.innerHTML = '✓ Copied';
-                    btn.classList.add('copied');
-                    setTimeout(() => {{
-                        btn.innerHTML = '📋 Copy';
-                        btn.classList.remove('copied');
-                    }}, 2000);
-                }}
-            }}
+# Split around the message list so the head and header can be sent first
+_SESSION_DETAIL_HEAD, _SESSION_DETAIL_TAIL = _SESSION_DETAIL_TEMPLATE.split("{messages_html}")
 
-            // AJAX-based session updates
-            const REFRESH_INTERVAL = 3000;
-            const sessionId = '{session.session_id}';
-            let lastMessageCount = {session.message_count};
 
-            function isUserInteracting() {{
-                const textarea = document.getElementById('message-input');
-                if (!textarea) return false;
+def _render_session_detail_chunks(
+    session,
+    dark_mode: str | None,
+    loop_prompts: Mapping[str, dict[str, str]],
+    machine_name: str = "This Machine",
+):
+    """Yield the session detail HTML: head and header, messages, then the form."""
+    # Get state for styling
+    state_value = _session_state_value(session)
+    # One clock reading for every relative time on the page
+    now = datetime.now(timezone.utc)
 
-                // Check if textarea has focus
-                if (document.activeElement === textarea) return true;
+    yield _SESSION_DETAIL_HEAD.format_map({
+        "styles": get_base_stylesheet_link(dark_mode),
+        "workspace_name": _escape(session.workspace_name),
+        "workspace_root": _escape(session.workspace_root),
+        "session_id": session.session_id,
+        "message_count": session.message_count,
+        "state_class": f"state-{state_value}",
+        "state_badge": _render_state_badge(session),
+        "time_ago": format_time_ago(session.last_activity, now=now, include_title=True),
+        "escaped_machine": html.escape(machine_name),
+        "loop_controls_html": _render_loop_controls(session, loop_prompts, now),
+    })
 
-                // Check if textarea has content
-                if (textarea.value.trim()) return true;
+    # Render message history
+    messages_html, _ = _render_messages_html(session, now)
+    yield messages_html
 
-                return false;
-            }}
+    yield _SESSION_DETAIL_TAIL.format_map({
+        "message_form_html": _render_message_form(session),
+    })
 
-            async function refreshSession() {{
-                try {{
-                    const url = '/api/sessions/' + encodeURIComponent(sessionId);
-                    const response = await fetch(url + '/messages-html');
-                    if (!response.ok) return;
 
-                    const data = await response.json();
+def render_session_detail(
+    session,
+    dark_mode: str | None,
+    loop_prompts: Mapping[str, dict[str, str]],
+    machine_name: str = "This Machine",
+) -> str:
+    """Render the session detail HTML."""
+    return "".join(
+        _render_session_detail_chunks(session, dark_mode, loop_prompts, machine_name)
+    )
 
-                    // Update status indicator in header
-                    const statusMeta = document.querySelector('.session-meta');
-                    if (statusMeta) {{
-                        statusMeta.innerHTML = data.status_html;
-                    }}
-
-                    // Update status dot class
-                    const statusDot = document.querySelector('.status-dot');
-                    if (statusDot) {{
-                        statusDot.className = 'status-dot status-' + data.status;
-                    }}
-
-                    // Update messages - preserve scroll position
-                    const messageList = document.getElementById('message-list');
-                    if (messageList) {{
-                        const scrollDiff = messageList.scrollHeight - messageList.scrollTop;
-                        const wasAtBottom = scrollDiff <= messageList.clientHeight + 100;
-                        const oldScrollTop = messageList.scrollTop;
-
-                        messageList.innerHTML = data.messages_html;
-
-                        // If user was at bottom or there are new messages, scroll to bottom
-                        if (wasAtBottom || data.message_count > lastMessageCount) {{
-                            messageList.scrollTop = messageList.scrollHeight;
-                        }} else {{
-                            messageList.scrollTop = oldScrollTop;
-                        }}
-                        lastMessageCount = data.message_count;
-                    }}
-
-                    // Update loop controls
-                    const loopControls = document.getElementById('loop-controls-container');
-                    if (loopControls) {{
-                        loopControls.innerHTML = data.loop_controls_html;
-                    }}
-
-                    // Update message form only if user is not interacting
-                    if (!isUserInteracting()) {{
-                        const formContent = document.getElementById('message-form-content');
-                        if (formContent) {{
-                            formContent.innerHTML = data.message_form_html;
-                            // Re-setup textarea caching after form replacement
-                            if (typeof setupTextareaCache === 'function') {{
-                                setupTextareaCache();
-                            }}
-                        }}
-                    }}
-                }} catch (e) {{
-                    console.error('Failed to refresh session:', e);
-                }}
-                scheduleRefresh();
-            }}
 
-            function scheduleRefresh() {{
-                setTimeout(refreshSession, REFRESH_INTERVAL);
-            }}
+def _get_remote_session_detail_script() -> str:
+    """Get JavaScript for the remote session detail page.
 
-            // Start the refresh cycle
-            scheduleRefresh();
+    The federated session id comes from the page's <body> data attribute.
+    """
+    return """
+        // Copy message to clipboard
+        async function copyMessage(btn) {
+            try {
+                await navigator.clipboard.writeText(btn.dataset.copy);
+                btn.innerHTML = '✓ Copied';
+                btn.classList.add('copied');
+                setTimeout(() => {
+                    btn.innerHTML = '📋 Copy';
+                    btn.classList.remove('copied');
+                }, 2000);
+            } catch (err) {
+                console.error('Failed to copy:', err);
+            }
+        }
 
-            // Scroll to bottom on initial load
-            const messageList = document.getElementById('message-list');
-            if (messageList) {{
-                messageList.scrollTop = messageList.scrollHeight;
-            }}
+        // Scroll to bottom on load
+        const messageList = document.getElementById('message-list');
+        if (messageList) {
+            messageList.scrollTop = messageList.scrollHeight;
+        }
 
-            // Cmd+Enter (Mac) or Ctrl+Enter (Windows/Linux) to send/queue message
-            document.addEventListener('keydown', function(e) {{
-                if ((e.metaKey || e.ctrlKey) && e.key === 'Enter') {{
-                    const textarea = document.getElementById('message-input');
-                    if (!textarea || !textarea.value.trim()) return;
-
-                    // Find the form containing the textarea
-                    const form = textarea.closest('form');
-                    if (!form) return;
-
-                    e.preventDefault();
-
-                    // Find the first submit button in the form (whatever it is)
-                    const firstBtn = form.querySelector('button[type="submit"]');
-                    if (firstBtn) {{
-                        // Clear the cache since we're submitting
-                        clearMessageCache();
-                        // Click the button to ensure formaction is used if present
-                        firstBtn.click();
-                    }}
-                }}
-            }});
+        // localStorage caching for message input (remote session)
+        const remoteSessionId = document.body.dataset.sessionId;
+        const MESSAGE_CACHE_KEY = 'augment_dashboard_message_' + remoteSessionId;
 
-            // localStorage caching for message input
-            const MESSAGE_CACHE_KEY = 'augment_dashboard_message_' + sessionId;
-            let cacheSaveTimeout;
+        function saveMessageToCache() {
+            const textarea = document.getElementById('message-input');
+            if (textarea) {
+                const value = textarea.value;
+                if (value.trim()) {
+                    localStorage.setItem(MESSAGE_CACHE_KEY, value);
+                } else {
+                    localStorage.removeItem(MESSAGE_CACHE_KEY);
+                }
+            }
+        }
 
-            function saveMessageToCache() {{
-                const textarea = document.getElementById('message-input');
-                if (textarea) {{
-                    const value = textarea.value;
-                    if (value.trim()) {{
-                        localStorage.setItem(MESSAGE_CACHE_KEY, value);
-                    }} else {{
-                        localStorage.removeItem(MESSAGE_CACHE_KEY);
-                    }}
-                }}
-            }}
+        function loadMessageFromCache() {
+            const textarea = document.getElementById('message-input');
+            if (textarea) {
+                const cached = localStorage.getItem(MESSAGE_CACHE_KEY);
+                if (cached && !textarea.value.trim()) {
+                    textarea.value = cached;
+                }
+            }
+        }
 
-            function loadMessageFromCache() {{
-                const textarea = document.getElementById('message-input');
-                if (textarea) {{
-                    const cached = localStorage.getItem(MESSAGE_CACHE_KEY);
-                    if (cached && !textarea.value.trim()) {{
-                        textarea.value = cached;
-                    }}
-                }}
-            }}
+        function clearMessageCache() {
+            localStorage.removeItem(MESSAGE_CACHE_KEY);
+        }
 
-            function clearMessageCache() {{
-                localStorage.removeItem(MESSAGE_CACHE_KEY);
-            }}
+        // Set up caching on textarea
+        (function() {
+            const textarea = document.getElementById('message-input');
+            if (textarea) {
+                // Load cached message on page load
+                loadMessageFromCache();
+
+                // Save on input (debounced)
+                let saveTimeout;
+                textarea.addEventListener('input', function() {
+                    clearTimeout(saveTimeout);
+                    saveTimeout = setTimeout(saveMessageToCache, 300);
+                });
 
-            // Set up caching on textarea - called on load and after AJAX form updates
-            function setupTextareaCache() {{
-                const textarea = document.getElementById('message-input');
-                if (textarea && !textarea.dataset.cacheSetup) {{
-                    // Mark as set up to avoid duplicate listeners
-                    textarea.dataset.cacheSetup = 'true';
-
-                    // Load cached message
-                    loadMessageFromCache();
-
-                    // Save on input (debounced)
-                    textarea.addEventListener('input', function() {{
-                        clearTimeout(cacheSaveTimeout);
-                        cacheSaveTimeout = setTimeout(saveMessageToCache, 300);
-                    }});
-
-                    // Clear cache when form is submitted
-                    const form = textarea.closest('form');
-                    if (form && !form.dataset.cacheSetup) {{
-                        form.dataset.cacheSetup = 'true';
-                        form.addEventListener('submit', clearMessageCache);
-                    }}
-                }}
-            }}
+                // Clear cache when form is submitted
+                const form = textarea.closest('form');
+                if (form) {
+                    form.addEventListener('submit', clearMessageCache);
+                }
+            }
+        })();
 
-            // Initial setup
-            setupTextareaCache();
-        </script>
-    </body>
-    </html>
-    """
+        // Cmd+Enter (Mac) or Ctrl+Enter (Windows/Linux) to send message
+        document.addEventListener('keydown', function(e) {
+            if ((e.metaKey || e.ctrlKey) && e.key === 'Enter') {
+                const textarea = document.getElementById('message-input');
+                if (!textarea || !textarea.value.trim()) return;
 
+                const form = textarea.closest('form');
+                if (!form) return;
 
-def render_remote_session_detail(
-    session_data: dict,
-    remote,
-    federated_session_id: str,
-    dark_mode: str | None,
-) -> str:
-    """Render the session detail HTML for a remote session.
+                e.preventDefault();
 
-    Args:
-        session_data: Session data dict from the remote dashboard.
-        remote: RemoteDashboard instance.
-        federated_session_id: The federated session ID for URL links.
-        dark_mode: Dark mode setting.
+                // Find the first submit button
+                const firstBtn = form.querySelector('button[type="submit"]');
+                if (firstBtn) {
+                    clearMessageCache();
+                    firstBtn.click();
+                }
+            }
+        });
     """
-    styles = get_base_styles(dark_mode)
-
-    workspace_name = html.escape(session_data.get("workspace_name", "Unknown"))
-    workspace_root = html.escape(session_data.get("workspace_root", ""))
-    status = session_data.get("status", "stopped")
-    message_count = session_data.get("message_count", 0)
-    remote_session_id = session_data.get("session_id", "")
-
-    # Parse last_activity for time ago
-    last_activity_str = session_data.get("last_activity", "")
-    if last_activity_str:
-        try:
-            from datetime import datetime
-            last_activity = datetime.fromisoformat(last_activity_str.replace("Z", "+00:00"))
-            time_ago = format_time_ago(last_activity, include_title=True)
-        except Exception:
-            time_ago = "Unknown"
-    else:
-        time_ago = "Unknown"
-
-    # Render messages
-    messages = session_data.get("messages", [])
-    messages_html = ""
-    for msg in messages:
-        role = msg.get("role", "system")
-        content = msg.get("content", "")
-        timestamp = msg.get("timestamp", "")
-
-        role_class = f"message-{role}"
-        role_label = role.upper()
-
-        if role == "assistant":
-            content_html = render_markdown(content)
-        else:
-            content_html = f"<pre>{html.escape(content)}</pre>"
 
-        # Base64 encode for copy button
-        import base64
-        base64_content = base64.b64encode(content.encode()).decode()
-
-        copy_fn = f"copyMessage(this, '{base64_content}')"
-        messages_html += f'''
-        <div class="message {role_class}">
-            <div class="message-header">
-                <span class="role-badge">{role_label}</span>
-                <span class="timestamp" data-timestamp="{timestamp}">{timestamp}</span>
-                <button class="copy-btn" onclick="{copy_fn}">📋 Copy</button>
-            </div>
-            <div class="message-content">{content_html}</div>
-        </div>
-        '''
 
-    if not messages_html:
-        messages_html = '<div class="no-sessions">No messages yet</div>'
+# Built once and served from /remote-session.js, versioned like /dashboard.js
+_REMOTE_SESSION_BUNDLE = "".join([
+    _get_timestamp_script(),
+    _get_remote_session_detail_script(),
+])
+_REMOTE_SESSION_BUNDLE_VERSION = _crc32_hex(_REMOTE_SESSION_BUNDLE)
 
-    # Message form for remote sessions - proxied through our server
-    form_action = f"/api/remote/session/{federated_session_id}/message"
-    message_form = f'''
-        <p style="color: var(--text-secondary); margin-bottom: 10px;">
-            Send a message to <strong>{html.escape(remote.name)}</strong>
-        </p>
-        <form method="POST" action="{form_action}">
-            <textarea id="message-input" name="message"
-                placeholder="Type a message for the agent..."></textarea>
-            <button type="submit">▶ Send to Remote</button>
-        </form>
-    '''
 
-    return f"""
+# Page shell for render_remote_session_detail; the script version is baked in
+# at import, the rest is filled per request via str.format_map
+_REMOTE_SESSION_DETAIL_TEMPLATE = _bake_template("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{workspace_name} - {html.escape(remote.name)} - Augment Dashboard</title>
+        <title>{workspace_name} - {escaped_remote_name} - Augment Dashboard</title>
         <link rel="manifest" href="/manifest.json">
         <meta name="apple-mobile-web-app-capable" content="yes">
         <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
@@ -4719,7 +5912,7 @@ def render_remote_session_detail(
         <meta name="theme-color" content="#6366f1">
         {styles}
     </head>
-    <body>
+    <body data-session-id="{federated_session_id}">
         <a href="/" class="back-link">← Back to Dashboard</a>
 
         <div class="header">
@@ -4738,8 +5931,8 @@ def render_remote_session_detail(
         <div class="session-detail-meta">
             <div class="remote-session-badge">
                 🌐 <strong>Remote Session</strong> from
-                <strong>{html.escape(remote.name)}</strong>
-                <span class="queue-count">({html.escape(remote.url)})</span>
+                <strong>{escaped_remote_name}</strong>
+                <span class="queue-count">({escaped_remote_url})</span>
             </div>
             <strong>Workspace:</strong> {workspace_root}<br>
             <strong>Remote Session ID:</strong> {remote_session_id}
@@ -4761,114 +5954,118 @@ def render_remote_session_detail(
         <div class="message-form" id="message-form-container">
             <h3>Send Message to Agent</h3>
             <div id="message-form-content">
-                {message_form}
+                {message_form_html}
             </div>
         </div>
 
-        <script>
-            {_get_timestamp_script()}
-
-            // Copy message to clipboard
-            async function copyMessage(btn, base64Content) {{
-                try {{
-                    const text = atob(base64Content);
-                    await navigator.clipboard.writeText(text);
-                    btn.innerHTML = '✓ Copied';
-                    btn.classList.add('copied');
-                    setTimeout(() => {{
-                        btn.innerHTML = '📋 Copy';
-                        btn.classList.remove('copied');
-                    }}, 2000);
-                }} catch (err) {{
-                    console.error('Failed to copy:', err);
-                }}
-            }}
+        <script src="/remote-session.js?v={bundle_version}"></script>
+    </body>
+    </html>
+""",
+    bundle_version=_REMOTE_SESSION_BUNDLE_VERSION,
+)
 
-            // Scroll to bottom on load
-            const messageList = document.getElementById('message-list');
-            if (messageList) {{
-                messageList.scrollTop = messageList.scrollHeight;
-            }}
 
-            // localStorage caching for message input (remote session)
-            const remoteSessionId = '{federated_session_id}';
-            const MESSAGE_CACHE_KEY = 'augment_dashboard_message_' + remoteSessionId;
+def render_remote_session_detail(
+    session_data: dict,
+    remote,
+    federated_session_id: str,
+    dark_mode: str | None,
+) -> str:
+    """Render the session detail HTML for a remote session.
 
-            function saveMessageToCache() {{
-                const textarea = document.getElementById('message-input');
-                if (textarea) {{
-                    const value = textarea.value;
-                    if (value.trim()) {{
-                        localStorage.setItem(MESSAGE_CACHE_KEY, value);
-                    }} else {{
-                        localStorage.removeItem(MESSAGE_CACHE_KEY);
-                    }}
-                }}
-            }}
+    Args:
+        session_data: Session data dict from the remote dashboard.
+        remote: RemoteDashboard instance.
+        federated_session_id: The federated session ID for URL links.
+        dark_mode: Dark mode setting.
+    """
+    styles = get_base_stylesheet_link(dark_mode)
+    escaped_remote_name = html.escape(remote.name)
 
-            function loadMessageFromCache() {{
-                const textarea = document.getElementById('message-input');
-                if (textarea) {{
-                    const cached = localStorage.getItem(MESSAGE_CACHE_KEY);
-                    if (cached && !textarea.value.trim()) {{
-                        textarea.value = cached;
-                    }}
-                }}
-            }}
+    workspace_name = html.escape(session_data.get("workspace_name", "Unknown"))
+    workspace_root = html.escape(session_data.get("workspace_root", ""))
+    status = session_data.get("status", "stopped")
+    message_count = session_data.get("message_count", 0)
+    remote_session_id = session_data.get("session_id", "")
 
-            function clearMessageCache() {{
-                localStorage.removeItem(MESSAGE_CACHE_KEY);
-            }}
+    # Parse last_activity for time ago
+    last_activity_str = session_data.get("last_activity", "")
+    if last_activity_str:
+        try:
+            last_activity = datetime.fromisoformat(last_activity_str.replace("Z", "+00:00"))
+            time_ago = format_time_ago(last_activity, include_title=True)
+        except Exception:
+            time_ago = "Unknown"
+    else:
+        time_ago = "Unknown"
 
-            // Set up caching on textarea
-            (function() {{
-                const textarea = document.getElementById('message-input');
-                if (textarea) {{
-                    // Load cached message on page load
-                    loadMessageFromCache();
-
-                    // Save on input (debounced)
-                    let saveTimeout;
-                    textarea.addEventListener('input', function() {{
-                        clearTimeout(saveTimeout);
-                        saveTimeout = setTimeout(saveMessageToCache, 300);
-                    }});
-
-                    // Clear cache when form is submitted
-                    const form = textarea.closest('form');
-                    if (form) {{
-                        form.addEventListener('submit', clearMessageCache);
-                    }}
-                }}
-            }})();
+    # Render messages
+    messages = session_data.get("messages", [])
+    parts = []
+    for msg in messages:
+        role = msg.get("role", "system")
+        content = msg.get("content", "")
+        timestamp = msg.get("timestamp", "")
+
+        role_class = f"message-{role}"
+        role_label = role.upper()
 
-            // Cmd+Enter (Mac) or Ctrl+Enter (Windows/Linux) to send message
-            document.addEventListener('keydown', function(e) {{
-                if ((e.metaKey || e.ctrlKey) && e.key === 'Enter') {{
-                    const textarea = document.getElementById('message-input');
-                    if (!textarea || !textarea.value.trim()) return;
+        escaped_content = _escape_message(content)
+        if role == "assistant":
+            content_html = render_markdown(content)
+        else:
+            content_html = f"<pre>{escaped_content}</pre>"
 
-                    const form = textarea.closest('form');
-                    if (!form) return;
+        parts.append(f'''
+        <div class="message {role_class}">
+            <div class="message-header">
+                <span class="role-badge">{role_label}</span>
+                <span class="timestamp" data-timestamp="{timestamp}">{timestamp}</span>
+                <button class="copy-btn" data-copy="{escaped_content}"
+                    onclick="copyMessage(this)">📋 Copy</button>
+            </div>
+            <div class="message-content">{content_html}</div>
+        </div>
+        ''')
 
-                    e.preventDefault();
+    if parts:
+        messages_html = "".join(parts)
+    else:
+        messages_html = '<div class="no-sessions">No messages yet</div>'
 
-                    // Find the first submit button
-                    const firstBtn = form.querySelector('button[type="submit"]');
-                    if (firstBtn) {{
-                        clearMessageCache();
-                        firstBtn.click();
-                    }}
-                }}
-            }});
-        </script>
-    </body>
-    </html>
-    """
+    # Message form for remote sessions - proxied through our server
+    form_action = f"/api/remote/session/{federated_session_id}/message"
+    message_form_html = f'''
+        <p style="color: var(--text-secondary); margin-bottom: 10px;">
+            Send a message to <strong>{escaped_remote_name}</strong>
+        </p>
+        <form method="POST" action="{form_action}">
+            <textarea id="message-input" name="message"
+                placeholder="Type a message for the agent..."></textarea>
+            <button type="submit">▶ Send to Remote</button>
+        </form>
+    '''
 
+    return _REMOTE_SESSION_DETAIL_TEMPLATE.format_map({
+        "styles": styles,
+        "workspace_name": workspace_name,
+        "workspace_root": workspace_root,
+        "escaped_remote_name": escaped_remote_name,
+        "escaped_remote_url": html.escape(remote.url),
+        "status": status,
+        "time_ago": time_ago,
+        "message_count": message_count,
+        "remote_session_id": remote_session_id,
+        "federated_session_id": federated_session_id,
+        "messages_html": messages_html,
+        "message_form_html": message_form_html,
+    })
 
-# Default loop prompts - each line must be <= 100 chars to pass linting
-DEFAULT_LOOP_PROMPTS: dict[str, dict[str, str]] = {
+
+# Default loop prompts - each line must be <= 100 chars to pass linting. Read-only
+# so it can be returned as-is; callers that edit or save the prompts copy it.
+DEFAULT_LOOP_PROMPTS: Mapping[str, dict[str, str]] = MappingProxyType({
     "TDD Quality": {
         "prompt": (
             "Continue working on this task using TDD. Write tests first, then "
@@ -4922,7 +6119,7 @@ DEFAULT_LOOP_PROMPTS: dict[str, dict[str, str]] = {
         ),
         "end_condition": "LOOP_COMPLETE: Test coverage achieved.",
     },
-}
+})
 
 
 def load_loop_prompts(prompts_file: str | None) -> dict[str, dict[str, str]]:
@@ -1,6 +1,7 @@
 """File-based session store with locking for concurrent access."""
 
 import fcntl
+import functools
 import json
 import os
 from contextlib import contextmanager
@@ -43,6 +44,8 @@ class SessionStore:
         self.lock_file = self.sessions_file.parent / f"{self.sessions_file.stem}.lock"
         # Ensure parent directory exists
         self.sessions_file.parent.mkdir(parents=True, exist_ok=True)
+        # (file version, sessions) for get_sessions_snapshot()
+        self._snapshot: tuple[tuple[int, int, int, int] | None, list[AgentSession]] | None = None
 
     @contextmanager
     def _file_lock(self, exclusive: bool = True) -> Iterator[None]:
@@ -99,6 +102,50 @@ class SessionStore:
                 sessions.values(), key=lambda s: s.last_activity, reverse=True
             )
 
+    def get_version(self) -> tuple[int, int, int, int] | None:
+        """Identify the current contents of the sessions file (None if missing).
+
+        Every write renames a new file into place. The inode alone can repeat
+        (filesystems reuse freed numbers), and mtime can be set back with
+        utime, but the rename always sets a new ctime. Two writes only share
+        a version if they land in the same ctime tick with the same size
+        and inode.
+        """
+        try:
+            stat = self.sessions_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+
+    def get_sessions_snapshot(self) -> list[AgentSession]:
+        """Get all sessions, most recent first, for read-only use.
+
+        The parsed sessions are reused until get_version() changes, so
+        polling readers skip the JSON parse. The returned sessions are
+        shared between callers and must not be modified; use
+        get_all_sessions() or get_session() for sessions that will be changed.
+        """
+        return self.get_versioned_snapshot()[1]
+
+    def get_versioned_snapshot(
+        self,
+    ) -> tuple[tuple[int, int, int, int] | None, list[AgentSession]]:
+        """Get get_sessions_snapshot() together with the file version it was read at.
+
+        Both come from the same locked read, so a cache key built from the
+        version always matches the sessions.
+        """
+        with self._file_lock(exclusive=False):
+            version = self.get_version()
+            if self._snapshot is None or self._snapshot[0] != version:
+                sessions = sorted(
+                    self._read_sessions().values(),
+                    key=lambda s: s.last_activity,
+                    reverse=True,
+                )
+                self._snapshot = (version, sessions)
+            return version, list(self._snapshot[1])
+
     def get_active_sessions(self) -> list[AgentSession]:
         """Get only active/idle sessions (not stopped)."""
         sessions = self.get_all_sessions()
@@ -183,3 +230,13 @@ class SessionStore:
             self._write_sessions(sessions)
             return True
 
+
+@functools.lru_cache(maxsize=1)
+def get_store() -> SessionStore:
+    """Get the session store shared by the dashboard and federation routes.
+
+    Every operation still reads sessions.json under a lock; the only state
+    kept between calls is the parsed snapshot behind get_sessions_snapshot(),
+    which is why one instance per process should serve every request.
+    """
+    return SessionStore()
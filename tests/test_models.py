@@ -142,6 +142,17 @@ class TestAgentSession:
         )
         assert session.message_count == 2
 
+    def test_workspace_sort_key(self):
+        """Test workspace_sort_key is the lowercased name and stays out of to_dict."""
+        session = AgentSession(
+            session_id="test-123",
+            conversation_id="conv-456",
+            workspace_root="/path/to/project",
+            workspace_name="MyProject",
+        )
+        assert session.workspace_sort_key == "myproject"
+        assert "workspace_sort_key" not in session.to_dict()
+
     def test_last_message_preview_empty(self):
         """Test last_message_preview with no messages."""
         session = AgentSession(
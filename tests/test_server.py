@@ -1,5 +1,6 @@
 """Tests for the FastAPI server."""
 
+import asyncio
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -7,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from augment_agent_dashboard.federation.models import FederationConfig
 from augment_agent_dashboard.models import AgentSession, SessionMessage, SessionStatus
 from augment_agent_dashboard.server import app
 from augment_agent_dashboard.store import SessionStore
@@ -116,6 +118,15 @@ class TestHTMLPages:
         assert "text/html" in response.headers["content-type"]
         assert "Agent Dashboard" in response.text
 
+    @pytest.mark.asyncio
+    async def test_index_page_gzip(self, client):
+        """Test the index page is gzip-compressed when the client accepts it."""
+        ac, store = client
+        response = await ac.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert "Agent Dashboard" in response.text
+
     @pytest.mark.asyncio
     async def test_session_page_not_found(self, client):
         """Test session page for non-existent session."""
@@ -131,6 +142,89 @@ class TestHTMLPages:
         response = await ac.get(f"/session/{sample_session.session_id}")
         assert response.status_code == 200
         assert "text/html" in response.headers["content-type"]
+        assert response.headers["x-accel-buffering"] == "no"
+        assert sample_session.workspace_name in response.text
+
+    @pytest.mark.asyncio
+    async def test_session_page_not_modified(self, client, sample_session, tmp_path, monkeypatch):
+        """Test the page is only re-sent after the session changes."""
+        from augment_agent_dashboard.models import SessionMessage
+
+        ac, store = client
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        store.upsert_session(sample_session)
+        url = f"/session/{sample_session.session_id}"
+
+        first = await ac.get(url)
+        etag = first.headers["etag"]
+        cached = await ac.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        sample_session.messages.append(SessionMessage(role="user", content="new one"))
+        store.upsert_session(sample_session)
+        changed = await ac.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert "new one" in changed.text
+
+    @pytest.mark.asyncio
+    async def test_session_page_etag_skips_serializing_history(
+        self, client, sample_session, tmp_path, monkeypatch
+    ):
+        """Test the ETag is per session and a 304 never serializes the messages."""
+        ac, store = client
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        store.upsert_session(sample_session)
+        sample_session.session_id = "test-session-2"
+        store.upsert_session(sample_session)
+
+        first = await ac.get("/session/test-session-1")
+        second = await ac.get("/session/test-session-2")
+        assert first.headers["etag"] != second.headers["etag"]
+
+        with patch.object(AgentSession, "to_dict") as mock_to_dict:
+            cached = await ac.get(
+                "/session/test-session-1", headers={"If-None-Match": first.headers["etag"]}
+            )
+        assert cached.status_code == 304
+        mock_to_dict.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dashboard_not_modified(self, client, sample_session, tmp_path, monkeypatch):
+        """Test the dashboard is only re-sent after sessions or the sort change."""
+        ac, store = client
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        store.upsert_session(sample_session)
+
+        first = await ac.get("/")
+        etag = first.headers["etag"]
+        cached = await ac.get("/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        by_name = await ac.get("/?sort=name", headers={"If-None-Match": etag})
+        assert by_name.status_code == 200
+
+        sample_session.workspace_name = "renamed-project"
+        store.upsert_session(sample_session)
+        changed = await ac.get("/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert "renamed-project" in changed.text
+
+    def test_session_page_sends_header_before_messages(self, sample_session):
+        """Test the first streamed chunk is the page head and header alone."""
+        from augment_agent_dashboard.models import SessionMessage
+        from augment_agent_dashboard.server import (
+            _render_session_detail_chunks,
+            render_session_detail,
+        )
+
+        sample_session.messages = [SessionMessage(role="user", content="Hello")]
+        chunks = list(_render_session_detail_chunks(sample_session, None, {}))
+        assert "<head>" in chunks[0]
+        assert "Hello" not in chunks[0]
+        assert "Hello" in chunks[1]
+        assert "".join(chunks) == render_session_detail(sample_session, None, {})
 
     @pytest.mark.asyncio
     async def test_config_page(self, client):
@@ -141,6 +235,208 @@ class TestHTMLPages:
         assert "text/html" in response.headers["content-type"]
 
 
+class TestSessionCards:
+    """Tests for session card rendering used by AJAX list updates."""
+
+    def test_cards_are_keyed_and_fingerprinted(self, sample_session):
+        """Test each card carries its session id and a content fingerprint."""
+        from augment_agent_dashboard.server import _render_session_cards
+
+        result = _render_session_cards([sample_session])
+        assert f'data-session-id="{sample_session.session_id}"' in result
+        assert 'data-fingerprint="' in result
+
+    def test_fingerprint_tracks_card_content(self, sample_session):
+        """Test the fingerprint is stable and changes with visible content."""
+        import re
+
+        from augment_agent_dashboard.server import _render_session_cards
+
+        def fingerprint(session):
+            html = _render_session_cards([session])
+            return re.search(r'data-fingerprint="([0-9a-f]+)"', html).group(1)
+
+        before = fingerprint(sample_session)
+        assert fingerprint(sample_session) == before
+
+        sample_session.messages.append(SessionMessage(role="user", content="More"))
+        assert fingerprint(sample_session) != before
+
+    def test_swim_lane_cards_are_keyed_and_fingerprinted(self, sample_session):
+        """Test swim lane cards carry the same keys for in-place patching."""
+        from augment_agent_dashboard.server import _render_swim_lane
+
+        result = _render_swim_lane(
+            lane_id="local",
+            name="this-machine",
+            sessions=[sample_session],
+            is_online=True,
+            is_local=True,
+        )
+        assert f'data-session-id="{sample_session.session_id}"' in result
+        assert 'data-fingerprint="' in result
+
+    def test_swim_lane_preview_escapes_after_truncating(self):
+        """Test a long preview never ends in a partial HTML entity."""
+        from augment_agent_dashboard.server import _render_swim_lane
+
+        session = AgentSession(
+            session_id="s",
+            conversation_id="c",
+            workspace_root="/p",
+            workspace_name="p",
+            messages=[SessionMessage(role="user", content="&" * 200)],
+        )
+        result = _render_swim_lane(
+            lane_id="local", name="m", sessions=[session], is_online=True, is_local=True
+        )
+        assert f'<div class="preview">{"&amp;" * 80}</div>' in result
+
+    def test_swim_lane_renders_remote_sessions(self):
+        """Test remote sessions, whose status is a plain string, render the same way."""
+        from augment_agent_dashboard.federation.models import RemoteSession
+        from augment_agent_dashboard.server import _render_swim_lane
+
+        remote = RemoteSession(
+            session_id="remote-abc",
+            conversation_id="c",
+            workspace_root="/p",
+            workspace_name="p",
+            status="active",
+            started_at="2024-01-01T00:00:00+00:00",
+            last_activity="2024-01-01T00:00:00+00:00",
+            current_task=None,
+            message_count=3,
+            last_message_preview=None,
+            origin_url="http://one:8080",
+            origin_name="one",
+            remote_session_id="abc",
+        )
+        result = _render_swim_lane(
+            lane_id="remote-1", name="one", sessions=[remote], is_online=True, is_local=False
+        )
+        assert "status-dot status-active" in result
+        assert "3 messages" in result
+
+
+class TestEscape:
+    """Tests for the memoized HTML escape helper."""
+
+    def test_escape_matches_html_escape(self):
+        """Test results match html.escape and repeat calls hit the cache."""
+        import html
+
+        from augment_agent_dashboard.server import _escape
+
+        _escape.cache_clear()
+        text = '<b>"Tom" & Jerry</b>'
+        assert _escape(text) == html.escape(text)
+        _escape(text)
+        assert _escape.cache_info().hits == 1
+
+
+class TestEscapeMessage:
+    """Tests for the memoized message content escape."""
+
+    def test_escape_message_matches_html_escape(self):
+        """Test results match html.escape and equal content hits the cache."""
+        import html
+
+        from augment_agent_dashboard.server import _escape_message
+
+        _escape_message.cache_clear()
+        text = "<b>it's</b> & \"done\""
+        assert _escape_message(text) == html.escape(text)
+        _escape_message("".join(list(text)))
+        assert _escape_message.cache_info().hits == 1
+
+
+class TestStateLabel:
+    """Tests for session state labels."""
+
+    def test_known_and_unknown_states(self):
+        """Test known states use the table and unknown ones are title-cased."""
+        from augment_agent_dashboard.server import _get_state_label
+
+        assert _get_state_label("active") == "Working"
+        assert _get_state_label("waiting_on_user") == "Waiting On User"
+
+    def test_labels_cover_every_state(self):
+        """Test the label table has an entry for every session state."""
+        from augment_agent_dashboard.server import _STATE_LABELS
+        from augment_agent_dashboard.state_machine import SessionState
+
+        assert set(_STATE_LABELS) == {state.value for state in SessionState}
+
+    def test_state_value_falls_back_to_status(self, sample_session):
+        """Test unknown stored states fall back to the legacy status."""
+        from augment_agent_dashboard.server import _session_state_value
+
+        sample_session.state = "under_review"
+        assert _session_state_value(sample_session) == "under_review"
+        sample_session._state = "bogus"
+        assert _session_state_value(sample_session) == sample_session.status.value
+
+
+class TestRecentDirectoriesHtml:
+    """Tests for the recent directories picker HTML."""
+
+    def test_renders_escaped_and_shortened_paths(self):
+        """Test paths are escaped and long paths are shortened for display."""
+        from augment_agent_dashboard import server
+
+        long_dir = "/very/long/path/" + "x" * 40
+        with patch.object(
+            server, "_get_recent_working_directories",
+            return_value=["/a&b", long_dir],
+        ):
+            result = server._render_recent_directories_html()
+        assert "/a&amp;b" in result
+        assert f'title="{long_dir}"' in result
+        assert "📁 ..." + long_dir[-37:] in result
+
+    def test_empty_when_no_directories(self):
+        """Test nothing is rendered without recent directories."""
+        from augment_agent_dashboard import server
+
+        with patch.object(
+            server, "_get_recent_working_directories", return_value=[]
+        ):
+            assert server._render_recent_directories_html() == ""
+
+    def test_reflects_sessions_written_elsewhere(self, temp_store, sample_session):
+        """Test a session written by another process shows up on the next render."""
+        from augment_agent_dashboard import server
+
+        with patch("augment_agent_dashboard.server.get_store", return_value=temp_store):
+            assert server._render_recent_directories_html() == ""
+            SessionStore(sessions_file=temp_store.sessions_file).upsert_session(sample_session)
+            assert sample_session.workspace_root in server._render_recent_directories_html()
+
+
+class TestQuickRepliesHtml:
+    """Tests for the quick reply buttons HTML."""
+
+    def test_rerenders_when_replies_change(self):
+        """Test the memoized buttons follow changes to the configured replies."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "_get_quick_replies", return_value={"Go": "it's <ok>"}):
+            first = server._render_quick_replies_html("s1")
+        with patch.object(server, "_get_quick_replies", return_value={"Stop": "halt"}):
+            second = server._render_quick_replies_html("s1")
+        assert "insertQuickReply('it&#x27;s &lt;ok&gt;')" in first
+        assert "⚡ Stop" in second
+        assert "⚡ Go" not in second
+
+    def test_empty_when_no_replies(self):
+        """Test nothing is rendered without quick replies."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "_get_quick_replies", return_value={}):
+            assert server._render_quick_replies_html("s1") == ""
+
+
 class TestNotifications:
     """Tests for notification endpoints."""
 
@@ -309,6 +605,15 @@ class TestDashboardSorting:
         response = await ac.get("/?dark=true")
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_dashboard_unknown_sort_is_not_echoed(self, client):
+        """Test an unknown sort value falls back to recent instead of reaching the script."""
+        ac, store = client
+        response = await ac.get("/?sort=%27%3Balert(1)%2F%2F")
+        assert response.status_code == 200
+        assert "alert(1)" not in response.text
+        assert 'data-sort="recent"' in response.text
+
 
 class TestPostMessage:
     """Tests for posting messages to sessions."""
@@ -459,6 +764,73 @@ class TestConfigPrompts:
         assert response.status_code == 303
 
 
+class TestConfigPage:
+    """Tests for rendering the config page."""
+
+    def test_config_page_renders_sections(self):
+        """Test the page template fills its sections and the stylesheet keeps its braces."""
+        from augment_agent_dashboard.server import _CONFIG_PAGE_STYLES, render_config_page
+
+        page = render_config_page(None, {"Review <all>": {"prompt": "Go", "end_condition": ""}}, {})
+        assert '<span class="section-badge">1</span>' in page
+        assert "Review &lt;all&gt;" in page
+        assert ".config-section {" in _CONFIG_PAGE_STYLES
+        assert "function toggleSection(sectionId) {" in page
+        assert 'id="federation-content"' in page
+
+    def test_config_page_strips_template_indentation_only(self):
+        """Test template indentation is dropped but prompt text is kept as-is."""
+        from augment_agent_dashboard.server import render_config_page
+
+        prompt = "Step one\n    indented step"
+        page = render_config_page(None, {"Steps": {"prompt": prompt, "end_condition": ""}}, {})
+        assert '\n<div class="config-card">\n<div class="config-card-header">' in page
+        assert f'<textarea name="prompt" rows="3">{prompt}</textarea>' in page
+
+    def test_textarea_contents_keep_quotes(self):
+        """Test quotes in textarea contents are left unescaped."""
+        from augment_agent_dashboard.server import render_config_page
+
+        config = {"quick_replies": {"Ask": 'Say "hi" & <wave>'}}
+        page = render_config_page(None, {"Q": {"prompt": "it's", "end_condition": ""}}, config)
+        assert '<textarea name="message" rows="2">Say "hi" &amp; &lt;wave&gt;</textarea>' in page
+        assert '<textarea name="prompt" rows="3">it\'s</textarea>' in page
+
+    @pytest.mark.asyncio
+    async def test_config_page_is_streamed(self, client):
+        """Test the route streams the same page render_config_page builds."""
+        from augment_agent_dashboard.server import render_config_page
+
+        ac, store = client
+        with patch(
+            "augment_agent_dashboard.server._get_full_config", return_value={}
+        ), patch(
+            "augment_agent_dashboard.server._get_loop_prompts", return_value={}
+        ):
+            response = await ac.get("/config")
+        assert response.status_code == 200
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.text == render_config_page(None, {}, {})
+
+    @pytest.mark.asyncio
+    async def test_config_page_not_modified(self, client, tmp_path, monkeypatch):
+        """Test the page is only re-sent after the config changes."""
+        ac, store = client
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        (tmp_path / ".augment" / "dashboard").mkdir(parents=True)
+
+        first = await ac.get("/config")
+        etag = first.headers["etag"]
+        cached = await ac.get("/config", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        await ac.post("/config/quick-replies/add", data={"name": "Go", "message": "go"})
+        changed = await ac.get("/config", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert "Go" in changed.text
+
+
 class TestClearQueueNotFound:
     """Tests for clear queue with non-existent session."""
 
@@ -520,15 +892,63 @@ class TestSpawnAuggieMessage:
             assert result is False
 
 
+class TestFindAuggie:
+    """Tests for _find_auggie function."""
+
+    def test_find_auggie_reuses_path_until_removed(self, tmp_path, monkeypatch):
+        """Test that PATH is only searched again once the remembered auggie is gone."""
+        from augment_agent_dashboard import server
+
+        auggie = tmp_path / "auggie"
+        auggie.write_text("#!/bin/sh\n")
+        auggie.chmod(0o755)
+        monkeypatch.setattr(server, "_auggie_path", None)
+        with patch("shutil.which", return_value=str(auggie)) as mock_which:
+            assert server._find_auggie() == str(auggie)
+            assert server._find_auggie() == str(auggie)
+            assert mock_which.call_count == 1
+
+            auggie.unlink()
+            mock_which.return_value = None
+            assert server._find_auggie() is None
+            assert mock_which.call_count == 2
+
+
+class TestProcessQueuedMessages:
+    """Tests for process_queued_messages function."""
+
+    @pytest.mark.asyncio
+    async def test_queued_message_deferred_to_background_tasks(self, temp_store, sample_session):
+        """Test that the auggie run is scheduled on background_tasks, not awaited."""
+        from fastapi import BackgroundTasks
+
+        from augment_agent_dashboard.server import process_queued_messages, spawn_auggie_message
+
+        sample_session.messages.append(SessionMessage(role="queued", content="Next"))
+        temp_store.upsert_session(sample_session)
+        background_tasks = BackgroundTasks()
+        with patch("augment_agent_dashboard.server.get_store", return_value=temp_store), \
+             patch("asyncio.create_subprocess_exec") as mock_exec:
+            assert await process_queued_messages("test-session-1", background_tasks) is True
+            mock_exec.assert_not_called()
+
+        task = background_tasks.tasks[0]
+        assert task.func is spawn_auggie_message
+        assert task.args == ("conv-1", "/path/to/project", "Next")
+        assert temp_store.get_session("test-session-1").messages[-1].role == "user"
+
+
 class TestGetLoopPrompts:
     """Tests for _get_loop_prompts function."""
 
     def test_get_loop_prompts_no_file(self, tmp_path, monkeypatch):
         """Test when config file doesn't exist."""
-        from augment_agent_dashboard.server import _get_loop_prompts
+        from augment_agent_dashboard.server import DEFAULT_LOOP_PROMPTS, _get_loop_prompts
         monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
         result = _get_loop_prompts()
-        assert isinstance(result, dict)
+        assert result is DEFAULT_LOOP_PROMPTS
+        with pytest.raises(TypeError):
+            result["new"] = {"prompt": "x", "end_condition": ""}
 
     def test_get_loop_prompts_with_file(self, tmp_path, monkeypatch):
         """Test when config file exists with new format."""
@@ -564,7 +984,7 @@ class TestGetLoopPrompts:
 
     def test_get_loop_prompts_invalid_json(self, tmp_path, monkeypatch):
         """Test when config file has invalid JSON."""
-        from augment_agent_dashboard.server import _get_loop_prompts
+        from augment_agent_dashboard.server import DEFAULT_LOOP_PROMPTS, _get_loop_prompts
         monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
         config_dir = tmp_path / ".augment" / "dashboard"
         config_dir.mkdir(parents=True)
@@ -572,7 +992,7 @@ class TestGetLoopPrompts:
 
         result = _get_loop_prompts()
         # Should return defaults on error
-        assert isinstance(result, dict)
+        assert result is DEFAULT_LOOP_PROMPTS
 
 
 class TestNotificationOverflow:
@@ -610,6 +1030,423 @@ class TestNotificationPolling:
         assert "notifications" in data
 
 
+class TestNotificationPollETag:
+    """Tests for ETag short-circuiting of notification polls."""
+
+    @pytest.mark.asyncio
+    async def test_poll_returns_etag(self, client):
+        """Test that poll responses carry an ETag header."""
+        ac, store = client
+        response = await ac.get("/api/notifications/poll?since=2020-01-01T00:00:00")
+        assert response.status_code == 200
+        assert response.headers.get("etag")
+
+    @pytest.mark.asyncio
+    async def test_poll_not_modified(self, client):
+        """Test that a matching If-None-Match returns 304 with no body."""
+        ac, store = client
+        first = await ac.get("/api/notifications/poll?since=2020-01-01T00:00:00")
+        etag = first.headers["etag"]
+
+        response = await ac.get(
+            "/api/notifications/poll?since=2020-01-01T00:00:00",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_poll_etag_changes_on_new_notification(self, client):
+        """Test that a new notification invalidates the previous ETag."""
+        ac, store = client
+        first = await ac.get("/api/notifications/poll?since=2020-01-01T00:00:00")
+        etag = first.headers["etag"]
+        await ac.post(
+            "/api/notifications/send",
+            data={"title": "New", "body": "body", "url": ""},
+        )
+
+        response = await ac.get(
+            "/api/notifications/poll?since=2020-01-01T00:00:00",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+class TestSessionsHtmlETag:
+    """Tests for ETag short-circuiting of session fragment polls."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_html_not_modified(self, client, sample_session):
+        """Test that an unchanged session list returns 304 with no body."""
+        ac, store = client
+        store.upsert_session(sample_session)
+        first = await ac.get("/api/sessions-html")
+        etag = first.headers["etag"]
+
+        response = await ac.get("/api/sessions-html", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_sessions_html_etag_changes_with_sessions(self, client, sample_session):
+        """Test that a session change invalidates the previous ETag."""
+        ac, store = client
+        first = await ac.get("/api/sessions-html")
+        etag = first.headers["etag"]
+        store.upsert_session(sample_session)
+
+        response = await ac.get("/api/sessions-html", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_swimlanes_html_not_modified(self, client):
+        """Test that unchanged swim lanes return 304."""
+        ac, store = client
+        with patch(
+            "augment_agent_dashboard.server._get_federation_config",
+            return_value=FederationConfig(),
+        ):
+            first = await ac.get("/api/swimlanes-html")
+            response = await ac.get(
+                "/api/swimlanes-html", headers={"If-None-Match": first.headers["etag"]}
+            )
+        assert response.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_sessions_html_gzip(self, client, sample_session):
+        """Test a single-card fragment is large enough to be compressed."""
+        ac, store = client
+        store.upsert_session(sample_session)
+        response = await ac.get("/api/sessions-html", headers={"Accept-Encoding": "gzip"})
+        assert response.headers.get("content-encoding") == "gzip"
+        assert "test-session-1" in response.text
+
+
+class TestSwimlaneLaneFilter:
+    """Tests for rendering only the requested swim lanes."""
+
+    @pytest.fixture
+    def fed_config(self):
+        """Federation config with two remote dashboards."""
+        from augment_agent_dashboard.federation.models import RemoteDashboard
+
+        return FederationConfig(
+            enabled=True,
+            remote_dashboards=[
+                RemoteDashboard(url="http://one:8080", name="one"),
+                RemoteDashboard(url="http://two:8080", name="two"),
+            ],
+        )
+
+    def test_parse_lane_filter(self):
+        """Test an empty filter means every lane."""
+        from augment_agent_dashboard.server import _parse_lane_filter
+
+        assert _parse_lane_filter("") is None
+        assert _parse_lane_filter("local,remote-2,") == {"local", "remote-2"}
+
+    @pytest.mark.asyncio
+    async def test_filter_skips_other_remotes(self, temp_store, fed_config):
+        """Test only the requested remote is fetched and rendered."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "get_store", return_value=temp_store), \
+                patch.object(server, "_get_federation_config", return_value=fed_config), \
+                patch(
+                    "augment_agent_dashboard.federation.client.RemoteDashboardClient"
+                ) as mock_client:
+            mock_client.return_value.fetch_sessions = AsyncMock(return_value=[])
+            result = await server._render_swimlanes_fragment("recent", {"remote-2"})
+
+        assert mock_client.call_count == 1
+        assert mock_client.call_args.args[0].name == "two"
+        assert 'data-lane-id="remote-2"' in result
+        assert 'data-lane-id="local"' not in result
+        assert 'data-lane-id="remote-1"' not in result
+
+
+class TestNotificationStream:
+    """Tests for the Server-Sent Events notification stream."""
+
+    class _FakeRequest:
+        """Request stub that disconnects after a fixed number of checks."""
+
+        def __init__(self, checks: int = 1):
+            self.checks = checks
+
+        async def is_disconnected(self) -> bool:
+            self.checks -= 1
+            return self.checks < 0
+
+    @pytest.mark.asyncio
+    async def test_stream_pushes_published_notification(self):
+        """Test that a published notification is pushed to a subscriber."""
+        from augment_agent_dashboard import server
+
+        stream = server._notification_event_stream(self._FakeRequest())
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        server._publish_notification(
+            {"id": "2099-01-01T00:00:00", "title": "Done", "body": "b", "url": ""}
+        )
+        event = await asyncio.wait_for(pending, timeout=1)
+        await stream.aclose()
+
+        assert event.startswith("id: 2099-01-01T00:00:00\n")
+        assert '"title": "Done"' in event
+        assert not server._notification_subscribers
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_since_last_event_id(self):
+        """Test that reconnecting clients receive notifications they missed."""
+        from augment_agent_dashboard import server
+
+        server._publish_notification(
+            {"id": "2098-06-01T00:00:00", "title": "Missed", "body": "b", "url": ""}
+        )
+        stream = server._notification_event_stream(
+            self._FakeRequest(checks=0), last_event_id="2098-01-01T00:00:00"
+        )
+        events = [event async for event in stream]
+
+        assert any('"title": "Missed"' in e for e in events)
+
+    @pytest.mark.asyncio
+    async def test_stream_endpoint_content_type(self):
+        """Test the stream endpoint responds with an event stream."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "_notification_event_stream") as mock_stream:
+            async def empty(*args):
+                return
+                yield
+
+            mock_stream.side_effect = empty
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                response = await ac.get("/api/notifications/stream")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+    @pytest.mark.asyncio
+    async def test_stream_endpoint_not_gzipped(self):
+        """Test the event stream is never compressed, even for gzip clients."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "_notification_event_stream") as mock_stream:
+            async def large(*args):
+                yield "data: " + "x" * 2000 + "\n\n"
+
+            mock_stream.side_effect = large
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                response = await ac.get(
+                    "/api/notifications/stream", headers={"Accept-Encoding": "gzip"}
+                )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+
+class TestSessionStream:
+    """Tests for the Server-Sent Events session stream."""
+
+    _FakeRequest = TestNotificationStream._FakeRequest
+
+    @pytest.mark.asyncio
+    async def test_stream_pushes_current_html_once(self, temp_store, sample_session):
+        """Test that the first tick pushes the cards and unchanged ticks stay quiet."""
+        from augment_agent_dashboard import server
+
+        temp_store.upsert_session(sample_session)
+        with patch.object(server, "get_store", return_value=temp_store), \
+                patch.object(server, "SESSION_STREAM_CHECK_SECONDS", 0):
+            stream = server._session_event_stream(self._FakeRequest(checks=3))
+            events = [event async for event in stream]
+
+        assert len(events) == 1
+        assert events[0].startswith("data: ")
+        assert 'data-session-id=\\"test-session-1\\"' in events[0]
+
+    @pytest.mark.asyncio
+    async def test_stream_pushes_after_store_change(self, temp_store, sample_session):
+        """Test that writing sessions.json triggers a fresh push."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "get_store", return_value=temp_store), \
+                patch.object(server, "SESSION_STREAM_CHECK_SECONDS", 0):
+            stream = server._session_event_stream(self._FakeRequest(checks=5))
+            first = await stream.__anext__()
+            temp_store.upsert_session(sample_session)
+            second = await stream.__anext__()
+            await stream.aclose()
+
+        assert "test-session-1" not in first
+        assert "test-session-1" in second
+
+    @pytest.mark.asyncio
+    async def test_stream_endpoint_content_type(self):
+        """Test the stream endpoint responds with an event stream."""
+        from augment_agent_dashboard import server
+
+        with patch.object(server, "_session_event_stream") as mock_stream:
+            async def empty(*args):
+                return
+                yield
+
+            mock_stream.side_effect = empty
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                response = await ac.get("/api/sessions-stream?view=lanes&sort=name&lanes=local")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert mock_stream.call_args.args[1:] == ("lanes", "name", {"local"})
+
+
+class TestSessionDetailStream:
+    """Tests for the Server-Sent Events stream on the session page."""
+
+    _FakeRequest = TestNotificationStream._FakeRequest
+
+    @pytest.mark.asyncio
+    async def test_stream_pushes_update_once(self, temp_store, sample_session):
+        """Test the first tick pushes the page update and unchanged ticks stay quiet."""
+        import json
+
+        from augment_agent_dashboard import server
+
+        temp_store.upsert_session(sample_session)
+        with patch.object(server, "get_store", return_value=temp_store), \
+                patch.object(server, "SESSION_STREAM_CHECK_SECONDS", 0):
+            stream = server._session_detail_event_stream(
+                self._FakeRequest(checks=3), sample_session.session_id
+            )
+            events = [event async for event in stream]
+
+        assert len(events) == 1
+        data = json.loads(events[0].removeprefix("data: "))
+        assert data["message_count"] == sample_session.message_count
+        assert "messages_html" in data
+
+    @pytest.mark.asyncio
+    async def test_stream_pushes_after_store_change(self, temp_store, sample_session):
+        """Test a new message in sessions.json triggers a fresh push."""
+        from augment_agent_dashboard import server
+        from augment_agent_dashboard.models import SessionMessage
+
+        temp_store.upsert_session(sample_session)
+        with patch.object(server, "get_store", return_value=temp_store), \
+                patch.object(server, "SESSION_STREAM_CHECK_SECONDS", 0):
+            stream = server._session_detail_event_stream(
+                self._FakeRequest(checks=5), sample_session.session_id
+            )
+            first = await stream.__anext__()
+            sample_session.messages.append(SessionMessage(role="user", content="pushed"))
+            temp_store.upsert_session(sample_session)
+            second = await stream.__anext__()
+            await stream.aclose()
+
+        assert "pushed" not in first
+        assert "pushed" in second
+
+    @pytest.mark.asyncio
+    async def test_stream_endpoint_unknown_session(self, client):
+        """Test the stream endpoint rejects sessions that don't exist."""
+        ac, store = client
+        response = await ac.get("/api/sessions/nonexistent/stream")
+        assert response.status_code == 404
+
+
+class TestSwimlaneStylesheet:
+    """Tests for the externally served swim lane stylesheet."""
+
+    @pytest.mark.asyncio
+    async def test_stylesheet_is_cacheable_css(self, client):
+        """Test the stylesheet is served as long-lived CSS."""
+        ac, store = client
+        response = await ac.get("/swimlane.css")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/css")
+        assert "immutable" in response.headers["cache-control"]
+        assert ".swim-lanes-container" in response.text
+
+    def test_swimlanes_page_links_versioned_stylesheet(self):
+        """Test the page links the stylesheet instead of inlining it."""
+        from augment_agent_dashboard import server
+
+        page = server.render_dashboard_swimlanes([], {}, FederationConfig(), None)
+        assert f'href="/swimlane.css?v={server._SWIMLANE_STYLES_VERSION}"' in page
+        assert ".swim-lanes-container {" not in page
+
+
+class TestConfigStylesheet:
+    """Tests for the externally served config page stylesheet."""
+
+    @pytest.mark.asyncio
+    async def test_config_page_links_stylesheet(self, client):
+        """Test the config page links its versioned stylesheet instead of inlining it."""
+        from augment_agent_dashboard.server import (
+            _CONFIG_PAGE_STYLES_VERSION,
+            render_config_page,
+        )
+
+        ac, store = client
+        response = await ac.get("/config.css")
+        assert response.status_code == 200
+        assert "text/css" in response.headers["content-type"]
+        assert ".config-input" in response.text
+
+        page = render_config_page(None, {}, {})
+        assert f'href="/config.css?v={_CONFIG_PAGE_STYLES_VERSION}"' in page
+        assert ".config-input {" not in page
+
+
+class TestDashboardScript:
+    """Tests for the externally served dashboard script."""
+
+    @pytest.mark.asyncio
+    async def test_script_is_cacheable_javascript(self, client):
+        """Test the script bundle is served as long-lived JavaScript."""
+        ac, store = client
+        response = await ac.get("/dashboard.js")
+        assert response.status_code == 200
+        assert "javascript" in response.headers["content-type"]
+        assert "immutable" in response.headers["cache-control"]
+        assert "function startListDashboard()" in response.text
+        assert "function startSwimLanesDashboard()" in response.text
+
+    def test_pages_link_versioned_script(self):
+        """Test both dashboard views link the bundle and name their view."""
+        from augment_agent_dashboard import server
+
+        src = f'src="/dashboard.js?v={server._DASHBOARD_BUNDLE_VERSION}"'
+        with patch.object(server, "_get_recent_working_directories", return_value=[]):
+            list_page = server.render_dashboard([], None, "name")
+            lanes_page = server.render_dashboard_swimlanes([], {}, FederationConfig(), None)
+        assert src in list_page
+        assert src in lanes_page
+        assert '<body data-view="list" data-sort="name">' in list_page
+        assert '<body data-view="lanes" data-sort="recent">' in lanes_page
+        assert "function patchKeyedChildren" not in list_page
+
+
+class TestSessionScripts:
+    """Tests for the externally served session detail scripts."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/session.js", "/remote-session.js"])
+    async def test_scripts_are_cacheable_javascript(self, client, path):
+        """Test both session scripts are served as long-lived JavaScript."""
+        ac, store = client
+        response = await ac.get(path)
+        assert response.status_code == 200
+        assert "javascript" in response.headers["content-type"]
+        assert "immutable" in response.headers["cache-control"]
+        assert "document.body.dataset.sessionId" in response.text
+
+
 class TestIconEndpoints:
     """Tests for icon endpoints."""
 
@@ -709,6 +1546,16 @@ class TestFormatTimeAgo:
         assert 'data-utc="' in result
         assert '2h ago</span>' in result
 
+    def test_format_time_ago_explicit_now(self):
+        """Test that a supplied reference time is used instead of the clock."""
+        from datetime import datetime, timedelta, timezone
+
+        from augment_agent_dashboard.server import format_time_ago
+
+        ref = datetime(2024, 1, 10, 12, 0, tzinfo=timezone.utc)
+        result = format_time_ago(ref - timedelta(minutes=7), now=ref)
+        assert result == "7m ago"
+
     def test_format_time_ago_naive_datetime(self):
         """Test with naive datetime (no timezone)."""
         from datetime import datetime, timedelta, timezone
@@ -747,6 +1594,58 @@ class TestGetBaseStyles:
         result = get_base_styles(None)
         assert "prefers-color-scheme" in result  # Should have media query
 
+    def test_get_base_styles_unknown_values_share_auto(self):
+        """Test unrecognized dark values reuse the cached auto styles."""
+        from augment_agent_dashboard.server import get_base_styles
+
+        assert get_base_styles("bogus") is get_base_styles(None)
+
+
+class TestBaseStylesheet:
+    """Tests for the externally served base stylesheets."""
+
+    @pytest.mark.asyncio
+    async def test_stylesheet_is_cacheable_css(self, client):
+        """Test each scheme's stylesheet is served as long-lived bare CSS."""
+        ac, store = client
+        response = await ac.get("/base-dark.css")
+        assert response.status_code == 200
+        assert "text/css" in response.headers["content-type"]
+        assert "immutable" in response.headers["cache-control"]
+        assert "1a1a2e" in response.text
+        assert "<style>" not in response.text
+        assert (await ac.get("/base-bogus.css")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_stylesheet_is_served_pre_gzipped(self, client):
+        """Test gzip clients get the stored compressed body, others plain CSS."""
+        import gzip
+
+        from augment_agent_dashboard.server import _BASE_STYLESHEETS, _gzip_asset
+
+        ac, store = client
+        zipped = await ac.get("/base-auto.css", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["content-encoding"] == "gzip"
+        assert zipped.headers["vary"] == "Accept-Encoding"
+        assert zipped.text == _BASE_STYLESHEETS["auto"]
+        assert gzip.decompress(_gzip_asset(_BASE_STYLESHEETS["auto"])) == zipped.content
+
+        plain = await ac.get("/base-auto.css", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.text == _BASE_STYLESHEETS["auto"]
+
+    def test_pages_link_scheme_stylesheet(self, sample_session):
+        """Test pages link the stylesheet for their dark mode setting."""
+        from augment_agent_dashboard.server import (
+            get_base_stylesheet_link,
+            render_session_detail,
+        )
+
+        result = render_session_detail(sample_session, "false", {})
+        assert get_base_stylesheet_link("false") in result
+        assert '<link rel="stylesheet" href="/base-light.css?v=' in result
+        assert "--bg-primary" not in result
+
 
 class TestGetFullConfig:
     """Tests for _get_full_config function."""
@@ -887,6 +1786,16 @@ class TestFormatElapsedTime:
         result = _format_elapsed_time(started)
         assert "m" in result
 
+    def test_format_elapsed_time_explicit_now(self):
+        """Test elapsed time is measured against a given timestamp."""
+        from datetime import datetime, timezone
+
+        from augment_agent_dashboard.server import _format_elapsed_time
+
+        started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert _format_elapsed_time(started, started.timestamp() + 3725) == "1h 2m"
+        assert _format_elapsed_time(started, started.timestamp() + 65) == "1m 5s"
+
 
 class TestRenderMessageForm:
     """Tests for _render_message_form function."""
@@ -934,6 +1843,21 @@ class TestRenderSessionDetail:
         result = render_session_detail(sample_session, None, {})
         assert "No messages" in result
 
+    def test_render_escapes_workspace_fields(self, sample_session):
+        """Test that workspace names, paths and previews are HTML-escaped."""
+        from augment_agent_dashboard.server import _render_session_cards, render_session_detail
+
+        sample_session.workspace_name = "<script>x</script>"
+        sample_session.workspace_root = "/tmp/<b>"
+        sample_session.messages = [SessionMessage(role="user", content="<img src=x>")]
+        page = render_session_detail(sample_session, None, {})
+        cards = _render_session_cards([sample_session])
+        for html_out in (page, cards):
+            assert "<script>x</script>" not in html_out
+            assert "&lt;script&gt;x&lt;/script&gt;" in html_out
+            assert "/tmp/&lt;b&gt;" in html_out
+        assert "&lt;img src=x&gt;" in cards
+
     def test_render_session_detail_with_messages(self, sample_session):
         """Test rendering session with messages."""
         from augment_agent_dashboard.models import SessionMessage
@@ -957,19 +1881,103 @@ class TestRenderSessionDetail:
         ]
         result = render_session_detail(sample_session, None, {})
         assert "Queued" in result
-        assert "Clear Queue" in result
+        assert "Clear Queue (1)" in result
+        assert f'action="/session/{sample_session.session_id}/queue/clear"' in result
+        assert "confirm('Clear all 1 queued messages?')" in result
+
+    def test_markdown_is_rendered_once_per_content(self):
+        """Test repeated renders of a message reuse the cached markdown HTML."""
+        from augment_agent_dashboard.server import render_markdown
+
+        text = "**cached** markdown for the memo test"
+        with patch("markdown.Markdown.convert", return_value="<p>x</p>") as md:
+            render_markdown(text)
+            render_markdown(text)
+        assert md.call_count == 1
+
+    def test_markdown_renders_extensions(self):
+        """Test the shared converter keeps tables, fences and line breaks."""
+        from augment_agent_dashboard.server import render_markdown
+
+        result = render_markdown("a\nb\n\n| x |\n|---|\n| 1 |\n\n```\ncode\n```")
+        assert "a<br />" in result
+        assert "<table>" in result
+        assert "<pre><code>code" in result
+
+    def test_message_times_share_one_now(self, sample_session):
+        """Test every message time is measured against the same instant."""
+        from augment_agent_dashboard import server
+        from augment_agent_dashboard.models import SessionMessage
+
+        sample_session.messages = [
+            SessionMessage(role="user", content="one"),
+            SessionMessage(role="assistant", content="two"),
+        ]
+        with patch.object(
+            server, "format_time_ago", wraps=server.format_time_ago
+        ) as fmt:
+            server._render_messages_html(sample_session)
+        nows = {call.kwargs["now"] for call in fmt.call_args_list}
+        assert fmt.call_count == 2
+        assert len(nows) == 1 and None not in nows
+
+    def test_copy_button_carries_raw_content(self, sample_session):
+        """Test the copy button holds the escaped raw text, markdown included."""
+        from augment_agent_dashboard.models import SessionMessage
+        from augment_agent_dashboard.server import _render_messages_html
+
+        sample_session.messages = [
+            SessionMessage(role="assistant", content='**Done** "ok" 🎉 <tag>'),
+        ]
+        html_out, _ = _render_messages_html(sample_session)
+        assert 'data-copy="**Done** &quot;ok&quot; 🎉 &lt;tag&gt;"' in html_out
+        assert 'onclick="copyMessage(this)"' in html_out
+
+    def test_render_session_detail_passes_session_to_script(self, sample_session):
+        """Test the page links its script, which reads body data attributes."""
+        from augment_agent_dashboard import server
+        from augment_agent_dashboard.models import SessionMessage
+        from augment_agent_dashboard.server import render_session_detail
+
+        sample_session.messages = [SessionMessage(role="user", content="Hello")]
+        result = render_session_detail(sample_session, None, {})
+        assert (
+            f'<body data-session-id="{sample_session.session_id}" data-message-count="1">'
+            in result
+        )
+        assert "const sessionId = document.body.dataset.sessionId;" not in result
+        assert f'<script src="/session.js?v={server._SESSION_BUNDLE_VERSION}">' in result
+
+    def test_render_remote_session_detail(self):
+        """Test the remote page fills its template and names the federated session."""
+        from augment_agent_dashboard.federation.models import RemoteDashboard
+        from augment_agent_dashboard.server import render_remote_session_detail
+
+        result = render_remote_session_detail(
+            {"workspace_name": "proj", "messages": [{"role": "user", "content": "hi"}]},
+            RemoteDashboard(url="http://other:8080", name="Other <1>"),
+            "remote-abc",
+            None,
+        )
+        assert '<body data-session-id="remote-abc">' in result
+        assert "/remote-session.js?v=" in result
+        assert "Other &lt;1&gt;" in result
+        assert 'action="/api/remote/session/remote-abc/message"' in result
 
 
 class TestGetStore:
     """Tests for get_store function."""
 
     def test_get_store(self):
-        """Test get_store returns a SessionStore."""
+        """Test get_store returns one SessionStore shared with the federation routes."""
+        from augment_agent_dashboard.federation import routes
         from augment_agent_dashboard.server import get_store
         from augment_agent_dashboard.store import SessionStore
 
         store = get_store()
         assert isinstance(store, SessionStore)
+        assert get_store() is store
+        assert routes.get_store() is store
 
 
 class TestRenderLoopControls:
@@ -990,6 +1998,21 @@ class TestRenderLoopControls:
         assert "Test Prompt" in result
         assert "5 iterations" in result
 
+    def test_render_loop_controls_uses_render_now(self, sample_session):
+        """Test the loop's elapsed time is measured against the render's now."""
+        from datetime import datetime, timedelta, timezone
+
+        from augment_agent_dashboard.server import _render_loop_controls
+
+        started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        sample_session.loop_enabled = True
+        sample_session.loop_prompt_name = "Test Prompt"
+        sample_session.loop_started_at = started
+
+        now = started + timedelta(hours=1, minutes=2, seconds=5)
+        result = _render_loop_controls(sample_session, {"Test Prompt": "prompt text"}, now)
+        assert "1h 2m" in result
+
     def test_render_loop_controls_disabled(self, sample_session):
         """Test rendering loop controls when disabled."""
         from augment_agent_dashboard.server import _render_loop_controls
@@ -998,6 +2021,21 @@ class TestRenderLoopControls:
         result = _render_loop_controls(sample_session, {"Default": "prompt"})
         assert "Loop Paused" in result or "loop-controls" in result
 
+    def test_render_loop_controls_option_tooltips(self, sample_session):
+        """Test dropdown tooltips for both prompt formats."""
+        from augment_agent_dashboard.server import _render_loop_controls
+
+        sample_session.loop_enabled = False
+        result = _render_loop_controls(sample_session, {
+            "Legacy": "x" * 120,
+            "New <1>": {"prompt": "Review", "end_condition": "DONE"},
+        })
+        assert f'title="{"x" * 100}..."' in result
+        assert (
+            '<option value="New &lt;1&gt;" title="Prompt: Review\n\nStops when: DONE">'
+            "New &lt;1&gt;</option>"
+        ) in result
+
 
 class TestMain:
     """Tests for main entry point."""
@@ -122,6 +122,47 @@ class TestSessionStore:
         assert sessions[1].session_id == "s3"
         assert sessions[2].session_id == "s1"  # Oldest
 
+    def test_get_sessions_snapshot_reused_until_file_changes(self, temp_store):
+        """Test that the snapshot is only re-parsed after a write."""
+        session = AgentSession(
+            session_id="s1",
+            conversation_id="c1",
+            workspace_root="/",
+            workspace_name="a",
+        )
+        assert temp_store.get_sessions_snapshot() == []
+        temp_store.upsert_session(session)
+
+        first = temp_store.get_sessions_snapshot()
+        second = temp_store.get_sessions_snapshot()
+        assert first[0] is second[0]
+        assert first is not second
+
+        temp_store.update_session_status("s1", SessionStatus.ACTIVE)
+        refreshed = temp_store.get_sessions_snapshot()
+        assert refreshed[0] is not first[0]
+        assert refreshed[0].status == SessionStatus.ACTIVE
+
+    def test_get_version_changes_when_file_replaced_with_same_mtime(self, temp_store):
+        """Test that a rewrite is detected even if it keeps the old timestamp."""
+        import os
+
+        session = AgentSession(
+            session_id="s1",
+            conversation_id="c1",
+            workspace_root="/",
+            workspace_name="a",
+        )
+        assert temp_store.get_version() is None
+        temp_store.upsert_session(session)
+        before = temp_store.get_version()
+        mtime_ns = temp_store.sessions_file.stat().st_mtime_ns
+
+        session.workspace_name = "b"
+        temp_store.upsert_session(session)
+        os.utime(temp_store.sessions_file, ns=(mtime_ns, mtime_ns))
+        assert temp_store.get_version() != before
+
     def test_get_active_sessions(self, temp_store):
         """Test filtering active sessions."""
         s1 = AgentSession(